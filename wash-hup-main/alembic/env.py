@@ -27,10 +27,10 @@ if db_url:
 # for 'autogenerate' support
 from app.database import Base
 # Import all models to ensure they are registered with Base.metadata
-from app.models.auth.user import User, Profile, Notifications
+from app.models.auth.user import User, Profile, Address, Notifications, Issue, IssueMessage
 from app.models.client.profile import OwnerProfile
 from app.models.client.payment import Payment
-from app.models.client.wash import Wash, Location, Category as WashCategory
+from app.models.client.wash import Wash, Location, Car, Review, WashMessage
 from app.models.washer.profile import WasherProfile, Wallet
 from app.models.washer.transaction import Transaction, Remittance
 from app.models.admin.profile import AdminProfile, VerificationRequest, Faqs, TermsAndConditions
@@ -0,0 +1,56 @@
+"""index hot foreign keys and per-user list columns
+
+Revision ID: 3f9c2a7d41b6
+Revises: 
+Create Date: 2026-10-18 10:00:00.000000
+
+The tables were created by Base.metadata.create_all, so this is the first
+revision: run `alembic upgrade head` on an existing database. Indexes are
+built CONCURRENTLY on postgres so the tables stay writable meanwhile, and
+skipped where create_all already made them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d41b6'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# name -> (table, columns); must match the Index() declarations in app/models
+INDEXES = {
+    "ix_notifications_profile_unread_created": ("notifications", ["profile_id", "is_read", sa.text("created DESC"), sa.text("id DESC")]),
+    "ix_washes_washer_completed_created": ("washes", ["washer_id", "completed", sa.text("created DESC"), sa.text("id DESC")]),
+    "ix_washes_client_completed_created": ("washes", ["client_id", "completed", sa.text("created DESC"), sa.text("id DESC")]),
+    "ix_cars_wash_id": ("cars", ["wash_id"]),
+    "ix_reviews_washer_created": ("reviews", ["washer_id", sa.text("created DESC"), sa.text("id DESC")]),
+    "ix_reviews_wash_id": ("reviews", ["wash_id"]),
+    "ix_wash_messages_wash_created": ("wash_messages", ["wash_id", "created", "id"]),
+    "ix_issue_messages_issue_created": ("issue_messages", ["issue_id", "created", "id"]),
+    "ix_issues_profile_id": ("issues", ["profile_id"]),
+    "ix_address_profile_id": ("address", ["profile_id"]),
+    "ix_transactions_washer_created": ("transactions", ["washer_id", sa.text("created DESC"), sa.text("id DESC")]),
+    "ix_remittances_washer_created": ("remittances", ["washer_id", sa.text("created DESC"), sa.text("id DESC")]),
+    "ix_payments_sender_created": ("payments", ["sender_id", sa.text("created DESC"), sa.text("id DESC")]),
+    "ix_payments_receiver_created": ("payments", ["receiver_id", sa.text("created DESC"), sa.text("id DESC")]),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, (table, columns) in INDEXES.items():
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, (table, _) in INDEXES.items():
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,42 @@
+"""store issues.created as a timestamp
+
+Revision ID: 8d2e5b1c7a94
+Revises: 3f9c2a7d41b6
+Create Date: 2026-10-18 12:00:00.000000
+
+Issue.created was declared as a string, so the admin issue list sorted and
+paged it as text. The values are str() of UTC datetimes and cast cleanly.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e5b1c7a94'
+down_revision: Union[str, None] = '3f9c2a7d41b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "issues", "created",
+        type_=sa.DateTime(),
+        existing_type=sa.String(),
+        existing_nullable=False,
+        postgresql_using="created::timestamptz AT TIME ZONE 'UTC'",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "issues", "created",
+        type_=sa.String(),
+        existing_type=sa.DateTime(),
+        existing_nullable=False,
+        postgresql_using="created::text",
+    )
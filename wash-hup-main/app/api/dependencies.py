@@ -1,12 +1,26 @@
 from app.core.security import get_current_user, get_admin_user, get_washer_user, get_owner_user
-from app.database import SessionLocal
+from app.database import SessionLocal, AsyncSessionLocal
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 from typing import Annotated
-from app.models.auth.user import Profile
+from dataclasses import dataclass
+from collections import OrderedDict
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, with_polymorphic
+from app.models.auth.user import Profile, User
 from fastapi import HTTPException
 from app.services.redis import get_redis_client 
+from app.core.logger import logger
 import redis.asyncio as redis
+import asyncio
+import os
+import time
+
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", 60))
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", 10000))
+PROFILE_CACHE_CHANNEL = "profile-cache:invalidate"
+PROFILE_CACHE_RETRY_DELAY = 1
 
 def get_db():
     db = SessionLocal()
@@ -15,7 +29,12 @@ def get_db():
     finally:
         db.close()
     
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 db_dependency = Annotated[Session, Depends(get_db)]
+async_db_dependency = Annotated[AsyncSession, Depends(get_async_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
 admin_dependency = Annotated[dict, Depends(get_admin_user)]
 washer_dependency = Annotated[dict, Depends(get_washer_user)]
@@ -32,6 +51,139 @@ def get_profile_model(db, id):
     
     return profile
 
+
+async def get_async_profile_model(db: AsyncSession, id):
+    # every subclass's columns and the user come back in one query, since nothing can lazy load here
+    profile_type = with_polymorphic(Profile, "*")
+    profile = await db.scalar(
+        select(profile_type).options(joinedload(profile_type.user)).where(profile_type.user_id == id)
+    )
+
+    if not profile:
+        raise HTTPException(401, 'user profile not found')
+
+    return profile
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileSnapshot:
+    """What a request or long-lived websocket needs to know about its user, detached from any session."""
+    id: str
+    role: str
+    fullname: str
+    email: str
+    is_flagged: bool = False
+    is_restricted: bool = False
+    is_deactivated: bool = False
+
+
+async def get_profile_snapshot(db: AsyncSession, user_id: str) -> ProfileSnapshot | None:
+    row = (await db.execute(
+        select(
+            Profile.id, Profile.user_role, User.fullname, User.email,
+            Profile.is_flagged, Profile.is_restricted, Profile.is_deactivated,
+        )
+        .join(User, User.id == Profile.user_id)
+        .where(Profile.user_id == user_id)
+    )).first()
+
+    return ProfileSnapshot(*row) if row else None
+
+
+class ProfileCache:
+    """
+    user_id -> ProfileSnapshot for this worker, least recently used first out.
+
+    Endpoints that change a cached field call invalidate(), which drops the
+    entry here and, over redis pub/sub, on every worker running listen().
+    If that message is lost (redis down, listener reconnecting), other
+    workers serve the old snapshot for at most PROFILE_CACHE_TTL seconds.
+    """
+
+    def __init__(self, ttl: float = PROFILE_CACHE_TTL, size: int = PROFILE_CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self.entries: OrderedDict[str, tuple[float, ProfileSnapshot]] = OrderedDict()
+        self._listener: asyncio.Task | None = None
+
+    async def get(self, db: AsyncSession, user_id: str) -> ProfileSnapshot | None:
+        entry = self.entries.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self.entries.move_to_end(user_id)
+            return entry[1]
+
+        # an AsyncSession only checks out a connection here, so hits never touch the pool
+        profile = await get_profile_snapshot(db, user_id)
+        if profile is not None:
+            self.put(user_id, profile)
+        return profile
+
+    def put(self, user_id: str, profile: ProfileSnapshot):
+        self.entries[user_id] = (time.monotonic() + self.ttl, profile)
+        self.entries.move_to_end(user_id)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def discard(self, user_id: str):
+        self.entries.pop(user_id, None)
+
+    async def invalidate(self, r: redis.Redis, user_id: str):
+        self.discard(user_id)
+        try:
+            await r.publish(PROFILE_CACHE_CHANNEL, user_id)
+        except (redis.RedisError, OSError) as exc:
+            logger.warning(f"profile cache invalidation not broadcast, other workers catch up within {self.ttl}s: {exc}")
+
+    # ---- Cross-worker invalidation ----
+    def start_listener(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self.listen())
+
+    async def stop_listener(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+        self._listener = None
+
+    async def listen(self):
+        while True:
+            pubsub = None
+            try:
+                r = await get_redis_client()
+                pubsub = r.pubsub()
+                await pubsub.subscribe(PROFILE_CACHE_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        user_id = message["data"]
+                        self.discard(user_id.decode() if isinstance(user_id, bytes) else user_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"profile cache listener disconnected, retrying: {exc}")
+                # anything published meanwhile was missed
+                self.entries.clear()
+                await asyncio.sleep(PROFILE_CACHE_RETRY_DELAY)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+
+profile_cache = ProfileCache()
+
+
+async def get_profile(user: user_dependency, db: async_db_dependency) -> ProfileSnapshot:
+    profile = await profile_cache.get(db, user.get('id'))
+
+    if not profile:
+        raise HTTPException(401, 'user profile not found')
+
+    return profile
+
+profile_dependency = Annotated[ProfileSnapshot, Depends(get_profile)]
+
 # def get_washer_profile_model(db, id):
 #     profile = get_profile_model(db, id)
 
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, status, HTTPException, Query, Body
-from ...dependencies import admin_dependency, db_dependency, get_profile_model
+from ...dependencies import admin_dependency, db_dependency, redis_dependency, get_profile_model, profile_cache
 from app.models.auth.user import User, Profile
 from app.models.client.profile import OwnerProfile
 from app.models.washer.profile import WasherProfile
@@ -7,6 +7,7 @@ from app.models.admin.profile import VerificationRequest, VerificationStatus
 from app.crud.notifications import NOTIFY, NOTIFICATION
 from app.schemas.request.admin import AdminNotificationSchema
 from app.schemas.response.admin import AdminUsersListResponse, AdminBaseResponse, AdminDataResponse
+from app.utils.pagination import paginate, page
 from uuid import uuid4
 from typing import Optional
 
@@ -17,12 +18,12 @@ router = APIRouter(
 )
 
 @router.get("/owners", status_code=status.HTTP_200_OK, response_model=AdminUsersListResponse)
-async def get_owner_accounts(db: db_dependency, admin: admin_dependency, skip: int = 0, limit: int = 100):
-    owners = db.query(OwnerProfile).offset(skip).limit(limit).all()
+async def get_owner_accounts(db: db_dependency, admin: admin_dependency, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=500)):
+    owners, next_cursor = page(paginate(db.query(OwnerProfile), OwnerProfile, cursor, limit), limit)
     for owner in owners:
         owner.fullname = owner.user.fullname
         owner.email = owner.user.email
-    return {"status": "success", "data": owners}
+    return {"status": "success", "data": owners, "next_cursor": next_cursor}
 
 @router.get("/owners/filter", status_code=status.HTTP_200_OK)
 async def filter_owner_accounts(db: db_dependency, admin: admin_dependency, fullname: Optional[str] = None):
@@ -40,12 +41,12 @@ async def get_owner_account(user_id: str, db: db_dependency, admin: admin_depend
     return {"status": "success", "data": owner}
 
 @router.get("/washers", status_code=status.HTTP_200_OK, response_model=AdminUsersListResponse)
-async def get_washer_accounts(db: db_dependency, admin: admin_dependency, skip: int = 0, limit: int = 100):
-    washers = db.query(WasherProfile).offset(skip).limit(limit).all()
+async def get_washer_accounts(db: db_dependency, admin: admin_dependency, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=500)):
+    washers, next_cursor = page(paginate(db.query(WasherProfile), WasherProfile, cursor, limit), limit)
     for washer in washers:
         washer.fullname = washer.user.fullname
         washer.email = washer.user.email
-    return {"status": "success", "data": washers}
+    return {"status": "success", "data": washers, "next_cursor": next_cursor}
 
 @router.get("/washers/filter", status_code=status.HTTP_200_OK)
 async def filter_washer_accounts(db: db_dependency, admin: admin_dependency, fullname: Optional[str] = None):
@@ -153,57 +154,63 @@ async def get_verification_account(user_id: str, db: db_dependency, admin: admin
     return {"status": "success", "data": verification}
 
 @router.post("/restrict/{user_id}", status_code=status.HTTP_200_OK)
-async def restrict_account(user_id: str, db: db_dependency, admin: admin_dependency):
+async def restrict_account(user_id: str, db: db_dependency, r: redis_dependency, admin: admin_dependency):
     profile = db.query(Profile).filter(Profile.user_id == user_id).first()
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
     profile.is_restricted = True
     db.commit()
+    await profile_cache.invalidate(r, user_id)
     return {"status": "success", "message": "Account restricted"}
 
 @router.post("/deactivate/{user_id}", status_code=status.HTTP_200_OK)
-async def deactivate_account(user_id: str, db: db_dependency, admin: admin_dependency):
+async def deactivate_account(user_id: str, db: db_dependency, r: redis_dependency, admin: admin_dependency):
     profile = db.query(Profile).filter(Profile.user_id == user_id).first()
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
     profile.is_deactivated = True
     db.commit()
+    await profile_cache.invalidate(r, user_id)
     return {"status": "success", "message": "Account deactivated"}
 
 @router.post("/flag/{user_id}", status_code=status.HTTP_200_OK)
-async def flag_account(user_id: str, db: db_dependency, admin: admin_dependency):
+async def flag_account(user_id: str, db: db_dependency, r: redis_dependency, admin: admin_dependency):
     profile = db.query(Profile).filter(Profile.user_id == user_id).first()
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
     profile.is_flagged = True
     db.commit()
+    await profile_cache.invalidate(r, user_id)
     return {"status": "success", "message": "Account flagged"}
 
 @router.post("/activate/{user_id}", status_code=status.HTTP_200_OK)
-async def activate_account(user_id: str, db: db_dependency, admin: admin_dependency):
+async def activate_account(user_id: str, db: db_dependency, r: redis_dependency, admin: admin_dependency):
     profile = db.query(Profile).filter(Profile.user_id == user_id).first()
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
     profile.is_deactivated = False
     db.commit()
+    await profile_cache.invalidate(r, user_id)
     return {"status": "success", "message": "Account activated"}
 
 @router.post("/unrestrict/{user_id}", status_code=status.HTTP_200_OK)
-async def unrestrict_account(user_id: str, db: db_dependency, admin: admin_dependency):
+async def unrestrict_account(user_id: str, db: db_dependency, r: redis_dependency, admin: admin_dependency):
     profile = db.query(Profile).filter(Profile.user_id == user_id).first()
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
     profile.is_restricted = False
     db.commit()
+    await profile_cache.invalidate(r, user_id)
     return {"status": "success", "message": "Account unrestricted"}
 
 @router.post("/unflag/{user_id}", status_code=status.HTTP_200_OK)
-async def unflag_account(user_id: str, db: db_dependency, admin: admin_dependency):
+async def unflag_account(user_id: str, db: db_dependency, r: redis_dependency, admin: admin_dependency):
     profile = db.query(Profile).filter(Profile.user_id == user_id).first()
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
     profile.is_flagged = False
     db.commit()
+    await profile_cache.invalidate(r, user_id)
     return {"status": "success", "message": "Account unflagged"}
 
 @router.post("/{user_id}/notify", status_code=status.HTTP_201_CREATED, response_model=AdminBaseResponse)
@@ -217,15 +224,16 @@ async def send_user_notification(
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
 
-    await NOTIFY.create(db, profile.id, data.title, data.message, fullname=profile.user.fullname)
+    await NOTIFY.create(profile.id, data.title, data.message, fullname=profile.user.fullname)
     return {"status": "success", "message": "Notification sent"}
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_200_OK, response_model=AdminBaseResponse)
-async def delete_user_account(user_id: str, db: db_dependency, admin: admin_dependency):
+async def delete_user_account(user_id: str, db: db_dependency, r: redis_dependency, admin: admin_dependency):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
     db.delete(user)
     db.commit()
+    await profile_cache.invalidate(r, user_id)
     return {"status": "success", "message": "User account deleted successfully"}
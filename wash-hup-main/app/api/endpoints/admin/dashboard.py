@@ -5,6 +5,7 @@ from app.models.client.profile import OwnerProfile
 from app.models.washer.profile import WasherProfile
 from app.models.client.wash import Wash
 from app.schemas.response.admin import DashboardOverviewResponse
+from app.database import pool_metrics, async_pool_metrics
 from sqlalchemy import func
 from datetime import datetime, timedelta
 
@@ -34,6 +35,17 @@ async def get_dashboard_overview(db: db_dependency, admin: admin_dependency):
         }
     }
 
+@router.get("/db-pool", status_code=status.HTTP_200_OK)
+async def get_db_pool_stats(admin: admin_dependency):
+    """Connection pool gauges for the worker that served this request."""
+    return {
+        "status": "success",
+        "data": {
+            "sync": pool_metrics.stats(),
+            "async": async_pool_metrics.stats()
+        }
+    }
+
 @router.get("/trend-chart-data", status_code=status.HTTP_200_OK)
 async def get_order_trend_chart_data(db: db_dependency, admin: admin_dependency):
     # Get wash counts for the last 7 days
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, status, HTTPException, Body
+from fastapi import APIRouter, status, HTTPException, Body, Query
 from ...dependencies import admin_dependency, db_dependency, get_profile_model
 from app.models.auth.user import Issue, IssueMessage
 from app.schemas.response.admin import AdminBaseResponse, AdminDataResponse
+from app.utils.pagination import paginate, page
+from typing import Optional
 from uuid import uuid4
-from datetime import datetime
 
 
 router = APIRouter(
@@ -12,9 +13,9 @@ router = APIRouter(
 )
 
 @router.get("", status_code=status.HTTP_200_OK)
-async def get_all_issues(db: db_dependency, admin: admin_dependency, skip: int = 0, limit: int = 100):
-    issues = db.query(Issue).offset(skip).limit(limit).all()
-    return {"status": "success", "data": issues}
+async def get_all_issues(db: db_dependency, admin: admin_dependency, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=500)):
+    issues, next_cursor = page(paginate(db.query(Issue), Issue, cursor, limit), limit)
+    return {"status": "success", "data": issues, "next_cursor": next_cursor}
 
 @router.get("/{issue_id}", status_code=status.HTTP_200_OK)
 async def get_issue_details(issue_id: str, db: db_dependency, admin: admin_dependency):
@@ -37,7 +38,6 @@ async def respond_to_issue(issue_id: str, db: db_dependency, admin: admin_depend
         issue_id=issue_id,
         profile_id=profile.id,
         body=body,
-        created=datetime.now()
     )
     db.add(message)
     db.commit()
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, status, HTTPException, Body
-from ...dependencies import admin_dependency, db_dependency, get_profile_model
+from fastapi import APIRouter, status, HTTPException, Body, Query
+from ...dependencies import admin_dependency, db_dependency, get_profile_model, redis_dependency
 from app.models.admin.prices import ServicePrice
 from app.models.client.wash import Wash, Review
 from app.schemas.request.admin import PriceUpdateSchema
 from app.schemas.response.admin import AdminBaseResponse, AdminDataResponse
+from app.services.cache import cache
+from app.utils.pagination import paginate, page
 from uuid import uuid4
 from typing import Optional, List
 
@@ -14,9 +16,9 @@ router = APIRouter(
 )
 
 @router.get("", status_code=status.HTTP_200_OK)
-async def get_orders(db: db_dependency, admin: admin_dependency, skip: int = 0, limit: int = 100):
-    orders = db.query(Wash).offset(skip).limit(limit).all()
-    return {"status": "success", "data": orders}
+async def get_orders(db: db_dependency, admin: admin_dependency, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=500)):
+    orders, next_cursor = page(paginate(db.query(Wash), Wash, cursor, limit), limit)
+    return {"status": "success", "data": orders, "next_cursor": next_cursor}
 
 @router.get("/recent", status_code=status.HTTP_200_OK, tags=["Admin: Dashboard"])
 async def get_recent_orders(db: db_dependency, admin: admin_dependency, limit: int = 10):
@@ -29,7 +31,9 @@ async def get_filtered_orders(
     admin: admin_dependency,
     status_filter: Optional[str] = None,
     client_id: Optional[str] = None,
-    washer_id: Optional[str] = None
+    washer_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500)
 ):
     query = db.query(Wash)
     if status_filter == "completed":
@@ -44,8 +48,8 @@ async def get_filtered_orders(
     if washer_id:
         query = query.filter(Wash.washer_id == washer_id)
 
-    orders = query.all()
-    return {"status": "success", "data": orders}
+    orders, next_cursor = page(paginate(query, Wash, cursor, limit), limit)
+    return {"status": "success", "data": orders, "next_cursor": next_cursor}
 
 @router.get("/prices", status_code=status.HTTP_200_OK)
 async def get_prices(db: db_dependency, admin: admin_dependency):
@@ -55,7 +59,7 @@ async def get_prices(db: db_dependency, admin: admin_dependency):
     return {"status": "success", "data": prices}
 
 @router.post("/recommend-price",  status_code=status.HTTP_201_CREATED)
-async def add_price(db: db_dependency, admin: admin_dependency):
+async def add_price(db: db_dependency, r: redis_dependency, admin: admin_dependency):
     profile = get_profile_model(db, admin.get("id"))
     price_model = ServicePrice(
         id="pr_"+str(uuid4()),
@@ -70,6 +74,7 @@ async def add_price(db: db_dependency, admin: admin_dependency):
     db.add(price_model)
     db.commit()
     db.refresh(price_model)
+    await cache.invalidate(r, "service_prices")
     return {
         "message": "price added successfully",
         "data": price_model
@@ -79,6 +84,7 @@ async def add_price(db: db_dependency, admin: admin_dependency):
 async def update_price(
     price_id: str,
     db: db_dependency,
+    r: redis_dependency,
     admin: admin_dependency,
     data: PriceUpdateSchema
 ):
@@ -95,12 +101,13 @@ async def update_price(
 
     db.commit()
     db.refresh(price_model)
+    await cache.invalidate(r, "service_prices")
     return {"status": "success", "message": "Prices updated", "data": price_model}
 
 @router.get("/reviews", status_code=status.HTTP_200_OK)
-async def get_all_reviews(db: db_dependency, admin: admin_dependency, skip: int = 0, limit: int = 100):
-    reviews = db.query(Review).offset(skip).limit(limit).all()
-    return {"status": "success", "data": reviews}
+async def get_all_reviews(db: db_dependency, admin: admin_dependency, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=500)):
+    reviews, next_cursor = page(paginate(db.query(Review), Review, cursor, limit), limit)
+    return {"status": "success", "data": reviews, "next_cursor": next_cursor}
 
 @router.delete("/reviews/{review_id}", status_code=status.HTTP_200_OK, response_model=AdminBaseResponse)
 async def delete_review(review_id: str, db: db_dependency, admin: admin_dependency):
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, status, HTTPException, Body
-from ...dependencies import admin_dependency, db_dependency, get_profile_model
+from ...dependencies import admin_dependency, db_dependency, get_profile_model, redis_dependency
 from app.models.admin.profile import Faqs, TermsAndConditions, Category
 from app.schemas.request.admin import FAQCreateSchema, FAQUpdateSchema, TermsCreateSchema
 from app.schemas.response.admin import AdminBaseResponse, AdminDataResponse
+from app.services.cache import cache
 from uuid import uuid4
 from datetime import datetime
 from typing import Optional
@@ -24,6 +25,7 @@ async def get_faqs(db: db_dependency, admin: admin_dependency, category: Optiona
 @router.post("/faqs", status_code=status.HTTP_201_CREATED, response_model=AdminDataResponse)
 async def create_faq(
     db: db_dependency,
+    r: redis_dependency,
     admin: admin_dependency,
     data: FAQCreateSchema
 ):
@@ -38,12 +40,14 @@ async def create_faq(
     db.add(faq)
     db.commit()
     db.refresh(faq)
+    await cache.invalidate(r, "faqs"+faq.category.value)
     return {"status": "success", "data": faq}
 
 @router.put("/faqs/{faq_id}", status_code=status.HTTP_200_OK, response_model=AdminDataResponse)
 async def update_faq(
     faq_id: str,
     db: db_dependency,
+    r: redis_dependency,
     admin: admin_dependency,
     data: FAQUpdateSchema
 ):
@@ -51,11 +55,17 @@ async def update_faq(
     if not faq:
         raise HTTPException(status_code=404, detail="FAQ not found")
 
+    old_category = faq.category
+    if data.category: faq.category = data.category
     if data.question: faq.question = data.question
     if data.answer: faq.answer = data.answer
 
     db.commit()
     db.refresh(faq)
+    await cache.invalidate(r, "faqs"+faq.category.value)
+    if old_category != faq.category:
+        # the faq also has to leave the list it moved out of
+        await cache.invalidate(r, "faqs"+old_category.value)
     return {"status": "success", "data": faq}
 
 @router.get("/terms", status_code=status.HTTP_200_OK)
@@ -69,6 +79,7 @@ async def get_terms(db: db_dependency, admin: admin_dependency, category: Option
 @router.post("/terms", status_code=status.HTTP_201_CREATED, response_model=AdminDataResponse)
 async def create_terms(
     db: db_dependency,
+    r: redis_dependency,
     admin: admin_dependency,
     data: TermsCreateSchema
 ):
@@ -82,4 +93,5 @@ async def create_terms(
     db.add(term)
     db.commit()
     db.refresh(term)
+    await cache.invalidate(r, "terms"+term.category.value)
     return {"status": "success", "data": term}
@@ -4,6 +4,7 @@ from app.models.client.payment import Payment
 from app.models.washer.transaction import Transaction, Remittance
 from app.models.washer.profile import Wallet, WasherProfile
 from app.schemas.response.admin import WalletOverviewResponse
+from app.utils.pagination import paginate, page
 from sqlalchemy import func
 from typing import Optional
 
@@ -31,19 +32,19 @@ async def get_wallet_overview(db: db_dependency, admin: admin_dependency):
     }
 
 @router.get("/payments", status_code=status.HTTP_200_OK)
-async def get_payment_history(db: db_dependency, admin: admin_dependency, skip: int = 0, limit: int = 100):
-    payments = db.query(Payment).offset(skip).limit(limit).all()
-    return {"status": "success", "data": payments}
+async def get_payment_history(db: db_dependency, admin: admin_dependency, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=500)):
+    payments, next_cursor = page(paginate(db.query(Payment), Payment, cursor, limit), limit)
+    return {"status": "success", "data": payments, "next_cursor": next_cursor}
 
 @router.get("/transactions", status_code=status.HTTP_200_OK)
-async def get_transaction_history(db: db_dependency, admin: admin_dependency, skip: int = 0, limit: int = 100):
-    transactions = db.query(Transaction).offset(skip).limit(limit).all()
-    return {"status": "success", "data": transactions}
+async def get_transaction_history(db: db_dependency, admin: admin_dependency, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=500)):
+    transactions, next_cursor = page(paginate(db.query(Transaction), Transaction, cursor, limit), limit)
+    return {"status": "success", "data": transactions, "next_cursor": next_cursor}
 
 @router.get("/remittance", status_code=status.HTTP_200_OK)
-async def get_remission_history(db: db_dependency, admin: admin_dependency, skip: int = 0, limit: int = 100):
-    remittances = db.query(Remittance).offset(skip).limit(limit).all()
-    return {"status": "success", "data": remittances}
+async def get_remission_history(db: db_dependency, admin: admin_dependency, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=500)):
+    remittances, next_cursor = page(paginate(db.query(Remittance), Remittance, cursor, limit), limit)
+    return {"status": "success", "data": remittances, "next_cursor": next_cursor}
 
 @router.get("/users/{user_id}", status_code=status.HTTP_200_OK)
 async def get_user_wallet(user_id: str, db: db_dependency, admin: admin_dependency):
@@ -58,24 +59,26 @@ async def get_user_wallet(user_id: str, db: db_dependency, admin: admin_dependen
     return {"status": "success", "data": wallet}
 
 @router.get("/users/{user_id}/payments", status_code=status.HTTP_200_OK)
-async def get_user_payments(user_id: str, db: db_dependency, admin: admin_dependency):
+async def get_user_payments(user_id: str, db: db_dependency, admin: admin_dependency, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=500)):
     profile = db.query(WasherProfile).filter(WasherProfile.user_id == user_id).first()
     if profile:
-        payments = db.query(Payment).filter(Payment.receiver_id == profile.id).all()
+        query = db.query(Payment).filter(Payment.receiver_id == profile.id)
     else:
         from app.models.client.profile import OwnerProfile
         profile = db.query(OwnerProfile).filter(OwnerProfile.user_id == user_id).first()
         if not profile:
              raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
-        payments = db.query(Payment).filter(Payment.sender_id == profile.id).all()
+        query = db.query(Payment).filter(Payment.sender_id == profile.id)
 
-    return {"status": "success", "data": payments}
+    payments, next_cursor = page(paginate(query, Payment, cursor, limit), limit)
+    return {"status": "success", "data": payments, "next_cursor": next_cursor}
 
 @router.get("/users/{user_id}/remission", status_code=status.HTTP_200_OK)
-async def get_user_remission(user_id: str, db: db_dependency, admin: admin_dependency):
+async def get_user_remission(user_id: str, db: db_dependency, admin: admin_dependency, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=500)):
     washer = db.query(WasherProfile).filter(WasherProfile.user_id == user_id).first()
     if not washer:
          raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Washer profile not found")
 
-    remittances = db.query(Remittance).filter(Remittance.washer_id == washer.id).all()
-    return {"status": "success", "data": remittances}
+    query = db.query(Remittance).filter(Remittance.washer_id == washer.id)
+    remittances, next_cursor = page(paginate(query, Remittance, cursor, limit), limit)
+    return {"status": "success", "data": remittances, "next_cursor": next_cursor}
@@ -1,19 +1,26 @@
 from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException, Query, Path, status, BackgroundTasks
-from ...dependencies import db_dependency, client_dependency, get_profile_model, redis_dependency
+from ...dependencies import async_db_dependency, client_dependency, get_async_profile_model, redis_dependency, profile_dependency
 from app.models.client.wash import Wash, Location, Review, Car
 from app.models.client.payment import Payment
 from app.models.admin.prices import ServicePrice
 from app.models.washer.profile import WasherProfile, Wallet
 from app.utils.wash import getWasherFromList
+from app.utils.pagination import paginate, page
 from app.schemas.request.client import CreateWashRequest, CreateCarRequest, VerifyRequest, ReviewRequest
-from app.schemas.response.client import CreateWashResponse, CarResponse, WasherResponse, ResponseSchema
+from app.schemas.response.client import CreateWashResponse, CarResponse, WasherResponse, MatchResponse, ResponseSchema
 from app.services.paystack import initialize_payment
-from geoalchemy2.functions import ST_GeomFromText, ST_AsText
+from app.services.matching import match_washers, dispatch_offer
+from app.services.offers import offer_store, offer_or_error
+from app.services.geo import lonlat, nearby_washers, DEFAULT_RADIUS_KM, MAX_RADIUS_KM, DEFAULT_LIMIT, MAX_LIMIT
+from geoalchemy2.functions import ST_GeomFromText
 from app.crud.notifications import NOTIFICATION, NOTIFY
 from uuid import uuid4
 from app.websocket.router import manager
-import json
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from app.database import AsyncSessionLocal
+from app.services.cache import cache
 
 
 router = APIRouter(
@@ -25,11 +32,11 @@ router = APIRouter(
 @router.post("/book-wash", status_code=status.HTTP_201_CREATED, response_model=CreateWashResponse)
 async def book_a_wash(
     wash_form: CreateWashRequest,
-    db: db_dependency,
+    db: async_db_dependency,
     user: client_dependency,
     bgtask: BackgroundTasks
 ):
-    profile_model = get_profile_model(db, user.get("id"))
+    profile_model = await get_async_profile_model(db, user.get("id"))
 
     point = ST_GeomFromText(
         f"POINT({wash_form.location.longitude} {wash_form.location.latitude})", 4326)
@@ -38,9 +45,6 @@ async def book_a_wash(
         location=wash_form.location.name,
         geom=point
     )
-    db.add(location_model)
-    db.commit()
-    db.refresh(location_model)
 
     wash_model = Wash(
         id="wa_"+str(uuid4()),
@@ -52,11 +56,10 @@ async def book_a_wash(
         client_name=profile_model.user.fullname,
         client_pic=profile_model.profile_image
     )
-    db.add(wash_model)
-    db.commit()
-    db.refresh(wash_model)
+    db.add_all([location_model, wash_model])
+    await db.commit()
 
-    bgtask.add_task(NOTIFY.create, db, profile_model.id, "Wash created", NOTIFICATION.wash_created, fullname=profile_model.user.fullname)
+    bgtask.add_task(NOTIFY.create, profile_model.id, "Wash created", NOTIFICATION.wash_created, fullname=profile_model.user.fullname)
     
     data = {
         "wash_id": wash_model.id,
@@ -77,18 +80,18 @@ async def book_a_wash(
 @router.post("/book-wash/car", status_code=status.HTTP_201_CREATED, response_model=CarResponse)
 async def car_details(
     car_form: CreateCarRequest,
-    db: db_dependency,
-    user: client_dependency
+    db: async_db_dependency,
+    user: client_dependency,
+    profile: profile_dependency
 ):
-    profile_model = get_profile_model(db, user.get("id"))
-    wash_model = db.query(Wash).filter(
-        Wash.id == car_form.wash_id, Wash.client_id == profile_model.id).first()
+    wash_model = await db.scalar(select(Wash).where(
+        Wash.id == car_form.wash_id, Wash.client_id == profile.id).limit(1))
 
     if not wash_model:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="wash not found")
 
-    if wash_model.cars:
+    if await db.scalar(select(Car.id).where(Car.wash_id == wash_model.id).limit(1)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="car details already added for this wash")
 
@@ -100,48 +103,40 @@ async def car_details(
         color=car_form.car.color
     )
     db.add(car_model)
-    db.commit()
-    db.refresh(car_model)
-
     wash_model.car_name = car_model.car_name
-    db.commit()
-
-    wash_car = db.query(Car).filter(Car.wash_id == wash_model.id).first()
+    await db.commit()
 
     return {
         "message": "car details added successfully",
         "status": "ok",
-        "data": wash_car
+        "data": car_model
     }
 
 
 @router.get("/washers", status_code=status.HTTP_200_OK, response_model=WasherResponse)
 async def get_cars_washers_close_by(
     r: redis_dependency,
-    db: db_dependency,
+    db: async_db_dependency,
     user: client_dependency,
-    wash_id: str = Query(..., pattern=r"^[a-z0-9-_]+$")
+    profile: profile_dependency,
+    wash_id: str = Query(..., pattern=r"^[a-z0-9-_]+$"),
+    radius: float = Query(DEFAULT_RADIUS_KM, gt=0, le=MAX_RADIUS_KM, description="search radius in km"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    adaptive: bool = Query(False, description="widen the radius until `limit` washers are found")
 ):
-    profile_model = get_profile_model(db, user.get("id"))
-    wash_model = db.query(Wash).filter(
-        Wash.id == wash_id, Wash.client_id == profile_model.id).first()
+    # the wash and its coordinates in one query
+    wash_location = (await db.execute(select(*lonlat(Location.geom)).join(
+        Wash, Wash.location_id == Location.id).where(
+        Wash.id == wash_id, Wash.client_id == profile.id))).first()
 
-    if not wash_model:
+    if not wash_location:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="wash not found")
 
-    wash_location = db.query(ST_AsText(Location.geom)).filter(
-        Location.id == wash_model.location_id).scalar()
-    longitude = float(wash_location.split("(")[1].split(" ")[0])
-    latitude = float(wash_location.split(" ")[1].split(")")[0])
-
-    washers = await r.geosearch(
-        "washers:location",
-        longitude=longitude,
-        latitude=latitude,
-        radius=5,
-        unit="km"
-    )
+    longitude, latitude = wash_location
+
+    # closest first, capped at `limit` so payload and db fan-out stay bounded
+    washers = await nearby_washers(r, db, longitude, latitude, radius=radius, limit=limit, adaptive=adaptive)
 
     if not washers:
         return {
@@ -149,7 +144,8 @@ async def get_cars_washers_close_by(
             "status": "ok",
             "data": []
         }
-    data = getWasherFromList(washers, db)
+    distances = dict(washers)
+    data = await db.run_sync(lambda session: getWasherFromList(list(distances), session, distances))
 
     return {
         "message": "washers retrieved successfully",
@@ -160,22 +156,26 @@ async def get_cars_washers_close_by(
 @router.post("/send-offer/{washer_id}", status_code=status.HTTP_201_CREATED, response_model=ResponseSchema)
 async def send_wash_offer(
     user: client_dependency,
-    db: db_dependency,
+    db: async_db_dependency,
     r: redis_dependency,
     bgtask: BackgroundTasks,
     washer_id: str = Path(..., pattern=r"^[a-z0-9-]+$"),
     wash_id: str = Query(..., pattern=r"^[a-z0-9-_]+$"),
 ):
-    profile_model = get_profile_model(db, user.get("id"))
-    wash_model = db.query(Wash).filter(
-        Wash.id == wash_id, Wash.client_id == profile_model.id).first()
+    profile_model = await get_async_profile_model(db, user.get("id"))
+    wash_model = await db.scalar(select(Wash).options(joinedload(Wash.wash_location)).where(
+        Wash.id == wash_id, Wash.client_id == profile_model.id).limit(1))
 
     if not wash_model:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="wash not found")
 
-    washer_model = db.query(WasherProfile).filter(
-        WasherProfile.id == washer_id).first()
+    if wash_model.washer_id:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="wash already has a washer")
+
+    washer_model = await db.scalar(select(WasherProfile).options(joinedload(WasherProfile.user)).where(
+        WasherProfile.id == washer_id).limit(1))
 
     if not washer_model:
         raise HTTPException(
@@ -193,11 +193,11 @@ async def send_wash_offer(
         }
     }
 
-    offer_key = f"offers:{washer_model.id}"
-    await r.hset(offer_key, wash_model.id, json.dumps(data))
-    await r.expire(offer_key, 3600)  # Expire the hash after 1 hour
+    if not await offer_store.put(r, [washer_model.id], wash_model.id, data):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="offer already sent to this washer, or the wash was taken")
 
-    bgtask.add_task(NOTIFY.create, db, washer_model.id, "Incoming Offer", NOTIFICATION.upcoming_offer, fullname=washer_model.user.fullname, client_name=profile_model.user.fullname)
+    bgtask.add_task(NOTIFY.create, washer_model.id, "Incoming Offer", NOTIFICATION.upcoming_offer, fullname=washer_model.user.fullname, client_name=profile_model.user.fullname)
     await manager.send_personal(data, washer_model.id)
 
     return {
@@ -205,43 +205,85 @@ async def send_wash_offer(
         "status": "ok"
     }
 
+@router.post("/match-offer", status_code=status.HTTP_201_CREATED, response_model=MatchResponse)
+async def match_wash_offer(
+    user: client_dependency,
+    db: async_db_dependency,
+    r: redis_dependency,
+    bgtask: BackgroundTasks,
+    wash_id: str = Query(..., pattern=r"^[a-z0-9-_]+$"),
+    k: int = Query(5, ge=1, le=20, description="how many of the best-scoring washers get the offer")
+):
+    profile_model = await get_async_profile_model(db, user.get("id"))
+    # the wash, its address and its coordinates in one query
+    wash_row = (await db.execute(select(Wash, Location.location, *lonlat(Location.geom)).join(
+        Location, Wash.location_id == Location.id).where(
+        Wash.id == wash_id, Wash.client_id == profile_model.id).limit(1))).first()
+
+    if not wash_row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="wash not found")
+
+    wash_model, address, longitude, latitude = wash_row
+
+    if wash_model.washer_id:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="wash already has a washer")
+
+    matches = await match_washers(r, db, longitude, latitude, k)
+
+    if not matches:
+        return {
+            "message": "no washers available nearby. Try again",
+            "status": "ok",
+            "data": []
+        }
+
+    data = {
+        "action": "wash",
+        "type": "send-offer",
+        "payload": {
+            "wash_id": wash_model.id,
+            "profile_pic": profile_model.profile_image,
+            "address": address,
+            "washer_name": profile_model.user.fullname,
+            "bucket_avl": wash_model.bucket_avl
+        }
+    }
+    # washers already holding a live offer for this wash keep it as it is
+    washer_ids = await dispatch_offer(r, manager, wash_model.id, data, [match["id"] for match in matches])
+
+    for washer_id in washer_ids:
+        bgtask.add_task(NOTIFY.create, washer_id, "Incoming Offer", NOTIFICATION.upcoming_offer, fullname="Washer", client_name=profile_model.user.fullname)
+
+    return {
+        "message": f"offer sent to {len(washer_ids)} washers",
+        "status": "ok",
+        "data": matches
+    }
+
 @router.post("/accept-price-offer", status_code=status.HTTP_200_OK)
 async def accept_price_offer(
-    db: db_dependency,
+    db: async_db_dependency,
     washer: client_dependency,
+    profile: profile_dependency,
     redis: redis_dependency,
     bgtask: BackgroundTasks,
     wash_id: str = Query(..., pattern=r"^[a-z0-9-_]+$"),
     washer_id: str = Query(..., pattern=r"^[a-z0-9-]+$")
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
-
-    wash_model = db.query(Wash).filter(Wash.id == wash_id, Wash.client_id == profile_model.id).first()
+    wash_model = await db.scalar(select(Wash.id).where(Wash.id == wash_id, Wash.client_id == profile.id).limit(1))
 
     if not wash_model:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "wash not found")
     
     
-    offer_key = f"offers:{washer_id}"
-    offer = await redis.hget(offer_key, wash_id)
+    # priced -> accepted; fails unless the washer has quoted and nobody took the wash
+    data = offer_or_error(await offer_store.accept(redis, washer_id, wash_id))
 
-    if not offer:
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "offer not found")
-    
-    data = json.loads(offer)
-    
-
-    try:
-        data.get("payload")["price"]
-    except:
-        raise HTTPException(status.HTTP_400_BAD_REQUEST, "price not found")
-    
-    data["payload"]["accepted"] = True
-    
-    await redis.hset(offer_key, wash_id, json.dumps(data))
-
-    bgtask.add_task(NOTIFY.create, db, wash_model.washer_id, "Offer accepted", NOTIFICATION.price_offer_accepted, fullname="Washer", client_name=profile_model.user.fullname)
-    await manager.send_personal(data, wash_model.washer_id)
+    # the wash has no washer yet, the quote belongs to `washer_id`
+    bgtask.add_task(NOTIFY.create, washer_id, "Offer accepted", NOTIFICATION.price_offer_accepted, fullname="Washer", client_name=profile.fullname)
+    await manager.send_personal(data, washer_id)
 
     return {
         "message": "offer accepted successfully",
@@ -250,28 +292,29 @@ async def accept_price_offer(
 
 @router.get("/wash-detail", status_code=status.HTTP_200_OK)
 async def get_wash_details(
-    db: db_dependency,
+    db: async_db_dependency,
     washer: client_dependency,
     wash_id: str = Query(..., pattern=r"^[a-z0-9-_]+$")
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
+    profile_model = await get_async_profile_model(db, washer.get("id"))
 
-    wash_model = db.query(Wash).filter(Wash.id == wash_id, Wash.client_id == profile_model.id).first()
+    wash_model = await db.scalar(select(Wash).options(joinedload(Wash.wash_location)).where(
+        Wash.id == wash_id, Wash.client_id == profile_model.id).limit(1))
 
     if not wash_model:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "wash not found")
     
-    washer_model = db.query(WasherProfile).filter(WasherProfile.id == wash_model.washer_id).first()
+    washer_rating = await db.scalar(select(WasherProfile.rating).where(WasherProfile.id == wash_model.washer_id))
     
-    if not washer_model:
+    if washer_rating is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "washer not found")
     
-    car_model = db.query(Car).filter(Car.wash_id == wash_model.id).first()
+    car_model = await db.scalar(select(Car).where(Car.wash_id == wash_model.id).limit(1))
 
     if not car_model:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "car not found")
     
-    review_model = db.query(Review).filter(Review.wash_id == wash_model.id).first()
+    review_model = await db.scalar(select(Review).where(Review.wash_id == wash_model.id).limit(1))
     
     if wash_model.completed:
         progress = "completed"
@@ -289,7 +332,7 @@ async def get_wash_details(
         "bucket_avl": wash_model.bucket_avl,
         "water_avl": wash_model.water_avl,
         "wash_type": wash_model.wash_type,
-        "rating": washer_model.rating,
+        "rating": washer_rating,
         "progress": progress,
         "price": wash_model.price,
         "profile_pic": profile_model.profile_image
@@ -316,11 +359,10 @@ async def get_wash_details(
     }
 
 @router.post("/verify-wash", status_code=status.HTTP_200_OK)
-async def verify_car_washer(VerifyRequest: VerifyRequest, db: db_dependency, r: redis_dependency, user: client_dependency):
-    profile_model = get_profile_model(db, user.get("id"))
+async def verify_car_washer(VerifyRequest: VerifyRequest, db: async_db_dependency, r: redis_dependency, user: client_dependency, profile: profile_dependency):
     wash_id = VerifyRequest.wash_id
 
-    wash_model = db.query(Wash).filter(Wash.id == wash_id, Wash.client_id == profile_model.id).first()
+    wash_model = await db.scalar(select(Wash).where(Wash.id == wash_id, Wash.client_id == profile.id).limit(1))
 
     if not wash_model:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "wash not found")
@@ -329,9 +371,9 @@ async def verify_car_washer(VerifyRequest: VerifyRequest, db: db_dependency, r:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "wash already verified")
 
 
-    washer_model = db.query(WasherProfile).filter(WasherProfile.id == wash_model.washer_id).first()
+    washer_id = await db.scalar(select(WasherProfile.id).where(WasherProfile.id == wash_model.washer_id))
 
-    if not washer_model:
+    if not washer_id:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "washer not found")
 
     code = await r.getex(wash_model.washer_id+wash_model.id)
@@ -340,13 +382,12 @@ async def verify_car_washer(VerifyRequest: VerifyRequest, db: db_dependency, r:
     if not code or code != VerifyRequest.code:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "invalid code")
 
-    wash_model.washer_id = washer_model.id
+    wash_model.washer_id = washer_id
     wash_model.is_verified = True
     wash_model.started = True
     wash_model.time_started = datetime.now(timezone.utc)
 
-    db.commit()
-    db.refresh(wash_model)
+    await db.commit()
 
     return {
         "message": "Wash verified successfully",
@@ -354,10 +395,8 @@ async def verify_car_washer(VerifyRequest: VerifyRequest, db: db_dependency, r:
     }
 
 @router.get("/pay/{wash_id}", status_code=status.HTTP_200_OK)
-async def pay_washer(wash_id: str, db: db_dependency, user: client_dependency):
-    profile_model = get_profile_model(db, user.get("id"))
-
-    wash_model = db.query(Wash).filter(Wash.id == wash_id, Wash.client_id == profile_model.id).first()
+async def pay_washer(wash_id: str, db: async_db_dependency, user: client_dependency, profile: profile_dependency):
+    wash_model = await db.scalar(select(Wash).where(Wash.id == wash_id, Wash.client_id == profile.id).limit(1))
 
     if not wash_model:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "wash not found")
@@ -365,17 +404,17 @@ async def pay_washer(wash_id: str, db: db_dependency, user: client_dependency):
     if not wash_model.completed:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "wash not completed")
     
-    wallet_model = db.query(Wallet).filter(Wallet.washer_id == wash_model.washer_id).first()
+    wallet_id = await db.scalar(select(Wallet.id).where(Wallet.washer_id == wash_model.washer_id).limit(1))
 
-    payment = await initialize_payment(wash_model.price, profile_model.user.email, subaccount=wallet_model.id)
+    payment = await initialize_payment(wash_model.price, profile.email, subaccount=wallet_id)
 
     if not payment["status"]:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, payment["message"])
     
     payment_model = Payment(
         id="pa_"+str(uuid4()),
-        sender_id=profile_model.id,
-        sender_name=profile_model.user.fullname,
+        sender_id=profile.id,
+        sender_name=profile.fullname,
         receiver_id=wash_model.washer_id,
         receiver_name=wash_model.washer_name,
         wash_id=wash_model.id,
@@ -384,7 +423,7 @@ async def pay_washer(wash_id: str, db: db_dependency, user: client_dependency):
         status="pending"
     )
     db.add(payment_model)
-    db.commit()
+    await db.commit()
 
     return {
         "message": "payment link created successfully",
@@ -395,25 +434,24 @@ async def pay_washer(wash_id: str, db: db_dependency, user: client_dependency):
     }
 
 @router.post("/review")
-async def rate_and_review_washer(review: ReviewRequest, db: db_dependency, user: client_dependency):
-    profile_model = get_profile_model(db, user.get("id"))
-    wash_model = db.query(Wash).filter(Wash.client_id == review.wash_id).first()
+async def rate_and_review_washer(review: ReviewRequest, db: async_db_dependency, user: client_dependency, profile: profile_dependency):
+    wash_id = await db.scalar(select(Wash.id).where(Wash.id == review.wash_id, Wash.client_id == profile.id).limit(1))
 
-    if not wash_model:
+    if not wash_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="washer not found")
 
     review_model = Review(
         id="rt_"+str(uuid4()),
-        wash_id=wash_model.id,
-        client_id=profile_model.id,
+        wash_id=wash_id,
+        client_id=profile.id,
         rating=review.rating,
         review=review.review
     )
 
     db.add(review_model)
-    db.commit()
-    db.refresh(review_model)
+    await db.commit()
+    await db.refresh(review_model)
 
     return {
         "message": "review added successfully",
@@ -422,9 +460,8 @@ async def rate_and_review_washer(review: ReviewRequest, db: db_dependency, user:
     }
 
 @router.get("/ongoing-washes", status_code=status.HTTP_200_OK)
-async def get_ongoing_washes(db: db_dependency, user: client_dependency):
-    profile_model = get_profile_model(db, user.get("id"))
-    washes = db.query(Wash).filter(Wash.client_id == profile_model.id, Wash.started == True, Wash.completed == False).all()
+async def get_ongoing_washes(db: async_db_dependency, user: client_dependency, profile: profile_dependency):
+    washes = (await db.scalars(select(Wash).where(Wash.client_id == profile.id, Wash.started == True, Wash.completed == False))).all()
 
     return {
         "message": "washes retrieved successfully",
@@ -433,48 +470,45 @@ async def get_ongoing_washes(db: db_dependency, user: client_dependency):
     }
 
 @router.get("/completed-washes")
-async def get_all_washes(db: db_dependency, user: client_dependency, skip: int = Query(default=0, ge=0), limit: int = Query(default=10, ge=10, le=50)):
-    profile_model = get_profile_model(db, user.get("id"))
-    washes = db.query(Wash).filter(Wash.client_id == profile_model.id, Wash.completed == True).offset(skip).limit(limit).all()
+async def get_all_washes(db: async_db_dependency, user: client_dependency, profile: profile_dependency, cursor: str | None = None, limit: int = Query(default=10, ge=10, le=50)):
+    query = select(Wash).where(Wash.client_id == profile.id, Wash.completed == True)
+    washes, next_cursor = page(await db.scalars(paginate(query, Wash, cursor, limit)), limit)
 
     return {
         "message": "washes retrieved successfully",
         "status": "ok",
-        "data": washes
+        "data": washes,
+        "next_cursor": next_cursor
     }
 
 
-@router.get("/prices")
-async def get_services_prices(db: db_dependency, r: redis_dependency, user: client_dependency):
-    get_profile_model(db, user.get("id"))
-    prices = await r.get("service_prices")
+async def load_service_prices():
+    async with AsyncSessionLocal() as db:
+        prices = await db.scalar(select(ServicePrice).order_by(ServicePrice.created.desc()).limit(1))
 
     if not prices:
-        prices = db.query(ServicePrice).order_by(
-            ServicePrice.created.desc()).first()
-
-        if not prices:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="prices not found")
-
-        data = {
-            "quick_min": prices.quick_min,
-            "quick_max": prices.quick_max,
-            "smart_min": prices.smart_min,
-            "smart_max": prices.smart_max,
-            "premium_min": prices.premium_min,
-            "premium_max": prices.premium_max
-        }
-        await r.setex("service_prices", 3600, json.dumps(data))
+        return None
 
-        return {
-            "message": "prices retrieved successfully",
-            "status": "ok",
-            "data": data
-        }
+    return {
+        "quick_min": prices.quick_min,
+        "quick_max": prices.quick_max,
+        "smart_min": prices.smart_min,
+        "smart_max": prices.smart_max,
+        "premium_min": prices.premium_min,
+        "premium_max": prices.premium_max
+    }
+
+
+@router.get("/prices")
+async def get_services_prices(r: redis_dependency, user: client_dependency, profile: profile_dependency):
+    data = await cache.get(r, "service_prices", load_service_prices, fresh_for=3600, stale_for=24*3600)
+
+    if not data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="prices not found")
 
     return {
         "message": "prices retrieved successfully",
         "status": "ok",
-        "data": json.loads(prices)
+        "data": data
     }
\ No newline at end of file
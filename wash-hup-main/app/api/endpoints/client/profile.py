@@ -1,12 +1,13 @@
 from datetime import datetime, timedelta
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from ...dependencies import db_dependency, client_dependency, get_profile_model, redis_dependency
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
+from ...dependencies import db_dependency, client_dependency, get_profile_model, redis_dependency, profile_cache
 from app.models.client.payment import Payment
 from app.models.admin.rewards import Discounts
 from app.schemas.request.client import ProfileUpdateRequest
 from app.schemas.response.client import ProfileResponse
 from app.core.security import bcrypt_context
 from app.crud.notifications import NOTIFICATION, NOTIFY
+from app.utils.pagination import paginate, page
 import json
 
 
@@ -47,7 +48,7 @@ async def get_profile(db: db_dependency, user: client_dependency, r: redis_depen
     }
 
 @router.put('/', status_code=200, response_model=ProfileResponse)
-async def update_profile(profile_data: ProfileUpdateRequest, db: db_dependency, user: client_dependency, bgtask: BackgroundTasks):
+async def update_profile(profile_data: ProfileUpdateRequest, db: db_dependency, r: redis_dependency, user: client_dependency, bgtask: BackgroundTasks):
     profile_model = get_profile_model(db, user.get('id'))
 
     if not bcrypt_context.verify(profile_data.password, profile_model.user.hashed_password):
@@ -67,8 +68,9 @@ async def update_profile(profile_data: ProfileUpdateRequest, db: db_dependency,
     db.add(profile_model)
     db.commit()
     db.refresh(profile_model)
+    await profile_cache.invalidate(r, user.get('id'))
 
-    bgtask.add_task(NOTIFY.create, db, profile_model.id, "Profile updated", NOTIFICATION.profile_update, fullname=profile_model.user.fullname)
+    bgtask.add_task(NOTIFY.create, profile_model.id, "Profile updated", NOTIFICATION.profile_update, fullname=profile_model.user.fullname)
 
 
     data = {
@@ -88,24 +90,28 @@ async def update_profile(profile_data: ProfileUpdateRequest, db: db_dependency,
 
 # Transactions Requests
 @router.get('/transactions', status_code=200) #, response_model=TransactionResponse)
-async def get_transactions(db: db_dependency, user: client_dependency, skip: int = 0, limit: int = 10):
+async def get_transactions(db: db_dependency, user: client_dependency, cursor: str | None = None, limit: int = Query(10, ge=1, le=50)):
     profile_model = get_profile_model(db, user.get('id'))
-    transactions = db.query(Payment).filter(Payment.sender_id == profile_model.id).order_by(Payment.created.desc()).offset(skip).limit(limit).all()
+    query = db.query(Payment).filter(Payment.sender_id == profile_model.id)
+    transactions, next_cursor = page(paginate(query, Payment, cursor, limit), limit)
 
     return {
         "message": "transactions retrieved successfully",
         "status": "ok",
-        "data": transactions
+        "data": transactions,
+        "next_cursor": next_cursor
     }
 
 # Discount
 @router.get('/discounts')
-async def get_discounts(db: db_dependency, user: client_dependency, skip: int = 0, limit: int = 10):
+async def get_discounts(db: db_dependency, user: client_dependency, cursor: str | None = None, limit: int = Query(10, ge=1, le=50)):
     profile_model = get_profile_model(db, user.get('id'))
-    discounts = db.query(Discounts).filter(Discounts.profile_id == profile_model.id).order_by(Discounts.created.desc()).offset(skip).limit(limit).all()
+    query = db.query(Discounts).filter(Discounts.profile_id == profile_model.id)
+    discounts, next_cursor = page(paginate(query, Discounts, cursor, limit), limit)
 
     return {
         "message": "discounts retrieved successfully",
         "status": "ok",
-        "data": discounts
+        "data": discounts,
+        "next_cursor": next_cursor
     }
\ No newline at end of file
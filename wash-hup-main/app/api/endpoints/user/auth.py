@@ -95,7 +95,7 @@ async def login_user(form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     else:
         notification = NOTIFICATION.login_admin
 
-    bgTask.add_task(NOTIFY.create, db, profile_model.id, 'Successfully logged in.', notification, fullname=user.fullname)
+    bgTask.add_task(NOTIFY.create, profile_model.id, 'Successfully logged in.', notification, fullname=user.fullname)
 
     return {
         'status': 'ok',
@@ -141,7 +141,7 @@ async def verify_email(token: str, db: db_dependency, bgTask: BackgroundTasks):
     db.commit()
     db.refresh(user_model)
 
-    bgTask.add_task(NOTIFY.create, db, profile_model.id, 'Email verified.', NOTIFICATION.email_verfied, fullname=user_model.fullname)
+    bgTask.add_task(NOTIFY.create, profile_model.id, 'Email verified.', NOTIFICATION.email_verfied, fullname=user_model.fullname)
 
     return {
         'status': 'ok',
@@ -165,7 +165,7 @@ async def reset_password(password: PasswordSchema, token: str, db: db_dependency
     db.commit()
     db.refresh(user_model)
 
-    bgTask.add_task(NOTIFY.create, db, profile_model.id, 'Password reset.', NOTIFICATION.password_change, fullname=user_model.fullname)
+    bgTask.add_task(NOTIFY.create, profile_model.id, 'Password reset.', NOTIFICATION.password_change, fullname=user_model.fullname)
 
     return {
         'status': 'ok',
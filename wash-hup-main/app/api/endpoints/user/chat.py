@@ -1,6 +1,7 @@
 from fastapi import APIRouter, status, Query, HTTPException
 from ...dependencies import db_dependency, user_dependency, get_profile_model
 from app.models.client.wash import Wash, WashMessage
+from app.utils.pagination import paginate, page
 
 
 
@@ -14,8 +15,8 @@ async def get_chat_mssages(
     db: db_dependency,
     washer: user_dependency,
     wash_id: str = Query(..., pattern=r"^[a-z0-9-_]+$"),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(30, ge=30)
+    cursor: str | None = None,
+    limit: int = Query(30, ge=30, le=100)
 ):
     profile_model = get_profile_model(db, washer.get("id"))
     
@@ -30,7 +31,9 @@ async def get_chat_mssages(
     if not wash_model:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "wash not found")
     
-    messages = db.query(WashMessage).filter(WashMessage.wash_id == wash_id).offset(skip).limit(limit).all()
+    # oldest first, the order the conversation happened in
+    query = db.query(WashMessage).filter(WashMessage.wash_id == wash_id)
+    messages, next_cursor = page(paginate(query, WashMessage, cursor, limit, newest_first=False), limit)
 
     if not messages:
         return {
@@ -41,5 +44,6 @@ async def get_chat_mssages(
     return {
         "message": "messages retrieved successfully",
         "status": "ok",
-        "data": messages
+        "data": messages,
+        "next_cursor": next_cursor
     }
\ No newline at end of file
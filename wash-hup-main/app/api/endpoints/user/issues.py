@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, status, Query
 from app.models.admin.profile import Faqs
-from ...dependencies import user_dependency, get_profile_model, db_dependency, redis_dependency
+from ...dependencies import db_dependency, redis_dependency, profile_dependency
 from app.models.auth.user import Issue, IssueMessage
 from app.schemas.response.client import IssueResponse, MessageResponse
+from app.utils.pagination import paginate, page
 from uuid import uuid4
 
 
@@ -14,17 +15,18 @@ router = APIRouter(
 
 
 @router.get('/', status_code=status.HTTP_200_OK) #, response_model=IssueResponse) 
-async def get_issues_messages(db: db_dependency, user: user_dependency, skip: int = 0, limit: int = 50):
-    profile_model = get_profile_model(db, user.get('id'))
-    issues = db.query(Issue).filter(Issue.profile_id == profile_model.id).first()
+async def get_issues_messages(db: db_dependency, profile: profile_dependency, cursor: str | None = None, limit: int = Query(50, ge=1, le=100)):
+    issues = db.query(Issue).filter(Issue.profile_id == profile.id).first()
     
     if not issues:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="issues not found")
     
-    issue_messages = db.query(IssueMessage).filter(IssueMessage.issue_id == issues.id).offset(skip).limit(limit).all()
+    query = db.query(IssueMessage).filter(IssueMessage.issue_id == issues.id)
+    issue_messages, next_cursor = page(paginate(query, IssueMessage, cursor, limit, newest_first=False), limit)
     
     return {
         "message": "Issues retrieved successfully",
         "status": "ok",
-        "data": issue_messages
+        "data": issue_messages,
+        "next_cursor": next_cursor
     }
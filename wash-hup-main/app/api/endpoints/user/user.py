@@ -1,20 +1,22 @@
-from fastapi import APIRouter, UploadFile, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, UploadFile, HTTPException, status, BackgroundTasks, Query
 from app.models.admin.profile import Faqs, TermsAndConditions
-from ...dependencies import db_dependency, get_profile_model, user_dependency, redis_dependency
+from ...dependencies import async_db_dependency, get_async_profile_model, user_dependency, redis_dependency, profile_dependency, profile_cache
 from app.schemas.response.user import ProfileResponse
 from app.schemas.response.washer import WasherProfileResponse
 from app.schemas.request.auth import AddressSchema
-from app.models.auth.user import Address
+from app.models.auth.user import Address, Profile
 from app.models.washer.profile import Wallet
 from geoalchemy2.functions import ST_GeomFromText
 from app.models.auth.user import Notifications
 from app.schemas.response.client import NotificationResponse 
 from uuid import uuid4
-from app.models.client.profile import Profile
 from app.utils.upload_image import upload_pic
+from app.utils.pagination import paginate, page
 from app.schemas.response.client import FaqResponse
 from app.crud.notifications import NOTIFY, NOTIFICATION
-import json
+from sqlalchemy import select, update
+from app.database import AsyncSessionLocal
+from app.services.cache import cache
 
 
 router = APIRouter(
@@ -23,16 +25,16 @@ router = APIRouter(
 )
 
 @router.get('/profile', status_code=status.HTTP_200_OK, response_model=ProfileResponse | WasherProfileResponse)
-async def get_user_profile(db: db_dependency, user: user_dependency):
-    profile_model = get_profile_model(db, user.get('id'))
-    address = db.query(Address).filter(Address.profile_id == profile_model.id).first()
+async def get_user_profile(db: async_db_dependency, user: user_dependency):
+    profile_model = await get_async_profile_model(db, user.get('id'))
+    address = await db.scalar(select(Address.address1).where(Address.profile_id == profile_model.id).limit(1))
 
     if profile_model.user_role == 'owner':
         data = {
             "user_id": profile_model.user.id,
             "fullname": profile_model.user.fullname,
             "profile_pic": profile_model.profile_image,
-            "location": address.address1 if address else None
+            "location": address
         }
         return {
             "status": "ok",
@@ -41,24 +43,24 @@ async def get_user_profile(db: db_dependency, user: user_dependency):
         }
 
     if profile_model.user_role == 'washer':
-        wallet = db.query(Wallet).filter(Wallet.washer_id == profile_model.id).first()
+        balance = await db.scalar(select(Wallet.balance).where(Wallet.washer_id == profile_model.id).limit(1))
 
         complete_profile = {
             "address": True if address else False,
             "profile_pic": True if profile_model.profile_image else False,
-            "payment_detail": True if wallet else False,
+            "payment_detail": balance is not None,
             "availability": profile_model.available
         }
         data = {
             "user_id": profile_model.user.id,
             "fullname": profile_model.user.fullname,
             "profile_pic": profile_model.profile_image,
-            "balance": wallet.balance if wallet else 0.00,
+            "balance": balance if balance is not None else 0.00,
             "remittance": 3.0,
             "rating": 1.0,
             "is_verified": profile_model.profile_verified,
             "role": profile_model.user_role,
-            "location": address.address1 if address else None,
+            "location": address,
             "complete_setup": complete_profile
         }
         return {
@@ -71,41 +73,36 @@ async def get_user_profile(db: db_dependency, user: user_dependency):
 
 # Notification Requests
 @router.get('/notification', status_code=status.HTTP_200_OK, response_model=NotificationResponse)
-async def get_notifications(db: db_dependency, user: user_dependency, skip: int = 0, limit: int = 10):
-    profile_model = get_profile_model(db, user.get('id'))
-    notifications = db.query(Notifications).filter(Notifications.profile_id == profile_model.id, Notifications.is_read == False).order_by(Notifications.created.desc()).offset(skip).limit(limit).all()
+async def get_notifications(db: async_db_dependency, profile: profile_dependency, cursor: str | None = None, limit: int = Query(10, ge=1, le=50)):
+    query = select(Notifications).where(Notifications.profile_id == profile.id, Notifications.is_read == False)
+    notifications, next_cursor = page(await db.scalars(paginate(query, Notifications, cursor, limit)), limit)
 
     return {
         "message": "Notification retrieved successfully",
         "status": "ok",
-        "data": notifications
+        "data": notifications,
+        "next_cursor": next_cursor
     }
 
 # Patch request to update read_receipt
 @router.patch('/notification/all', status_code=status.HTTP_200_OK)
-async def read_all(db: db_dependency, user: user_dependency):
-    profile_model = get_profile_model(db, user.get('id'))
-    notifications = db.query(Notifications).filter(Notifications.profile_id == profile_model.id, Notifications.is_read == False).all()
-
-    for notification in notifications:
-        notification.is_read = True
-    db.commit()
+async def read_all(db: async_db_dependency, profile: profile_dependency):
+    await db.execute(update(Notifications).where(Notifications.profile_id == profile.id, Notifications.is_read == False).values(is_read=True))
+    await db.commit()
     return {
         "message": "all notifications marked as read",
         "status": "ok"
     }
 
 @router.patch('/notification/{id}', status_code=status.HTTP_200_OK, response_model=NotificationResponse)
-async def read_notification(id: str, db: db_dependency, user: user_dependency):
-    profile_model = get_profile_model(db, user.get('id'))
-    notification_model = db.query(Notifications).filter(Notifications.profile_id == profile_model.id, Notifications.id == id).first()
+async def read_notification(id: str, db: async_db_dependency, profile: profile_dependency):
+    notification_model = await db.scalar(select(Notifications).where(Notifications.profile_id == profile.id, Notifications.id == id).limit(1))
 
     if not notification_model:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
 
     notification_model.is_read = True
-    db.commit()
-    db.refresh(notification_model)
+    await db.commit()
     
     return {
         "message": "notification marked as read",
@@ -114,18 +111,15 @@ async def read_notification(id: str, db: db_dependency, user: user_dependency):
     }
 
 @router.post("/address", status_code=201)
-async def add_address(request: AddressSchema, db: db_dependency, user: user_dependency, bgtask: BackgroundTasks):
-    profile_model = get_profile_model(db, user.get('id'))
-    address_model = db.query(Address).filter(Address.profile_id == profile_model.id).first()
-
-    if address_model:
+async def add_address(request: AddressSchema, db: async_db_dependency, r: redis_dependency, user: user_dependency, profile: profile_dependency, bgtask: BackgroundTasks):
+    if await db.scalar(select(Address.id).where(Address.profile_id == profile.id).limit(1)):
         raise HTTPException(status_code=400, detail="Address already exists")
     
     point = ST_GeomFromText(f'POINT({request.longitude} {request.latitude})', 4326)
 
     address_model = Address(
         id=str(uuid4()),
-        profile_id=profile_model.id,
+        profile_id=profile.id,
         address1=request.address1,
         address2=request.address2,
         city=request.city,
@@ -134,11 +128,11 @@ async def add_address(request: AddressSchema, db: db_dependency, user: user_depe
         geom=point
     )
     db.add(address_model)
-    db.commit()
-    db.refresh(address_model)
+    await db.commit()
+    await profile_cache.invalidate(r, user.get('id'))
 
     # send notification 
-    bgtask.add_task(NOTIFY.create, db, profile_model.id, "New Address added", NOTIFICATION.new_address, fullname=profile_model.user.fullname)
+    bgtask.add_task(NOTIFY.create, profile.id, "New Address added", NOTIFICATION.new_address, fullname=profile.fullname)
 
     return {
         "message": "address added successfully",
@@ -146,9 +140,8 @@ async def add_address(request: AddressSchema, db: db_dependency, user: user_depe
     }
 
 @router.put("/address", status_code=status.HTTP_200_OK)
-async def update_address(request: AddressSchema, db: db_dependency, user: user_dependency, bgtask: BackgroundTasks):
-    profile_model = get_profile_model(db, user.get('id'))
-    address_model = db.query(Address).filter(Address.profile_id == profile_model.id).first()
+async def update_address(request: AddressSchema, db: async_db_dependency, r: redis_dependency, user: user_dependency, profile: profile_dependency, bgtask: BackgroundTasks):
+    address_model = await db.scalar(select(Address).where(Address.profile_id == profile.id).limit(1))
 
     if not address_model:
         raise HTTPException(status_code=404, detail="Address not found")
@@ -161,11 +154,11 @@ async def update_address(request: AddressSchema, db: db_dependency, user: user_d
     address_model.state = request.state
     address_model.country = request.country
     address_model.geom = point
-    db.commit()
-    db.refresh(address_model)
+    await db.commit()
+    await profile_cache.invalidate(r, user.get('id'))
 
     # send notification 
-    bgtask.add_task(NOTIFY.create, db, profile_model.id, "Address updated", NOTIFICATION.address_updated, fullname=profile_model.user.fullname)
+    bgtask.add_task(NOTIFY.create, profile.id, "Address updated", NOTIFICATION.address_updated, fullname=profile.fullname)
 
     return {
         "message": "address updated successfully",
@@ -173,69 +166,62 @@ async def update_address(request: AddressSchema, db: db_dependency, user: user_d
     }
 
 @router.post("/profile-image", status_code=201)
-async def upload_profile_image(image: UploadFile, db: db_dependency, user: user_dependency):
-    profile_model = db.query(Profile).filter(Profile.user_id == user.get('id')).first()
-
-    if not profile_model:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    image_url = await upload_pic(image.file, profile_model.user.fullname)
+async def upload_profile_image(image: UploadFile, db: async_db_dependency, profile: profile_dependency):
+    image_url = await upload_pic(image.file, profile.fullname)
     
-    profile_model.profile_image = image_url
-    db.commit()
-    db.refresh(profile_model)
+    await db.execute(update(Profile).where(Profile.id == profile.id).values(profile_image=image_url))
+    await db.commit()
 
     return {
         "message": "profile image uploaded successfully",
-        "data": profile_model.profile_image
+        "data": image_url
+    }
+
+async def load_terms(role: str):
+    async with AsyncSessionLocal() as db:
+        t_and_c = await db.scalar(
+            select(TermsAndConditions).where(TermsAndConditions.category == role)
+            .order_by(TermsAndConditions.created.desc()).limit(1)
+        )
+
+    if not t_and_c:
+        return None
+
+    return {
+        "terms": t_and_c.terms,
+        "created": t_and_c.created.isoformat()
     }
 
+async def load_faqs(role: str):
+    async with AsyncSessionLocal() as db:
+        faqs = (await db.scalars(select(Faqs).where(Faqs.category == role))).all()
+
+    return [
+        {"id": faq.id, "question": faq.question, "answer": faq.answer, "created": faq.created.isoformat()}
+        for faq in faqs
+    ]
+
 @router.get('/t&c')
-async def get_terms_and_conditions(db: db_dependency, r: redis_dependency, user: user_dependency):
-    profile_model = get_profile_model(db, user.get('id'))
-    role = profile_model.user_role
-    terms = await r.get("terms"+role)
+async def get_terms_and_conditions(r: redis_dependency, profile: profile_dependency):
+    role = profile.role
+    data = await cache.get(r, "terms"+role, lambda: load_terms(role), fresh_for=24*3600, stale_for=7*24*3600)
 
-    if not terms:
-        t_and_c = db.query(TermsAndConditions).filter(TermsAndConditions.category == role).order_by(TermsAndConditions.created.desc()).first()
-        
-        if not t_and_c:
-            raise HTTPException(status_code=404, detail="Terms and conditions not found")
+    if not data:
+        raise HTTPException(status_code=404, detail="Terms and conditions not found")
 
-        data = {
-            "terms": t_and_c.terms,
-            "created": t_and_c.created
-        }
-        await r.setex("terms"+role, 24*3600, json.dumps(data))
-        return {
-            "message": "FAQs retrieved successfully",
-            "status": "ok",
-            "data": data
-        }
-    
     return {
-        "message": "FAQs retrieved successfully",
+        "message": "terms and conditions retrieved successfully",
         "status": "ok",
-        "data": json.loads(terms)
+        "data": data
     }
 
 @router.get('/faqs', status_code=status.HTTP_200_OK, response_model=FaqResponse)
-async def get_faqs(db: db_dependency, r: redis_dependency, user: user_dependency):
-    profile_model = get_profile_model(db, user.get('id'))
-    role = profile_model.user_role
-    faqs = await r.get("faqs"+role)
-
-    if not faqs:
-        data = db.query(Faqs).filter(Faqs.category == role).all()
-        await r.setex("faqs"+role, 24*3600, json.dumps(data))
-        return {
-            "message": "FAQs retrieved successfully",
-            "status": "ok",
-            "data": data
-        }
+async def get_faqs(r: redis_dependency, profile: profile_dependency):
+    role = profile.role
+    data = await cache.get(r, "faqs"+role, lambda: load_faqs(role), fresh_for=24*3600, stale_for=7*24*3600)
 
     return {
         "message": "FAQs retrieved successfully",
         "status": "ok",
-        "data": json.loads(faqs)
+        "data": data
     }
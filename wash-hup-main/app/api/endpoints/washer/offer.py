@@ -1,16 +1,19 @@
 from datetime import datetime
 from fastapi import APIRouter, status, Query, HTTPException, UploadFile, BackgroundTasks
 from fastapi.responses import StreamingResponse
-from ...dependencies import db_dependency, washer_dependency, get_profile_model, redis_dependency
+from ...dependencies import async_db_dependency, washer_dependency, get_async_profile_model, redis_dependency, profile_dependency
 from app.utils.upload_image import upload_pic
 from app.models.client.wash import Wash, Review, Car
 from app.models.client.profile import OwnerProfile
 from app.schemas.response.washer import UpcomingOfferResponse, ResponseSchema, WashDetailResponse, OngoingWashResponse, CompletedWashResponse
 from app.websocket.router import manager
 from app.crud.notifications import NOTIFICATION, NOTIFY
+from app.services.offers import offer_store, offer_or_error, OfferState
+from app.utils.pagination import paginate, page
+from sqlalchemy import select, update
+from sqlalchemy.orm import joinedload
 import io
 import qrcode
-import json
 import random
 import string
 
@@ -25,59 +28,51 @@ router = APIRouter(
 
 @router.get("/upcoming-offers", status_code=status.HTTP_200_OK, response_model=UpcomingOfferResponse)
 async def get_upcoming_offers(
-    db: db_dependency, 
-    washer: washer_dependency, 
-    r: redis_dependency
+    washer: washer_dependency,
+    profile: profile_dependency,
+    r: redis_dependency,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
-
-    offer_key = f"offers:{profile_model.id}"
-    offers = await r.hgetall(offer_key)
+    # expired offers are purged as part of the read
+    offers, total = await offer_store.page(r, profile.id, skip, limit)
 
     if not offers:
         return {
             "message": "no offers found",
             "status": "ok",
-            "data": []
+            "data": [],
+            "total": total
         }
     
-    offers = [json.loads(offer) for offer in offers.values()]
     data = [offer.get("payload") for offer in offers]
     
     return {
         "message": "offers retrieved successfully",
         "status": "ok",
-        "data": data
+        "data": data,
+        "total": total
     }
 
 @router.post("/send-price-offer", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
 async def send_price_offer(
-    db: db_dependency,
+    db: async_db_dependency,
     washer: washer_dependency,
+    profile: profile_dependency,
     r: redis_dependency,
     bgtask: BackgroundTasks,
     wash_id: str = Query(..., pattern=r"^[a-z0-9-_]+$"),
     price: float = Query(..., gt=0)
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
-
-    wash_model = db.query(Wash).filter(Wash.id == wash_id).first()
+    client_id = await db.scalar(select(Wash.client_id).where(Wash.id == wash_id))
 
-    if not wash_model:
+    if not client_id:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "wash not found")
     
-    offer_key = f"offers:{profile_model.id}"
-    offer = await r.hget(offer_key, wash_id)
-
-    if not offer:
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "offer not found")
-    
-    offer = json.loads(offer)
-    offer["payload"]["price"] = price
-    
-    await r.hset(offer_key, wash_id, json.dumps(offer))
-    bgtask.add_task(NOTIFY.create, db, wash_model.client_id, "Wash Price Offer", NOTIFICATION.price_offer, fullname=profile_model.user.fullname, washer_name=profile_model.user.fullname)
-    await manager.send_personal(offer, wash_model.client_id)
+    # sent/priced -> priced; an accepted quote can no longer be changed
+    offer = offer_or_error(await offer_store.set_price(r, profile.id, wash_id, price))
+    bgtask.add_task(NOTIFY.create, client_id, "Wash Price Offer", NOTIFICATION.price_offer, fullname=profile.fullname, washer_name=profile.fullname)
+    await manager.send_personal(offer, client_id)
 
     return {
         "message": "offer sent successfully",
@@ -86,46 +81,54 @@ async def send_price_offer(
 
 @router.post("/accept-offer", status_code=status.HTTP_200_OK, response_model=ResponseSchema)
 async def accept_offer(
-    db: db_dependency, 
+    db: async_db_dependency, 
     washer: washer_dependency, 
     r: redis_dependency, 
     bgtask: BackgroundTasks,
     wash_id: str = Query(..., pattern=r"^[a-z0-9-_]+$")
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
+    profile_model = await get_async_profile_model(db, washer.get("id"))
 
-    wash_model = db.query(Wash).filter(Wash.id == wash_id).first()
+    client_id = await db.scalar(select(Wash.client_id).where(Wash.id == wash_id))
 
-    if not wash_model:
+    if not client_id:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "wash not found")
     
-    offer_key = f"offers:{profile_model.id}"
-    offer = await r.hget(offer_key, wash_id)
-
-    if not offer:
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "offer not found")
-    
-    wash_model.washer_id = profile_model.id
-    wash_model.washer_name = profile_model.user.fullname
-    wash_model.pic = profile_model.profile_image
-
-    offer = json.loads(offer)
-    
-    try: 
-        offer.get("payload")["accepted"]
-    except:
+    outcome, offer = await offer_store.take(r, profile_model.id, wash_id)
+    if outcome == "conflict" and offer in (OfferState.SENT, OfferState.PRICED):
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "price not accepted by car owner.")
-    
-    wash_model.price = offer["payload"]["price"]
-    wash_model.accepted = True
-    
-    db.commit()
-    db.refresh(wash_model)
-
-    await r.hdel(offer_key, wash_id)
-
-    bgtask.add_task(NOTIFY.create, db, wash_model.client_id, "Wash accepted", NOTIFICATION.wash_accepted, fullname="Car owner", washer=profile_model.user.fullname)
-    bgtask.add_task(NOTIFY.create, db, profile_model.id, "Offer accepted", NOTIFICATION.offer_accepted, fullname=profile_model.user.fullname)
+    offer = offer_or_error((outcome, offer))
+
+    # redis picked one washer; the conditional update keeps the database to a single winner too
+    try:
+        taken = (await db.execute(update(Wash).where(Wash.id == wash_id, Wash.washer_id == None).values({
+            Wash.washer_id: profile_model.id,
+            Wash.washer_name: profile_model.user.fullname,
+            Wash.washer_pic: profile_model.profile_image,
+            Wash.price: offer["payload"]["price"],
+            Wash.accepted: True,
+        }).execution_options(synchronize_session=False))).rowcount
+        await db.commit()
+    except Exception:
+        await offer_store.release(r, profile_model.id, wash_id)
+        raise
+
+    # the wash is taken either way: withdraw it from everyone it was offered to and tell the others
+    retracted = await offer_store.retract(r, wash_id)
+    others = [washer_id for washer_id in retracted if washer_id != profile_model.id]
+    await manager.send_personal_many({
+        "action": "wash",
+        "type": "offer-withdrawn",
+        "payload": {"wash_id": wash_id}
+    }, others)
+
+    if not taken:
+        # the database already names another washer, so redis must not name this one
+        await offer_store.release(r, profile_model.id, wash_id)
+        raise HTTPException(status.HTTP_409_CONFLICT, "wash already taken by another washer")
+
+    bgtask.add_task(NOTIFY.create, client_id, "Wash accepted", NOTIFICATION.wash_accepted, fullname="Car owner", washer=profile_model.user.fullname)
+    bgtask.add_task(NOTIFY.create, profile_model.id, "Offer accepted", NOTIFICATION.offer_accepted, fullname=profile_model.user.fullname)
 
     return {
         "message": "offer accepted successfully",
@@ -134,24 +137,26 @@ async def accept_offer(
 
 @router.get("/wash-detail", status_code=status.HTTP_200_OK, response_model=WashDetailResponse)
 async def get_wash_details(
-    db: db_dependency,
+    db: async_db_dependency,
     washer: washer_dependency,
     wash_id: str = Query(..., pattern=r"^[a-z0-9-_]+$")
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
+    profile_model = await get_async_profile_model(db, washer.get("id"))
 
-    wash_model = db.query(Wash).filter(Wash.id == wash_id, Wash.washer_id == profile_model.id).first()
+    wash_model = await db.scalar(select(Wash).options(joinedload(Wash.wash_location)).where(
+        Wash.id == wash_id, Wash.washer_id == profile_model.id).limit(1))
 
     if not wash_model:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "wash not found")
     
-    client_model = db.query(OwnerProfile).filter(OwnerProfile.id == wash_model.client_id).first()
+    client_model = await db.scalar(select(OwnerProfile).options(joinedload(OwnerProfile.user)).where(
+        OwnerProfile.id == wash_model.client_id).limit(1))
     
     if not client_model:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "client not found")
     
-    review_model = db.query(Review).filter(Review.wash_id == wash_model.id).first()
-    car_model = db.query(Car).filter(Car.wash_id == wash_model.id).first()
+    review_model = await db.scalar(select(Review).where(Review.wash_id == wash_model.id).limit(1))
+    car_model = await db.scalar(select(Car).where(Car.wash_id == wash_model.id).limit(1))
 
     if not car_model:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "car not found")
@@ -200,16 +205,15 @@ async def get_wash_details(
 
 @router.get("/generate-code", status_code=status.HTTP_200_OK)
 async def qr_code(
-    db: db_dependency,
+    db: async_db_dependency,
     washer: washer_dependency,
+    profile: profile_dependency,
     r: redis_dependency,
     wash_id: str = Query(..., pattern=r"^[a-z0-9-_]+$")
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
-
-    wash_model = db.query(Wash).filter(Wash.id == wash_id, Wash.washer_id == profile_model.id).first()
+    wash_model = await db.scalar(select(Wash).where(Wash.id == wash_id, Wash.washer_id == profile.id).limit(1))
 
-    if not washer_dependency:
+    if not wash_model:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "wash not found")
     
     # generate random alphanumeric code
@@ -232,7 +236,7 @@ async def qr_code(
     img.save(img_byte_arr, format='PNG')
     img_byte_arr.seek(0)
 
-    await r.setex(profile_model.id+wash_model.id, 600, code)
+    await r.setex(profile.id+wash_model.id, 600, code)
     print(code)
 
     # Return the image stream as a StreamingResponse
@@ -241,13 +245,12 @@ async def qr_code(
 @router.post("/end-wash", status_code=status.HTTP_200_OK)
 async def end_wash(
     image: UploadFile,
-    db: db_dependency,
+    db: async_db_dependency,
     washer: washer_dependency,
+    profile: profile_dependency,
     wash_id: str = Query(..., pattern=r"^[a-z0-9-_]+$")
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
-
-    wash_model = db.query(Wash).filter(Wash.id == wash_id, Wash.washer_id == profile_model.id).first()
+    wash_model = await db.scalar(select(Wash).where(Wash.id == wash_id, Wash.washer_id == profile.id).limit(1))
 
     if not wash_model:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "wash not found")
@@ -264,8 +267,7 @@ async def end_wash(
     image_url = await upload_pic(image.file, wash_model.id)
     wash_model.image = image_url
 
-    db.commit()
-    db.refresh(wash_model)
+    await db.commit()
 
     return {
         "message": "wash ended successfully",
@@ -275,12 +277,11 @@ async def end_wash(
 
 @router.get("/ongoing-offer", status_code=status.HTTP_200_OK, response_model=OngoingWashResponse)
 async def get_ongoing_offer(
-    db: db_dependency,
+    db: async_db_dependency,
     washer: washer_dependency,
+    profile: profile_dependency,
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
-
-    active_washes = db.query(Wash).filter(Wash.washer_id == profile_model.id, Wash.accepted == True, Wash.completed == False).order_by(Wash.created.desc()).all()
+    active_washes = (await db.scalars(select(Wash).where(Wash.washer_id == profile.id, Wash.accepted == True, Wash.completed == False).order_by(Wash.created.desc()))).all()
 
     if not active_washes:
         return {
@@ -297,14 +298,14 @@ async def get_ongoing_offer(
 
 @router.get("/completed-offer", status_code=status.HTTP_200_OK, response_model=CompletedWashResponse)
 async def get_completed_offer(
-    db: db_dependency,
+    db: async_db_dependency,
     washer: washer_dependency,
-    skip: int = Query(default=0, ge=0),
+    profile: profile_dependency,
+    cursor: str | None = None,
     limit: int = Query(default=10, ge=10, le=50)
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
-
-    completed_washes = db.query(Wash).filter(Wash.washer_id == profile_model.id, Wash.completed == True).order_by(Wash.created.desc()).offset(skip).limit(limit).all()
+    query = select(Wash).where(Wash.washer_id == profile.id, Wash.completed == True)
+    completed_washes, next_cursor = page(await db.scalars(paginate(query, Wash, cursor, limit)), limit)
 
     if not completed_washes:
         return {
@@ -316,25 +317,27 @@ async def get_completed_offer(
     return {
         "message": "completed offers retrieved successfully",
         "status": "ok",
-        "data": completed_washes
+        "data": completed_washes,
+        "next_cursor": next_cursor
     }
 
 # todo
 @router.post("/request-rating", status_code=status.HTTP_200_OK)
 async def request_rating(
-    db: db_dependency,
+    db: async_db_dependency,
     washer: washer_dependency,
     bgtask: BackgroundTasks,
     wash_id: str = Query(..., pattern=r"^[a-z0-9-_]+$"),
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
+    profile_model = await get_async_profile_model(db, washer.get("id"))
 
-    wash_model = db.query(Wash).filter(Wash.id == wash_id, Wash.washer_id == profile_model.id).first()
+    wash_model = await db.scalar(select(Wash).options(joinedload(Wash.wash_location)).where(
+        Wash.id == wash_id, Wash.washer_id == profile_model.id).limit(1))
 
     if not wash_model:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "wash not found")
     
-    bgtask.add_task(NOTIFY.create, db, wash_model.client_id, "Request a review", NOTIFICATION.request_review, fullname=profile_model.user.fullname)
+    bgtask.add_task(NOTIFY.create, wash_model.client_id, "Request a review", NOTIFICATION.request_review, fullname=profile_model.user.fullname)
     await manager.send_personal({
         "action": "review",
         "type": "request", 
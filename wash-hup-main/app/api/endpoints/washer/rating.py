@@ -1,11 +1,11 @@
 from fastapi import APIRouter, status, HTTPException, Query
-from ...dependencies import db_dependency, washer_dependency, get_profile_model, redis_dependency
+from ...dependencies import db_dependency, washer_dependency, get_profile_model, redis_dependency, profile_dependency
 from app.models.client.wash import Review
 from app.models.admin.rewards import Reward, RewardRequest
 from app.schemas.request.washer import RewardRequestSchema
 from typing import Literal
+from app.utils.pagination import paginate, page
 from uuid import uuid4
-import json
 
 
 router = APIRouter(
@@ -17,28 +17,30 @@ router = APIRouter(
 async def get_ratings_history(
     db: db_dependency,
     washer: washer_dependency,
-    skip: int = 0,
-    limit: int = 10
+    profile: profile_dependency,
+    cursor: str | None = None,
+    limit: int = Query(10, ge=1, le=50)
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
-    reviews = db.query(Review).filter(Review.washer_id == profile_model.id).offset(skip).limit(limit).all()
+    query = db.query(Review).filter(Review.washer_id == profile.id)
+    reviews, next_cursor = page(paginate(query, Review, cursor, limit), limit)
 
     return {
         "message": "Rating and reviews retrieved successfully",
         "status": "ok",
-        "data": reviews
+        "data": reviews,
+        "next_cursor": next_cursor
     }
 
 @router.get("/chart-data", status_code=status.HTTP_200_OK)
 async def get_rating_chart_data(
     db: db_dependency,
     washer: washer_dependency,
+    profile: profile_dependency,
     redis: redis_dependency,
     filter: Literal["week", "month", "last_month", "3_months"] = "week"
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
     # time filter 
-    reviews = db.query(Review).filter(Review.washer_id == profile_model.id).all()
+    reviews = db.query(Review).filter(Review.washer_id == profile.id).all()
     
     if not reviews:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "No reviews found")
@@ -53,10 +55,10 @@ async def get_rating_chart_data(
 async def get_available_rewards(
     db: db_dependency,
     washer: washer_dependency,
+    profile: profile_dependency,
     redis: redis_dependency
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
-    rewards = db.query(Reward).join(Reward.achievers).filter(RewardRequest.washer_id != profile_model.id).all()
+    rewards = db.query(Reward).join(Reward.achievers).filter(RewardRequest.washer_id != profile.id).all()
 
     return {
         "message": "Rewards retrieved successfully",
@@ -68,11 +70,10 @@ async def get_available_rewards(
 async def claim_reward(
     db: db_dependency,
     washer: washer_dependency,
+    profile: profile_dependency,
     redis: redis_dependency
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
-
-    rewards = db.query(Reward).join(Reward.achievers).filter(RewardRequest.washer_id == profile_model.id).all()
+    rewards = db.query(Reward).join(Reward.achievers).filter(RewardRequest.washer_id == profile.id).all()
     
     return {
         "message": "Rewards retrieved successfully",
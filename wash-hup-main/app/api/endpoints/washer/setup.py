@@ -1,5 +1,4 @@
 from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import func, select
 from ...dependencies import db_dependency, get_profile_model, washer_dependency, redis_dependency
 from app.models.auth.user import Address
 from app.services.paystack import create_subaccount
@@ -7,8 +6,10 @@ from app.models.washer.profile import Wallet, WasherProfile
 from app.models.admin.profile import VerificationRequest
 from app.schemas.request.washer import AccountDetailRequest
 from app.services.paystack import get_bank_list
+from app.services.cache import cache
+from app.services.geo import lonlat, washer_grid, WASHER_LOCATIONS, WASHER_AVAILABLE, WASHER_LAST_SEEN
 from uuid import uuid4
-import json
+import time
 
 # todo
 # 1. add email notificaton and push notification 
@@ -33,16 +34,20 @@ async def update_washer_availability(db: db_dependency, r: redis_dependency, was
         if not profile_model.profile_verified:
             raise HTTPException(status_code=400, detail="Profile must be verified before setting availability.")
 
-        address = db.query(Address).filter(Address.profile_id == profile_model.id).first()
+        address = db.query(*lonlat(Address.geom)).filter(Address.profile_id == profile_model.id).first()
 
         if not address:
             raise HTTPException(status_code=404, detail="Address not found")
+
+        longitude, latitude = address
         
-        point = db.scalar(select(func.ST_AsText(Address.geom)).where(Address.id == address.id))
-        longitude = float(point.split('(')[1].split(' ')[0])
-        latitude = float(point.split(' ')[1].split(')')[0])
-        
-        await r.geoadd("washers:location", (longitude, latitude, profile_model.id))
+        # the address is only a starting point; live updates over the websocket take over
+        washer_grid.add(profile_model.id, longitude, latitude)
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.geoadd(WASHER_LOCATIONS, (longitude, latitude, profile_model.id))
+            pipe.sadd(WASHER_AVAILABLE, profile_model.id)
+            pipe.zadd(WASHER_LAST_SEEN, {profile_model.id: time.time()})
+            await pipe.execute()
 
         profile_model.available = True
         db.commit()
@@ -53,7 +58,12 @@ async def update_washer_availability(db: db_dependency, r: redis_dependency, was
             "status": "ok",
         }
 
-    await r.zrem("washers:location", profile_model.id)
+    washer_grid.remove(profile_model.id)
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.zrem(WASHER_LOCATIONS, profile_model.id)
+        pipe.srem(WASHER_AVAILABLE, profile_model.id)
+        pipe.zrem(WASHER_LAST_SEEN, profile_model.id)
+        await pipe.execute()
     profile_model.available = False
     db.commit()
     
@@ -111,22 +121,12 @@ async def add_payment_destination(
 
 @router.get("/bank-list", status_code=status.HTTP_200_OK)
 async def get_list_of_banks(washer: washer_dependency, r: redis_dependency):
-    bank_list = await r.getex("bank-list")
-
-    if not bank_list:
-        bank_list = await get_bank_list()
-        await r.setex("bank-list", 3600*24, json.dumps(bank_list))
-
-        return {
-            "message": "bank list retrieved successfully",
-            "status": "ok",
-            "data": bank_list
-        }
+    bank_list = await cache.get(r, "bank-list", get_bank_list, fresh_for=24*3600, stale_for=7*24*3600)
 
     return {
             "message": "bank list retrieved successfully",
             "status": "ok",
-            "data": json.loads(bank_list)
+            "data": bank_list
         }
 
 #manual verification
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, status
-from ...dependencies import db_dependency, washer_dependency, get_profile_model
+from fastapi import APIRouter, status, Query
+from ...dependencies import db_dependency, washer_dependency, profile_dependency
 from app.models.washer.transaction import Remittance, Transaction
-import json
+from app.utils.pagination import paginate, page
 
 
 router = APIRouter(
@@ -13,16 +13,18 @@ router = APIRouter(
 async def get_earning_history(
     db: db_dependency, 
     washer: washer_dependency,
-    skip: int = 0, 
-    limit: int = 10
+    profile: profile_dependency,
+    cursor: str | None = None,
+    limit: int = Query(10, ge=1, le=50)
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
-    trancactions = db.query(Transaction).filter(Transaction.washer_id == profile_model.id).offset(skip).limit(limit).all()
+    query = db.query(Transaction).filter(Transaction.washer_id == profile.id)
+    trancactions, next_cursor = page(paginate(query, Transaction, cursor, limit), limit)
 
     return {
         "message": "transactions retrieved successfully",
         "status": "ok",
-        "data": trancactions
+        "data": trancactions,
+        "next_cursor": next_cursor
     }
 
 
@@ -30,16 +32,18 @@ async def get_earning_history(
 async def get_remittance_history(
     db: db_dependency, 
     washer: washer_dependency,
-    skip: int = 0, 
-    limit: int = 10
+    profile: profile_dependency,
+    cursor: str | None = None,
+    limit: int = Query(10, ge=1, le=50)
 ):
-    profile_model = get_profile_model(db, washer.get("id"))
-    remittances = db.query(Remittance).filter(Remittance.washer_id == profile_model.id).offset(skip).limit(limit).all()
+    query = db.query(Remittance).filter(Remittance.washer_id == profile.id)
+    remittances, next_cursor = page(paginate(query, Remittance, cursor, limit), limit)
 
     return {
         "message": "remittances retrieved successfully",
         "status": "ok",
-        "data": remittances
+        "data": remittances,
+        "next_cursor": next_cursor
     }
 
 
@@ -0,0 +1,120 @@
+# app/core/pool.py
+import time
+import threading
+from collections import Counter, deque
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from app.core.logger import logger
+
+WAIT_SAMPLES = 2048  # recent checkout waits kept for the percentiles
+
+
+class PoolMetrics:
+    """
+    Checkout wait, occupancy and failures for one engine's pool.
+
+    Waits are timed inside the pool itself (see TimedQueuePool), the rest is
+    fed by pool event listeners. Everything is per worker process, like the
+    websocket stats.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self.waits: deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self.counters: Counter = Counter()
+        self.max_wait = 0.0
+        self.lock = threading.Lock()  # the sync pool is used from the threadpool too
+
+    def attach(self, engine):
+        engine = getattr(engine, "sync_engine", engine)  # events go on the AsyncEngine's sync core
+        self._bind(engine.pool)
+        event.listen(engine.pool, "connect", self._on_connect)
+        event.listen(engine.pool, "checkout", self._on_checkout)
+        event.listen(engine.pool, "checkin", self._on_checkin)
+        event.listen(engine.pool, "invalidate", self._on_invalidate)
+        # dispose() swaps in a fresh pool that keeps the listeners but not the metrics
+        event.listen(engine, "engine_disposed", lambda disposed: self._bind(disposed.pool))
+        return self
+
+    def _bind(self, pool):
+        self.pool = pool
+        pool.metrics = self
+
+    def record_wait(self, seconds: float):
+        with self.lock:
+            self.waits.append(seconds)
+            self.max_wait = max(self.max_wait, seconds)
+
+    def record_timeout(self, seconds: float):
+        with self.lock:
+            self.counters["timeouts"] += 1
+        logger.warning(f"db pool {self.name}: no connection after {seconds:.1f}s "
+                       f"({self.pool.checkedout()} checked out, overflow {self.pool.overflow()})")
+
+    def _on_connect(self, dbapi_connection, record):
+        self.counters["connections_opened"] += 1
+
+    def _on_checkout(self, dbapi_connection, record, proxy):
+        self.counters["checkouts"] += 1
+
+    def _on_checkin(self, dbapi_connection, record):
+        self.counters["checkins"] += 1
+
+    def _on_invalidate(self, dbapi_connection, record, exception):
+        # includes connections pre-ping found dead
+        self.counters["invalidated"] += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            waits = sorted(self.waits)
+            counters = dict(self.counters)
+            max_wait = self.max_wait
+
+        def percentile(p: float) -> float:
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))] * 1000, 3) if waits else 0.0
+
+        return {
+            "pool_size": self.pool.size(),
+            "checked_out": self.pool.checkedout(),
+            "idle": self.pool.checkedin(),
+            # QueuePool starts at -pool_size and counts up as connections open
+            "overflow": max(self.pool.overflow(), 0),
+            "checkout_wait_ms": {
+                "p50": percentile(0.50),
+                "p99": percentile(0.99),
+                "max": round(max_wait * 1000, 3),
+                "samples": len(waits),
+            },
+            "checkouts": counters.get("checkouts", 0),
+            "checkins": counters.get("checkins", 0),
+            "timeouts": counters.get("timeouts", 0),
+            "connections_opened": counters.get("connections_opened", 0),
+            "invalidated": counters.get("invalidated", 0),
+        }
+
+
+class _TimedCheckout:
+    # there is no "before checkout" event, so the wait is timed around the pool's own get
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeout:
+            if self.metrics:
+                self.metrics.record_timeout(time.perf_counter() - start)
+            raise
+        if self.metrics:
+            self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
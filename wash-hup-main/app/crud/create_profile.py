@@ -31,14 +31,12 @@ async def create_user_profile(db, user_id: str, role: str):
     await send_welcome_email(role, profile_model.user.fullname, profile_model.user.email)
 
     await NOTIFY.create(
-        db, 
         profile_model.id, 
         "welcome to wash-hup", 
         message=NOTIFICATION.signup_owner if role == "owner" else NOTIFICATION.signup_washer,
         fullname=profile_model.user.fullname
     )
     await NOTIFY.create(
-        db, 
         profile_model.id, 
         "Verify you email.", 
         message=NOTIFICATION.verify_email if role == "owner" else NOTIFICATION.verify_email, 
@@ -1,30 +1,28 @@
 from app.models.auth.user import Issue, IssueMessage
-from app.websocket.schema import BodyMessage
+from app.websocket.schema import AdminIssueMessage
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import uuid4
 
 
 
-async def create_issue_message(db, profile, data: str) -> str:
-    issue_model = db.query(Issue).filter(Issue.profile_id == profile.id).first()
+async def create_issue_message(db: AsyncSession, profile, message: str) -> str:
+    # `message` was validated with the inbound frame
+    issue_model = await db.scalar(select(Issue).where(Issue.profile_id == profile.id).limit(1))
 
     if not issue_model:
         return "issue_error"
-    try:
-        message = BodyMessage.model_validate({"message": data})
-    except: 
-        return "invalid_message"
 
-    
     message_model = IssueMessage(
         id="i-"+str(uuid4()),
         issue_id=issue_model.id,
         profile_id=profile.id,
-        body=message.message
+        body=message
     )
 
     db.add(message_model)
-    db.commit()
-    db.refresh(message_model)
+    await db.commit()
+    await db.refresh(message_model)
 
     return {
         "message": "issue created",
@@ -32,26 +30,22 @@ async def create_issue_message(db, profile, data: str) -> str:
     }
 
 
-async def create_issue_message_admin(db, profile, data: dict):
-    issue_model = db.query(Issue).filter(Issue.id == data.get('issue_id')).first()
+async def create_issue_message_admin(db: AsyncSession, profile, data: AdminIssueMessage):
+    issue_model = await db.get(Issue, data.issue_id)
 
     if not issue_model:
         return "issue_error"
-    try:
-        message = BodyMessage.model_validate({"message": data['message']})
-    except: 
-        return "invalid_message"
-    
+
     message_model = IssueMessage(
         id="i-"+str(uuid4()),
         issue_id=issue_model.id,
         profile_id=profile.id,
-        body=message.message
+        body=data.message
     )
 
     db.add(message_model)
-    db.commit()
-    db.refresh(message_model)
+    await db.commit()
+    await db.refresh(message_model)
 
     return {
         "message": "issue created",
@@ -1,4 +1,5 @@
 from app.models.auth.user import Notifications
+from app.database import AsyncSessionLocal
 from app.websocket.router import manager
 import uuid
 
@@ -62,8 +63,8 @@ class Notify:
     def format(self, message: str, **kwarg):
         return message.format(**kwarg)
 
-    async def create(self, db, id: str, title: str, message: str, fullname: str, **kwargs):
-
+    async def create(self, id: str, title: str, message: str, fullname: str, **kwargs):
+        # runs after the response as often as not, so it never borrows the request's session
         notification_model = Notifications(
             id=str(uuid.uuid4()),
             profile_id=id,
@@ -71,9 +72,9 @@ class Notify:
             message=self.format(message, fullname=fullname, **kwargs)
         )
 
-        db.add(notification_model)
-        db.commit()
-        db.refresh(notification_model)
+        async with AsyncSessionLocal() as db:
+            db.add(notification_model)
+            await db.commit()
         
         data = {
             "action": "notification",
@@ -15,4 +15,4 @@ class ServicePrice(Base):
     smart_max: Mapped[float]
     premium_min: Mapped[float]
     premium_max: Mapped[float]
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
@@ -38,8 +38,8 @@ class Faqs(Base):
     category: Mapped[Category] = mapped_column(SQLEnum(Category), nullable=False)
     question: Mapped[str]
     answer: Mapped[str]
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
-    updated: Mapped[datetime] = mapped_column(nullable=True, default=None, onupdate=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+    updated: Mapped[datetime] = mapped_column(nullable=True, default=None, onupdate=lambda: datetime.now(timezone.utc))
 
     admin = relationship("AdminProfile", back_populates="faqs")
 
@@ -50,7 +50,7 @@ class TermsAndConditions(Base):
     admin_id: Mapped[str] = mapped_column(ForeignKey('admin_profile.id'), nullable=False)
     category: Mapped[Category] = mapped_column(SQLEnum(Category), nullable=False)
     terms: Mapped[str]
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
 
     admin = relationship("AdminProfile", back_populates="terms")
 
@@ -64,6 +64,6 @@ class VerificationRequest(Base):
     handled_by: Mapped[str] = mapped_column(ForeignKey('admin_profile.id'), nullable=True)
     admin_notes: Mapped[str] = mapped_column(nullable=True)
     seen: Mapped[bool] = mapped_column(default=False)
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
 
     handler = relationship("AdminProfile", back_populates="verification_handled")
@@ -28,7 +28,7 @@ class Reward(Base):
     rating: Mapped[float]
     expiry_date: Mapped[datetime]
     available: Mapped[bool] = mapped_column(default=True)
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
 
     achievers: Mapped[list["RewardRequest"]] = relationship("RewardRequest", secondary=reward_washers, back_populates="rewards")
 
@@ -44,7 +44,7 @@ class RewardRequest(Base):
     city: Mapped[str]
     state: Mapped[str]
     phone_number: Mapped[str]
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
 
     rewards: Mapped[list["Reward"]] = relationship("Reward", secondary=reward_washers, back_populates="achievers")
 
@@ -63,6 +63,6 @@ class Discounts(Base):
     total: Mapped[int] = mapped_column(default=0)
     is_available: Mapped[bool] = mapped_column(default=True)
     collected: Mapped[bool] = mapped_column(default=False)
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
 
     creator: Mapped["AdminProfile"] = relationship("AdminProfile", back_populates="discounts", foreign_keys=[admin_id])
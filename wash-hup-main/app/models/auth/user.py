@@ -1,5 +1,5 @@
 from app.database import Base
-from sqlalchemy import Column, ForeignKey, String, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, ForeignKey, String, Boolean, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime, timezone
 from geoalchemy2 import Geometry
@@ -22,7 +22,7 @@ class User(Base):
     is_active: Mapped[bool] = mapped_column(default=True)
     is_email_verified: Mapped[bool] = mapped_column(default=False)
     phone_number: Mapped[str] = mapped_column(unique=True)
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
 
     profile = relationship("Profile", back_populates="user", uselist=False, cascade="all, delete-orphan")
 
@@ -39,8 +39,8 @@ class Profile(Base):
     is_deactivated: Mapped[bool] = mapped_column(default=False)
 
     payment_method: Mapped[str] = mapped_column(nullable=True)
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
-    updated: Mapped[datetime] = mapped_column(nullable=True, default=None, onupdate=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+    updated: Mapped[datetime] = mapped_column(nullable=True, default=None, onupdate=lambda: datetime.now(timezone.utc))
 
     user = relationship("User", back_populates="profile")
     address = relationship("Address", back_populates="profile", cascade="all, delete-orphan")
@@ -64,6 +64,8 @@ class Address(Base):
 
     profile = relationship("Profile", back_populates="address")
 
+Index("ix_address_profile_id", Address.profile_id)
+
 class Notifications(Base):
     __tablename__ = "notifications"
 
@@ -72,17 +74,23 @@ class Notifications(Base):
     title: Mapped[str]
     message: Mapped[str]
     is_read: Mapped[bool] = mapped_column(default=False)
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+
+# a user's unread notifications, newest first
+Index("ix_notifications_profile_unread_created", Notifications.profile_id, Notifications.is_read,
+      Notifications.created.desc(), Notifications.id.desc())
 
 class Issue(Base):
     __tablename__ = "issues"
 
     id: Mapped[str] = mapped_column(primary_key=True, index=True)
     profile_id: Mapped[str] = mapped_column(ForeignKey("profile.id"), nullable=False)
-    created: Mapped[str] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
 
     messages = relationship("IssueMessage", back_populates="issue", cascade="all, delete-orphan")
 
+Index("ix_issues_profile_id", Issue.profile_id)
+
 
 class IssueMessage(Base):
     __tablename__ = "issue_messages"
@@ -91,6 +99,8 @@ class IssueMessage(Base):
     issue_id: Mapped[str] = mapped_column(ForeignKey("issues.id"), nullable=False)
     profile_id: Mapped[str] = mapped_column(ForeignKey("profile.id"), nullable=False)
     body: Mapped[str]
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
 
     issue = relationship("Issue", back_populates="messages")
+
+Index("ix_issue_messages_issue_created", IssueMessage.issue_id, IssueMessage.created, IssueMessage.id)
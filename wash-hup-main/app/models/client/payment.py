@@ -1,5 +1,5 @@
 from app.database import Base
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime, timezone
 from enum import Enum
@@ -26,5 +26,8 @@ class Payment(Base):
     amount: Mapped[float]
     status: Mapped[PaymentStatus] = mapped_column(default=None)
 
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
 
+# reference is unique, so it already has its own index
+Index('ix_payments_sender_created', Payment.sender_id, Payment.created.desc(), Payment.id.desc())
+Index('ix_payments_receiver_created', Payment.receiver_id, Payment.created.desc(), Payment.id.desc())
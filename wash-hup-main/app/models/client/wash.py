@@ -1,5 +1,5 @@
 from app.database import Base
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from geoalchemy2 import Geometry
 from geoalchemy2.shape import WKBElement
@@ -42,13 +42,16 @@ class Wash(Base):
     completed: Mapped[bool] = mapped_column(default=False)
     time_completed: Mapped[datetime] = mapped_column(default=None)
 
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
     
     # --- relationships
     cars = relationship('Car', back_populates='wash', cascade='all, delete-orphan')
     wash_location = relationship('Location', back_populates='wash')
     rating = relationship('Review', back_populates='wash')
-    
+
+# a washer's or a client's washes filtered by state, newest first
+Index('ix_washes_washer_completed_created', Wash.washer_id, Wash.completed, Wash.created.desc(), Wash.id.desc())
+Index('ix_washes_client_completed_created', Wash.client_id, Wash.completed, Wash.created.desc(), Wash.id.desc())
 
 class Location(Base):
     __tablename__ = 'location'
@@ -70,6 +73,8 @@ class Car(Base):
 
     wash = relationship('Wash', back_populates='cars')
 
+Index('ix_cars_wash_id', Car.wash_id)
+
 class Review(Base):
     __tablename__ = "reviews"
 
@@ -79,10 +84,13 @@ class Review(Base):
     washer_id: Mapped[str] = mapped_column(ForeignKey("washer_profile.id"), nullable=False)
     rating: Mapped[float]
     review: Mapped[str] = mapped_column(default=None)
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
 
     wash = relationship("Wash", back_populates="rating")
 
+Index('ix_reviews_washer_created', Review.washer_id, Review.created.desc(), Review.id.desc())
+Index('ix_reviews_wash_id', Review.wash_id)
+
 class WashMessage(Base):
     __tablename__ = 'wash_messages'
 
@@ -90,4 +98,6 @@ class WashMessage(Base):
     wash_id: Mapped[str] = mapped_column(ForeignKey('washes.id'), nullable=False)
     sender_id: Mapped[str] = mapped_column(ForeignKey('profile.id'), nullable=False)
     body: Mapped[str]
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
\ No newline at end of file
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+
+Index('ix_wash_messages_wash_created', WashMessage.wash_id, WashMessage.created, WashMessage.id)
@@ -34,7 +34,7 @@ class Wallet(Base):
     bank_name: Mapped[str]
     bank_code: Mapped[str]
 
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
-    updated: Mapped[datetime] = mapped_column(default=None, onupdate=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+    updated: Mapped[datetime] = mapped_column(default=None, onupdate=lambda: datetime.now(timezone.utc))
 
     washer = relationship("WasherProfile", back_populates="wallet")
\ No newline at end of file
@@ -1,5 +1,5 @@
 from app.database import Base
-from sqlalchemy import Column, String, ForeignKey, DateTime, Float
+from sqlalchemy import Column, String, ForeignKey, DateTime, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime, timezone
 
@@ -14,7 +14,9 @@ class Transaction(Base):
 
     amount: Mapped[float]
     address: Mapped[str]
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+
+Index('ix_transactions_washer_created', Transaction.washer_id, Transaction.created.desc(), Transaction.id.desc())
 
 
 class Remittance(Base):
@@ -25,4 +27,6 @@ class Remittance(Base):
     washer_id: Mapped[str] = mapped_column(ForeignKey('washer_profile.id'), nullable=False)
     amount: Mapped[float]
     charge: Mapped[float]
-    created: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))
+    created: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+
+Index('ix_remittances_washer_created', Remittance.washer_id, Remittance.created.desc(), Remittance.id.desc())
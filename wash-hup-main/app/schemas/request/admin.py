@@ -49,6 +49,7 @@ class FAQCreateSchema(BaseModel):
     answer: str
 
 class FAQUpdateSchema(BaseModel):
+    category: Optional[Category] = None
     question: Optional[str] = None
     answer: Optional[str] = None
 
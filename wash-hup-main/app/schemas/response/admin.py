@@ -58,3 +58,4 @@ class AdminUserResponse(BaseModel):
 
 class AdminUsersListResponse(AdminBaseResponse):
     data: List[AdminUserResponse]
+    next_cursor: Optional[str] = None
@@ -17,6 +17,7 @@ class NotificationSchema(BaseModel):
 
 class NotificationResponse(ResponseSchema):
     data: list[NotificationSchema] | NotificationSchema
+    next_cursor: str | None = None
 
 # Transaction Schema and Response 
 class TransactionSchema(BaseModel):
@@ -71,7 +72,7 @@ class ProfileResponse(ResponseSchema):
     data: ProfileSchema
 
 class FaqSchema(BaseModel):
-    id: int
+    id: str
     question: str
     answer: str
     created: datetime
@@ -129,12 +130,21 @@ class CarResponse(ResponseSchema):
 class WasherSchema(BaseModel):
     id: str
     fullname: str
-    rating: bool
+    rating: float
     pic: str | None = None
     washes: int
     flagged: bool
+    distance: float | None = None  # km from the wash location
 
 class WasherResponse(ResponseSchema):
     data: list[WasherSchema]
 
+class MatchedWasherSchema(BaseModel):
+    id: str
+    distance: float
+    score: float
+
+class MatchResponse(ResponseSchema):
+    data: list[MatchedWasherSchema]
+
 
@@ -11,6 +11,7 @@ class UpcomingOfferSchema(BaseModel):
 
 class UpcomingOfferResponse(ResponseSchema):
     data: list[UpcomingOfferSchema]
+    total: int = 0
 
 
 class WashInfoSchema(BaseModel):
@@ -72,6 +73,7 @@ class CompletedWashSchema(BaseModel):
 
 class CompletedWashResponse(ResponseSchema):
     data: list[CompletedWashSchema]
+    next_cursor: str | None = None
 
 
 class WasherSetupProgress(BaseModel):
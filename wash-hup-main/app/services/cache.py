@@ -0,0 +1,192 @@
+# app/services/cache.py
+import os
+import json
+import time
+import uuid
+import asyncio
+import redis.asyncio as redis
+from typing import Any, Awaitable, Callable
+from app.services.redis import get_redis_client
+from app.core.logger import logger
+from dotenv import load_dotenv
+load_dotenv()
+
+MEMORY_TTL = float(os.getenv("CACHE_MEMORY_TTL", 30))  # how long a worker trusts its own copy
+MEMORY_MAX_ENTRIES = int(os.getenv("CACHE_MEMORY_MAX_ENTRIES", 512))
+LOCK_TTL_MS = int(os.getenv("CACHE_LOCK_TTL_MS", 10000))  # a refresh that takes longer loses the lock
+COLD_WAIT = float(os.getenv("CACHE_COLD_WAIT", 5))  # how long a cold miss waits for another worker's load
+COLD_POLL = 0.05
+# invalidate() publishes the key here so every worker drops its memory copy
+CACHE_CHANNEL = "cache:invalidate"
+CACHE_RETRY_DELAY = 1
+
+# delete the lock only if we still own it
+_RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+Loader = Callable[[], Awaitable[Any]]
+_LOST = object()  # another worker holds the refresh lock
+
+
+def cache_key(key: str) -> str:
+    return f"cache:{key}"
+
+def lock_key(key: str) -> str:
+    return f"cache-lock:{key}"
+
+
+class SWRCache:
+    """
+    Stale-while-revalidate cache for slow-changing upstream data.
+
+    Values live in redis as {"value", "fresh_until"} for fresh_for + stale_for
+    seconds, with a short-lived copy in this worker's memory in front. Fresh
+    values are returned as they are. Stale values are returned immediately
+    while one background refresh runs. Only the holder of a redis lock loads
+    from upstream, so a key that expires triggers one upstream call across
+    the whole cluster rather than one per request.
+
+    invalidate() deletes the redis copy and, over pub/sub, the memory copy on
+    every worker running listen(). If that message is lost, other workers
+    serve their old copy for at most MEMORY_TTL seconds.
+    """
+
+    def __init__(self):
+        self.memory: dict[str, tuple[float, dict]] = {}  # key -> (held until, envelope)
+        self.inflight: dict[str, asyncio.Task] = {}
+        self._listener: asyncio.Task | None = None
+
+    async def get(self, r: redis.Redis, key: str, loader: Loader, fresh_for: int, stale_for: int) -> Any:
+        now = time.time()
+        envelope = self._from_memory(key, now)
+
+        if envelope is None:
+            try:
+                raw = await r.get(cache_key(key))
+            except redis.RedisError as exc:
+                logger.warning(f"cache {key}: redis unavailable, loading directly: {exc}")
+                return await loader()
+            if raw is not None:
+                envelope = json.loads(raw)
+                self._remember(key, envelope, now)
+
+        if envelope is None:
+            return await self._load_cold(r, key, loader, fresh_for, stale_for)
+
+        if envelope["fresh_until"] <= now:
+            self._single_flight(r, key, loader, fresh_for, stale_for)
+        return envelope["value"]
+
+    async def invalidate(self, r: redis.Redis, key: str):
+        self.memory.pop(key, None)
+        await r.delete(cache_key(key))
+        try:
+            await r.publish(CACHE_CHANNEL, key)
+        except (redis.RedisError, OSError) as exc:
+            logger.warning(f"cache {key}: invalidation not broadcast, other workers catch up within {MEMORY_TTL}s: {exc}")
+
+    # ---- Cross-worker invalidation ----
+    def start_listener(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self.listen())
+
+    async def stop_listener(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+        self._listener = None
+
+    async def listen(self):
+        while True:
+            pubsub = None
+            try:
+                r = await get_redis_client()
+                pubsub = r.pubsub()
+                await pubsub.subscribe(CACHE_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        key = message["data"]
+                        self.memory.pop(key.decode() if isinstance(key, bytes) else key, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"cache listener disconnected, retrying: {exc}")
+                # anything published meanwhile was missed
+                self.memory.clear()
+                await asyncio.sleep(CACHE_RETRY_DELAY)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    def _from_memory(self, key: str, now: float) -> dict | None:
+        entry = self.memory.get(key)
+        if entry is None or entry[0] <= now:
+            return None
+        return entry[1]
+
+    def _remember(self, key: str, envelope: dict, now: float):
+        if len(self.memory) >= MEMORY_MAX_ENTRIES and key not in self.memory:
+            self.memory.pop(next(iter(self.memory)))
+        # never hold a fresh value past the moment it turns stale
+        held = min(now + MEMORY_TTL, max(envelope["fresh_until"], now + 1))
+        self.memory[key] = (held, envelope)
+
+    def _single_flight(self, r, key, loader, fresh_for, stale_for) -> asyncio.Task:
+        task = self.inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh(r, key, loader, fresh_for, stale_for))
+            self.inflight[key] = task
+            task.add_done_callback(lambda done: self._settle(key, done))
+        return task
+
+    def _settle(self, key: str, task: asyncio.Task):
+        self.inflight.pop(key, None)
+        # a failed background refresh keeps serving the stale value; its error is already logged
+        if not task.cancelled():
+            task.exception()
+
+    async def _load_cold(self, r, key, loader, fresh_for, stale_for):
+        value = await self._single_flight(r, key, loader, fresh_for, stale_for)
+        if value is not _LOST:
+            return value
+
+        # another worker holds the lock: wait for its result rather than piling onto upstream
+        deadline = time.time() + COLD_WAIT
+        while time.time() < deadline:
+            await asyncio.sleep(COLD_POLL)
+            raw = await r.get(cache_key(key))
+            if raw is not None:
+                envelope = json.loads(raw)
+                self._remember(key, envelope, time.time())
+                return envelope["value"]
+
+        logger.warning(f"cache {key}: gave up waiting for another worker, loading directly")
+        return await loader()
+
+    async def _refresh(self, r, key, loader, fresh_for, stale_for):
+        """Load and store the value if this worker wins the lock; returns _LOST if it didn't."""
+        token = uuid.uuid4().hex
+        if not await r.set(lock_key(key), token, nx=True, px=LOCK_TTL_MS):
+            return _LOST
+        try:
+            value = await loader()
+            now = time.time()
+            envelope = {"value": value, "fresh_until": now + fresh_for}
+            await r.set(cache_key(key), json.dumps(envelope, default=str), ex=fresh_for + stale_for)
+            self._remember(key, envelope, now)
+            return value
+        except Exception as exc:
+            logger.warning(f"cache {key}: refresh failed: {exc}")
+            raise
+        finally:
+            await r.eval(_RELEASE_LOCK, 1, lock_key(key), token)
+
+
+cache = SWRCache()
@@ -0,0 +1,312 @@
+# app/services/geo.py
+import os
+import math
+import time
+import asyncio
+import redis.asyncio as redis
+from collections import defaultdict
+from sqlalchemy import func, select
+from app.models.auth.user import Address
+from app.models.washer.profile import WasherProfile
+from app.services.redis import get_redis_client as get_redis
+from app.core.logger import logger
+from dotenv import load_dotenv
+load_dotenv()
+
+WASHER_LOCATIONS = "washers:location"
+WASHER_AVAILABLE = "washers:available"  # washers who toggled availability on
+WASHER_LAST_SEEN = "washers:last_seen"  # zset of washer id -> unix time of their last position
+WASHER_SEEDED = "washers:seeded"  # set once the db's available washers have been copied into redis
+
+DEFAULT_RADIUS_KM = float(os.getenv("WASHER_SEARCH_RADIUS_KM", 5))
+MAX_RADIUS_KM = float(os.getenv("WASHER_SEARCH_MAX_RADIUS_KM", 20))
+DEFAULT_LIMIT = int(os.getenv("WASHER_SEARCH_LIMIT", 20))
+MAX_LIMIT = 50
+
+# in-memory fallback index
+GRID_CELL_DEG = float(os.getenv("WASHER_GRID_CELL_DEG", 0.05))  # ~5.5 km of latitude
+GRID_REFRESH = int(os.getenv("WASHER_GRID_REFRESH", 300))  # seconds before a full reload from the db
+EARTH_RADIUS_KM = 6372.7976  # the radius redis uses, so both indexes agree on distances
+
+# live positions
+LOCATION_FLUSH_INTERVAL = float(os.getenv("WASHER_LOCATION_FLUSH_INTERVAL", 1))
+LOCATION_TTL = int(os.getenv("WASHER_LOCATION_TTL", 600))  # evict washers silent for this long
+LOCATION_SWEEP_INTERVAL = int(os.getenv("WASHER_LOCATION_SWEEP_INTERVAL", 60))
+
+
+def lonlat(geom):
+    """ST_X/ST_Y of a POINT column, to select alongside its row instead of parsing WKT."""
+    return func.ST_X(geom).label("longitude"), func.ST_Y(geom).label("latitude")
+
+
+def haversine(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    lon1, lat1, lon2, lat2 = map(math.radians, (lon1, lat1, lon2, lat2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def available_washers():
+    """Id and address coordinates of every available, verified washer."""
+    return (
+        select(WasherProfile.id, *lonlat(Address.geom))
+        .join(Address, Address.profile_id == WasherProfile.id)
+        .where(WasherProfile.available == True, WasherProfile.profile_verified == True)
+    )
+
+
+class WasherGrid:
+    """
+    Available, verified washers bucketed into fixed lat/lon cells.
+
+    Built from Address.geom and kept current by the availability endpoint;
+    nearby searches fall back to it when redis is unavailable. Like the GEO
+    set, it only returns washers heard from within LOCATION_TTL: `seen` is
+    fed by this worker's flushes and, for every worker's washers, by the
+    sweep while redis is up. Washers the grid has no news of count as seen
+    when they are loaded, and ones the sweep expired stay expired.
+    """
+
+    def __init__(self, cell_deg: float = GRID_CELL_DEG):
+        self.cell_deg = cell_deg
+        self.cells: dict[tuple[int, int], dict[str, tuple[float, float]]] = defaultdict(dict)
+        self.washers: dict[str, tuple[int, int]] = {}
+        self.seen: dict[str, float] = {}  # washer id -> unix time of their last position
+        self.loaded_at: float | None = None
+
+    def _cell(self, longitude: float, latitude: float) -> tuple[int, int]:
+        return int(longitude // self.cell_deg), int(latitude // self.cell_deg)
+
+    def add(self, washer_id: str, longitude: float, latitude: float, seen: float | None = None):
+        self.remove(washer_id)
+        cell = self._cell(longitude, latitude)
+        self.cells[cell][washer_id] = (longitude, latitude)
+        self.washers[washer_id] = cell
+        self.seen[washer_id] = time.time() if seen is None else seen
+
+    def remove(self, washer_id: str):
+        self.seen.pop(washer_id, None)
+        cell = self.washers.pop(washer_id, None)
+        if cell is None:
+            return
+        members = self.cells[cell]
+        members.pop(washer_id, None)
+        if not members:
+            del self.cells[cell]
+
+    def expire(self, washer_id: str, seen: float):
+        # drop the position but remember how old it was, so the next load doesn't revive it
+        self.remove(washer_id)
+        self.seen[washer_id] = seen
+
+    def fill(self, rows):
+        """Rebuild from (washer_id, longitude, latitude) of the washers the db marks available."""
+        now = time.time()
+        seen = dict(self.seen)
+        positions = {washer_id: self.cells[cell][washer_id] for washer_id, cell in self.washers.items()}
+
+        self.cells.clear()
+        self.washers.clear()
+        self.seen.clear()
+        for washer_id, longitude, latitude in rows:
+            # a live position beats the address
+            longitude, latitude = positions.get(washer_id, (longitude, latitude))
+            # search() skips the ones whose last position is older than LOCATION_TTL
+            self.add(washer_id, longitude, latitude, seen.get(washer_id, now))
+        self.loaded_at = time.monotonic()
+
+    def load(self, db):
+        self.fill(db.execute(available_washers()).all())
+
+    def ensure_loaded(self, db):
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > GRID_REFRESH:
+            self.load(db)
+
+    def search(self, longitude: float, latitude: float, radius: float, limit: int) -> list[tuple[str, float]]:
+        """Same contract as GEOSEARCH ... ASC COUNT limit WITHDIST."""
+        lat_span = radius / (EARTH_RADIUS_KM * math.pi / 180)
+        lon_span = lat_span / max(math.cos(math.radians(latitude)), 1e-6)
+        min_x, min_y = self._cell(longitude - lon_span, latitude - lat_span)
+        max_x, max_y = self._cell(longitude + lon_span, latitude + lat_span)
+
+        cutoff = time.time() - LOCATION_TTL
+        found = []
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                for washer_id, (lon, lat) in self.cells.get((x, y), {}).items():
+                    if self.seen.get(washer_id, 0) <= cutoff:
+                        continue
+                    distance = haversine(longitude, latitude, lon, lat)
+                    if distance <= radius:
+                        found.append((washer_id, round(distance, 4)))
+
+        found.sort(key=lambda washer: washer[1])
+        return found[:limit]
+
+
+washer_grid = WasherGrid()
+
+
+class LocationStream:
+    """
+    Live washer positions, coalesced in memory and written to redis in batches.
+
+    Only the latest position per washer survives until the next flush, so a
+    worker absorbs any update rate with one pipeline per interval. Washers
+    whose last position is older than LOCATION_TTL are swept out of the
+    GEO set.
+    """
+
+    def __init__(self):
+        self.pending: dict[str, tuple[float, float, float]] = {}
+        self._flusher: asyncio.Task | None = None
+        self._sweeper: asyncio.Task | None = None
+
+    def push(self, washer_id: str, longitude: float, latitude: float):
+        # flushed by the task the app lifespan starts
+        self.pending[washer_id] = (longitude, latitude, time.time())
+
+    async def flush(self) -> int:
+        if not self.pending:
+            return 0
+        batch, self.pending = self.pending, {}
+        washer_ids = list(batch)
+
+        r = await get_redis()
+        # positions from washers who are not available are dropped (seed_available_washers fills the set at startup)
+        available = await r.smismember(WASHER_AVAILABLE, washer_ids)
+        live = [washer_id for washer_id, ok in zip(washer_ids, available) if ok]
+        if not live:
+            return 0
+
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.geoadd(WASHER_LOCATIONS, [v for w in live for v in (batch[w][0], batch[w][1], w)])
+            pipe.zadd(WASHER_LAST_SEEN, {w: batch[w][2] for w in live})
+            await pipe.execute()
+
+        for washer_id in live:
+            washer_grid.add(washer_id, *batch[washer_id])
+        return len(live)
+
+    async def sweep(self) -> list[str]:
+        r = await get_redis()
+        last_seen = await r.zrange(WASHER_LAST_SEEN, 0, -1, withscores=True)
+        cutoff = time.time() - LOCATION_TTL
+        stale = {washer_id: seen for washer_id, seen in last_seen if seen <= cutoff}
+        # lets the in-memory fallback vouch for washers connected to other workers
+        washer_grid.seen.update({washer_id: seen for washer_id, seen in last_seen if seen > cutoff})
+        if not stale:
+            return []
+
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.zrem(WASHER_LOCATIONS, *stale)
+            pipe.zrem(WASHER_LAST_SEEN, *stale)
+            await pipe.execute()
+
+        for washer_id, seen in stale.items():
+            washer_grid.expire(washer_id, seen)
+        return list(stale)
+
+    def start_background_tasks(self):
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run(self.flush, LOCATION_FLUSH_INTERVAL))
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._run(self.sweep, LOCATION_SWEEP_INTERVAL))
+
+    async def stop_background_tasks(self):
+        tasks = [task for task in (self._flusher, self._sweeper) if task is not None]
+        for task in tasks:
+            task.cancel()
+        # let a flush or sweep that is mid-pipeline unwind before redis goes away
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._flusher = None
+        self._sweeper = None
+
+    async def _run(self, job, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"washer location {job.__name__} failed: {exc}")
+
+
+location_stream = LocationStream()
+
+
+async def seed_available_washers(r: redis.Redis, db) -> int:
+    """
+    Load this worker's washer_grid, and copy the washers the db marks
+    available into the redis sets once per redis.
+
+    Only the availability toggle writes WASHER_AVAILABLE, so washers who were
+    already available when it was introduced (or when redis was emptied)
+    would have every position dropped by LocationStream.flush and never be
+    swept. Existing entries are left alone; the seeded ones start at their
+    address with last seen now, and age out after LOCATION_TTL if they never
+    send a position. Returns how many washers were copied into redis.
+    """
+    rows = (await db.execute(available_washers())).all()
+    # filled first, so the fallback has washers even if redis is down at startup
+    washer_grid.fill(rows)
+
+    if await r.exists(WASHER_SEEDED):
+        return 0
+
+    now = time.time()
+    async with r.pipeline(transaction=False) as pipe:
+        if rows:
+            pipe.sadd(WASHER_AVAILABLE, *(washer_id for washer_id, _, _ in rows))
+            pipe.zadd(WASHER_LAST_SEEN, {washer_id: now for washer_id, _, _ in rows}, nx=True)
+            pipe.geoadd(WASHER_LOCATIONS, [v for row in rows for v in (row[1], row[2], row[0])], nx=True)
+        pipe.set(WASHER_SEEDED, now)
+        await pipe.execute()
+    return len(rows)
+
+
+async def _geosearch(r: redis.Redis, longitude: float, latitude: float, radius: float, limit: int):
+    found = await r.geosearch(
+        WASHER_LOCATIONS,
+        longitude=longitude,
+        latitude=latitude,
+        radius=radius,
+        unit="km",
+        sort="ASC",
+        count=limit,
+        withdist=True,
+    )
+    return [(member, float(distance)) for member, distance in found]
+
+
+async def nearby_washers(
+    r: redis.Redis,
+    db,
+    longitude: float,
+    latitude: float,
+    radius: float = DEFAULT_RADIUS_KM,
+    limit: int = DEFAULT_LIMIT,
+    adaptive: bool = False,
+) -> list[tuple[str, float]]:
+    """
+    Closest washers first, as (washer_id, distance_km), never more than `limit`.
+
+    With `adaptive`, the radius doubles up to MAX_RADIUS_KM until `limit`
+    washers are found, so sparse areas still get results. If redis fails,
+    this and every later step of the same call use the in-memory index, so an
+    outage costs at most one timeout per search.
+    """
+    use_grid = False
+    while True:
+        if not use_grid:
+            try:
+                found = await _geosearch(r, longitude, latitude, radius, limit)
+            except (redis.RedisError, OSError) as exc:
+                logger.warning(f"washer geosearch unavailable, using in-memory index: {exc}")
+                await db.run_sync(washer_grid.ensure_loaded)
+                use_grid = True
+        if use_grid:
+            found = washer_grid.search(longitude, latitude, radius, limit)
+        if not adaptive or len(found) >= limit or radius >= MAX_RADIUS_KM:
+            return found
+        radius = min(radius * 2, MAX_RADIUS_KM)
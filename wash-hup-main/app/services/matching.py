@@ -0,0 +1,109 @@
+# app/services/matching.py
+import os
+import numpy as np
+import redis.asyncio as redis
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.client.wash import Wash
+from app.models.washer.profile import WasherProfile
+from app.services.geo import nearby_washers
+from app.services.offers import offer_store
+from dotenv import load_dotenv
+load_dotenv()
+
+MATCH_RADIUS_KM = float(os.getenv("MATCH_RADIUS_KM", 10))
+MATCH_CANDIDATES = int(os.getenv("MATCH_CANDIDATES", 200))  # how many of the closest washers get scored
+MATCH_MAX_LOAD = int(os.getenv("MATCH_MAX_LOAD", 3))  # ongoing washes after which a washer is skipped
+
+# score weights, each term is scaled to 0..1 before weighting
+W_DISTANCE = 0.4
+W_RATING = 0.3
+W_EXPERIENCE = 0.1
+W_LOAD = 0.2
+
+
+def score_candidates(
+    distance: np.ndarray,
+    rating: np.ndarray,
+    washes: np.ndarray,
+    flagged: np.ndarray,
+    load: np.ndarray,
+    radius: float = MATCH_RADIUS_KM,
+) -> np.ndarray:
+    """
+    Score every candidate at once; higher is better. Flagged washers and
+    washers at MATCH_MAX_LOAD come back as -inf so they are never picked.
+    """
+    experience = np.log1p(washes)
+    score = (
+        W_DISTANCE * (1 - np.clip(distance / radius, 0, 1))
+        + W_RATING * np.clip(rating / 5, 0, 1)
+        + W_EXPERIENCE * experience / max(experience.max(initial=0), 1)
+        - W_LOAD * np.clip(load / MATCH_MAX_LOAD, 0, 1)
+    )
+    return np.where(flagged | (load >= MATCH_MAX_LOAD), -np.inf, score)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k best finite scores, best first."""
+    k = min(k, int(np.isfinite(scores).sum()))
+    if k == 0:
+        return np.empty(0, dtype=int)
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best])]
+
+
+def load_candidates(db, washers: list[tuple[str, float]]):
+    """Verified washers from `washers` with their stats and ongoing wash count, in one query."""
+    distances = dict(washers)
+    ongoing = (
+        select(Wash.washer_id, func.count().label("load"))
+        .where(Wash.washer_id.in_(distances), Wash.accepted == True, Wash.completed == False)
+        .group_by(Wash.washer_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(
+            WasherProfile.id,
+            WasherProfile.rating,
+            WasherProfile.total_washes,
+            WasherProfile.is_flagged,
+            func.coalesce(ongoing.c.load, 0),
+        )
+        .outerjoin(ongoing, ongoing.c.washer_id == WasherProfile.id)
+        .where(WasherProfile.id.in_(distances), WasherProfile.profile_verified == True)
+    ).all()
+
+    ids = [row[0] for row in rows]
+    return ids, {
+        "distance": np.array([distances[i] for i in ids], dtype=float),
+        "rating": np.array([row[1] or 0 for row in rows], dtype=float),
+        "washes": np.array([row[2] or 0 for row in rows], dtype=float),
+        "flagged": np.array([bool(row[3]) for row in rows], dtype=bool),
+        "load": np.array([row[4] for row in rows], dtype=float),
+    }
+
+
+async def match_washers(r: redis.Redis, db: AsyncSession, longitude: float, latitude: float, k: int) -> list[dict]:
+    """The k best washers around a point, as {"id", "distance", "score"}, best first."""
+    washers = await nearby_washers(r, db, longitude, latitude, radius=MATCH_RADIUS_KM, limit=MATCH_CANDIDATES)
+    if not washers:
+        return []
+
+    ids, columns = await db.run_sync(load_candidates, washers)
+    if not ids:
+        return []
+
+    scores = score_candidates(**columns)
+    return [
+        {"id": ids[i], "distance": float(columns["distance"][i]), "score": round(float(scores[i]), 4)}
+        for i in top_k(scores, k)
+    ]
+
+
+async def dispatch_offer(r: redis.Redis, manager, wash_id: str, data: dict, washer_ids: list[str]) -> list[str]:
+    """Store the offer for every washer in one script, then push it to the ones it was new to in one fan-out."""
+    sent = await offer_store.put(r, washer_ids, wash_id, data)
+    if sent:
+        await manager.send_personal_many(data, sent)
+    return sent
@@ -0,0 +1,245 @@
+# app/services/offers.py
+import os
+import json
+import time
+import redis.asyncio as redis
+from fastapi import HTTPException, status
+from dotenv import load_dotenv
+load_dotenv()
+
+OFFER_TTL = int(os.getenv("OFFER_TTL", 3600))
+
+
+def offers_key(washer_id: str) -> str:
+    # wash_id -> offer json
+    return f"offers:{washer_id}"
+
+def expiry_key(washer_id: str) -> str:
+    # wash_id -> unix time the offer expires
+    return f"offers-expiry:{washer_id}"
+
+def recipients_key(wash_id: str) -> str:
+    # washer ids the wash was offered to
+    return f"offer-recipients:{wash_id}"
+
+def taken_key(wash_id: str) -> str:
+    # the washer who took the wash
+    return f"offer-taken:{wash_id}"
+
+
+class OfferState:
+    SENT = "sent"        # owner offered the wash to a washer
+    PRICED = "priced"    # washer quoted a price (may quote again until accepted)
+    ACCEPTED = "accepted"  # owner accepted the quote
+    TAKEN = "taken"      # washer took the wash; only one washer ever gets here
+
+
+# Drop expired offers, then return [total, offer json...] for one page, newest first.
+# KEYS: offers hash, expiry zset; ARGV: now, start, stop
+_PAGE = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for i = 1, #expired, 500 do
+    redis.call('HDEL', KEYS[1], unpack(expired, i, math.min(i + 499, #expired)))
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+local total = redis.call('ZCARD', KEYS[2])
+local ids = redis.call('ZREVRANGE', KEYS[2], ARGV[2], ARGV[3])
+if #ids == 0 then
+    return {total}
+end
+local page = redis.call('HMGET', KEYS[1], unpack(ids))
+table.insert(page, 1, total)
+return page
+"""
+
+# Offer a wash to each washer that doesn't already hold a live offer for it, unless it was taken;
+# returns the washers it was sent to.
+# KEYS: recipients set, taken marker, then the offers hash and expiry zset of each washer
+# ARGV: wash_id, offer json, now, expires, ttl, washer ids (KEYS order)
+_PUT = """
+local sent = {}
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return sent
+end
+for i = 6, #ARGV do
+    local offers, expiry = KEYS[2 * i - 9], KEYS[2 * i - 8]
+    local expires = redis.call('ZSCORE', expiry, ARGV[1])
+    if not expires or tonumber(expires) <= tonumber(ARGV[3]) then
+        redis.call('HSET', offers, ARGV[1], ARGV[2])
+        redis.call('ZADD', expiry, ARGV[4], ARGV[1])
+        -- the keys outlive their newest offer only so idle washers don't keep them forever
+        redis.call('EXPIRE', offers, ARGV[5])
+        redis.call('EXPIRE', expiry, ARGV[5])
+        redis.call('SADD', KEYS[1], ARGV[i])
+        table.insert(sent, ARGV[i])
+    end
+end
+if #sent > 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+end
+return sent
+"""
+
+# Drop the taken marker if ARGV[1] still holds it.
+# KEYS: taken marker; ARGV: washer_id
+_RELEASE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+# Remove a wash's offer from the given recipients; returns the washers it was removed from.
+# Every key the script touches is declared, so the caller reads the recipients first.
+# KEYS: recipients set, then the offers hash and expiry zset of each washer; ARGV: wash_id, washer ids (KEYS order)
+_RETRACT = """
+local retracted = {}
+for i = 2, #ARGV do
+    if redis.call('SREM', KEYS[1], ARGV[i]) == 1 then
+        redis.call('HDEL', KEYS[2 * i - 2], ARGV[1])
+        redis.call('ZREM', KEYS[2 * i - 1], ARGV[1])
+        table.insert(retracted, ARGV[i])
+    end
+end
+return retracted
+"""
+
+
+# Move one offer between states atomically; returns {status, offer json or current state}.
+# KEYS: offers hash, expiry zset, taken marker
+# ARGV: wash_id, now, allowed current states (space separated), next state, price or '', washer_id, ttl
+_TRANSITION = """
+local expires = redis.call('ZSCORE', KEYS[2], ARGV[1])
+local raw = redis.call('HGET', KEYS[1], ARGV[1])
+if not raw or not expires or tonumber(expires) <= tonumber(ARGV[2]) then
+    return {'missing'}
+end
+local offer = cjson.decode(raw)
+local state = offer.payload.state or 'sent'
+if not string.find(' ' .. ARGV[3] .. ' ', ' ' .. state .. ' ', 1, true) then
+    return {'conflict', state}
+end
+if ARGV[4] == 'taken' and not redis.call('SET', KEYS[3], ARGV[6], 'NX', 'EX', ARGV[7]) then
+    return {'taken'}
+end
+if ARGV[5] ~= '' then
+    offer.payload.price = tonumber(ARGV[5])
+end
+if ARGV[4] == 'accepted' then
+    offer.payload.accepted = true
+end
+offer.payload.state = ARGV[4]
+raw = cjson.encode(offer)
+redis.call('HSET', KEYS[1], ARGV[1], raw)
+return {'ok', raw}
+"""
+
+
+class OfferStore:
+    """
+    Wash offers sent to washers, each with its own expiry.
+
+    Per washer, a hash holds the offers and a sorted set their expiry times;
+    expired entries are purged lazily whenever the washer's offers are read.
+    A set per wash remembers who received it so the rest can be retracted
+    once the wash is taken.
+
+    State changes (see OfferState) run as a single Lua script each, so two
+    requests racing on the same offer can't both succeed.
+    """
+
+    async def put(self, r: redis.Redis, washer_ids: list[str], wash_id: str, data: dict, ttl: int = OFFER_TTL) -> list[str]:
+        """
+        Offer the wash to `washer_ids`; returns the ones it was actually sent to.
+
+        Create-only: a washer's live offer is never reset (so a priced or
+        accepted quote survives a re-send), and a taken wash is offered to
+        no one.
+        """
+        offer = json.dumps({**data, "payload": {**data.get("payload", {}), "state": OfferState.SENT}})
+        now = time.time()
+        keys = [key for washer_id in washer_ids for key in (offers_key(washer_id), expiry_key(washer_id))]
+        return await r.eval(
+            _PUT, len(keys) + 2, recipients_key(wash_id), taken_key(wash_id), *keys,
+            wash_id, offer, now, now + ttl, ttl, *washer_ids,
+        )
+
+    async def get(self, r: redis.Redis, washer_id: str, wash_id: str) -> dict | None:
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.hget(offers_key(washer_id), wash_id)
+            pipe.zscore(expiry_key(washer_id), wash_id)
+            offer, expires = await pipe.execute()
+
+        if offer is None or expires is None or expires <= time.time():
+            return None
+        return json.loads(offer)
+
+    async def transition(
+        self, r: redis.Redis, washer_id: str, wash_id: str, allowed: tuple[str, ...], to: str, price: float | None = None
+    ) -> tuple[str, dict | str | None]:
+        """
+        Move the offer to `to` if it is currently in one of `allowed`.
+
+        Returns ("ok", offer), ("missing", None), ("conflict", current_state)
+        or ("taken", None) when another washer already took the wash.
+        """
+        status, *rest = await r.eval(
+            _TRANSITION, 3, offers_key(washer_id), expiry_key(washer_id), taken_key(wash_id),
+            wash_id, time.time(), " ".join(allowed), to, "" if price is None else price, washer_id, OFFER_TTL,
+        )
+        if status == "ok":
+            return status, json.loads(rest[0])
+        return status, rest[0] if rest else None
+
+    async def set_price(self, r: redis.Redis, washer_id: str, wash_id: str, price: float):
+        return await self.transition(r, washer_id, wash_id, (OfferState.SENT, OfferState.PRICED), OfferState.PRICED, price)
+
+    async def accept(self, r: redis.Redis, washer_id: str, wash_id: str):
+        return await self.transition(r, washer_id, wash_id, (OfferState.PRICED,), OfferState.ACCEPTED)
+
+    async def take(self, r: redis.Redis, washer_id: str, wash_id: str):
+        return await self.transition(r, washer_id, wash_id, (OfferState.ACCEPTED,), OfferState.TAKEN)
+
+    async def page(self, r: redis.Redis, washer_id: str, skip: int = 0, limit: int = 20) -> tuple[list[dict], int]:
+        """One page of a washer's live offers, newest first, and how many there are in total."""
+        total, *offers = await r.eval(
+            _PAGE, 2, offers_key(washer_id), expiry_key(washer_id), time.time(), skip, skip + limit - 1
+        )
+        return [json.loads(offer) for offer in offers if offer is not None], total
+
+    async def remove(self, r: redis.Redis, washer_id: str, wash_id: str):
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.hdel(offers_key(washer_id), wash_id)
+            pipe.zrem(expiry_key(washer_id), wash_id)
+            pipe.srem(recipients_key(wash_id), washer_id)
+            await pipe.execute()
+
+    async def release(self, r: redis.Redis, washer_id: str, wash_id: str):
+        """Undo take() for a washer whose win the database refused."""
+        await r.eval(_RELEASE, 1, taken_key(wash_id), washer_id)
+
+    async def retract(self, r: redis.Redis, wash_id: str, keep: str | None = None) -> list[str]:
+        """Withdraw the wash from every washer it was offered to (but `keep`); returns who lost it."""
+        retracted = []
+        # SREM in the script guards against a concurrent retract; loop in case a put() slipped in between
+        while washers := [w for w in await r.smembers(recipients_key(wash_id)) if w != keep]:
+            keys = [key for washer_id in washers for key in (offers_key(washer_id), expiry_key(washer_id))]
+            retracted += await r.eval(_RETRACT, len(keys) + 1, recipients_key(wash_id), *keys, wash_id, *washers)
+        await r.delete(recipients_key(wash_id))
+        return retracted
+
+
+offer_store = OfferStore()
+
+
+def offer_or_error(result: tuple[str, dict | str | None]) -> dict:
+    """Unwrap an OfferStore transition, raising the HTTP error for anything but success."""
+    outcome, offer = result
+    if outcome == "missing":
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "offer not found")
+    if outcome == "taken":
+        raise HTTPException(status.HTTP_409_CONFLICT, "wash already taken by another washer")
+    if outcome == "conflict":
+        raise HTTPException(status.HTTP_409_CONFLICT, f"offer is already {offer}")
+    return offer
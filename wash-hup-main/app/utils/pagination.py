@@ -0,0 +1,53 @@
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, tuple_
+
+
+def encode_cursor(created, id) -> str:
+    value = created.isoformat() if isinstance(created, datetime) else created
+    raw = json.dumps([value, id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created, id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "invalid cursor")
+    return created, id
+
+
+def paginate(query, model, cursor: str | None, limit: int, newest_first: bool = True):
+    """
+    Keyset pagination on (created, id) for a select() or a db.query().
+
+    Rather than skipping rows, the query starts right after the last row of
+    the previous page, so every page costs the same as the first. id breaks
+    ties between rows created at the same moment. One extra row is fetched
+    so page() can tell whether there is another page.
+    """
+    key = tuple_(model.created, model.id)
+    if cursor:
+        created, id = decode_cursor(cursor)
+        if isinstance(model.created.type, DateTime):
+            try:
+                created = datetime.fromisoformat(created)
+            except (ValueError, TypeError):
+                raise HTTPException(status.HTTP_400_BAD_REQUEST, "invalid cursor")
+        after = tuple_(created, id)
+        query = query.where(key < after if newest_first else key > after)
+
+    order = (model.created.desc(), model.id.desc()) if newest_first else (model.created, model.id)
+    return query.order_by(*order).limit(limit + 1)
+
+
+def page(rows, limit: int) -> tuple[list, str | None]:
+    """Split what paginate() fetched into this page and the cursor for the next one (None on the last)."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(last.created, last.id)
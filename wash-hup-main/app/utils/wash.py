@@ -1,16 +1,22 @@
 from app.models.washer.profile import WasherProfile
 from app.models.admin.prices import ServicePrice
 from fastapi import HTTPException
+from sqlalchemy.orm import joinedload
 
 
-def getWasherFromList(washers: list[str], db: any):
+def getWasherFromList(washers: list[str], db: any, distances: dict[str, float] | None = None):
+    # one round trip for every washer and their user, instead of two queries per id
+    washer_models = db.query(WasherProfile).options(joinedload(WasherProfile.user)).filter(
+        WasherProfile.id.in_(washers),
+        WasherProfile.profile_verified == True
+    ).all()
+    by_id = {washer.id: washer for washer in washer_models}
+
     washers_list = []
 
+    # keep the order redis returned them in
     for washer in washers:
-        washer_model = db.query(WasherProfile).filter(
-            WasherProfile.id == washer,
-            WasherProfile.profile_verified == True
-        ).first()
+        washer_model = by_id.get(washer)
 
         if not washer_model:
             continue
@@ -21,9 +27,9 @@ def getWasherFromList(washers: list[str], db: any):
             "rating": washer_model.rating,
             "pic": washer_model.profile_image,
             "washes": washer_model.total_washes,
-            "flagged": washer_model.is_flagged
+            "flagged": washer_model.is_flagged,
+            "distance": distances.get(washer) if distances else None
         }
         washers_list.append(data)
     
     return washers_list 
-    
\ No newline at end of file
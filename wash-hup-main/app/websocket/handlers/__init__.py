@@ -4,16 +4,16 @@ from .base import BaseHandler
 # from .chat import ChatHandler
 from .issue import IssueHandler
 from .issue_admin import IssueAdminHandler
+from .location import LocationHandler
 # from .wash import WashHandler
 
 _registry: Dict[str, BaseHandler] = {
     # "chat": ChatHandler(),
     "issue": IssueHandler(),
-    "admin_issue": IssueAdminHandler()
+    "admin_issue": IssueAdminHandler(),
+    "location": LocationHandler(),
     # "wash": WashHandler(),
 }
 
 def get_handler(action: str) -> BaseHandler | None:
-    if _registry.get(action) == None:
-        return None
     return _registry.get(action)
\ No newline at end of file
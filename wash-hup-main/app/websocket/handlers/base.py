@@ -1,14 +1,15 @@
 from abc import ABC, abstractmethod
 from fastapi import WebSocket
-from app.models.auth.user import Profile
+from pydantic import BaseModel
+from app.api.dependencies import ProfileSnapshot
 from sqlalchemy.ext.asyncio import AsyncSession
 
 class BaseHandler(ABC):
     @abstractmethod
     async def handle(
         self,
-        msg: dict,
-        profile: Profile,
+        msg: BaseModel,
+        profile: ProfileSnapshot,
         ws: WebSocket,
         db: AsyncSession,
         manager
@@ -1,27 +1,29 @@
 from .base import BaseHandler
 from app.crud.issues import create_issue_message
+from app.websocket.schema import IssueMessage
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import ProfileSnapshot
 from fastapi import WebSocket
 
 class IssueHandler(BaseHandler):
-    async def handle(self, msg, profile, ws: WebSocket, db: AsyncSession, manager):
-        if profile.user_role == 'admin':
-            await ws.send_json({"action": "notification", "sender": "system", "message": "invalid permission"})
+    async def handle(self, msg: IssueMessage, profile: ProfileSnapshot, ws: WebSocket, db: AsyncSession, manager):
+        if profile.role == 'admin':
+            await manager.send_local({"action": "notification", "sender": "system", "message": "invalid permission"}, profile.id)
             return 
         
-        result = await create_issue_message(db, profile, msg["message"])
-        if result in ("issue_error", "invalid_body"):
-            await ws.send_json({"action": "notification", "sender": "system", "message": result})
+        result = await create_issue_message(db, profile, msg.message)
+        if result == "issue_error":
+            await manager.send_local({"action": "notification", "sender": "system", "message": result}, profile.id)
             return
 
         data = {
             "action": "issue",
-            "sender": profile.user.email,
-            "fullname": profile.user.fullname,
+            "sender": profile.email,
+            "fullname": profile.fullname,
             "time": str(result["data"].created),
-            "message": msg["message"],
+            "message": msg.message,
         }
-        await ws.send_json(data)
+        await manager.send_local(data, profile.id)
 
         data.update({"issue_id": result["data"].issue_id})
         await manager.publish_to_admins(data)
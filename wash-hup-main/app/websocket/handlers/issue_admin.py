@@ -1,38 +1,37 @@
 from .base import BaseHandler
 from app.crud.issues import create_issue_message_admin
+from app.websocket.schema import AdminIssueMessage
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import ProfileSnapshot
 from fastapi import WebSocket
 
 class IssueAdminHandler(BaseHandler):
-    async def handle(self, msg, profile, ws: WebSocket, db: AsyncSession, manager):
-        if profile.user_role != 'admin':
-            await ws.send_json({"action": "notification", "sender": "system", "message": "invalid permission"})
+    async def handle(self, msg: AdminIssueMessage, profile: ProfileSnapshot, ws: WebSocket, db: AsyncSession, manager):
+        if profile.role != 'admin':
+            await manager.send_local({"action": "notification", "sender": "system", "message": "invalid permission"}, profile.id)
             return 
         
         # Logic to handle admin responding to user issues via WebSocket
         result = await create_issue_message_admin(db, profile, msg)
 
         if result == "issue_error":
-            await ws.send_json({"action": "notification", "sender": "system", "message": "Issue not found"})
-            return
-        elif result == "invalid_message":
-            await ws.send_json({"action": "notification", "sender": "system", "message": "Invalid message body"})
+            await manager.send_local({"action": "notification", "sender": "system", "message": "Issue not found"}, profile.id)
             return
         elif isinstance(result, str):
-             await ws.send_json({"action": "notification", "sender": "system", "message": result})
-             return
+            await manager.send_local({"action": "notification", "sender": "system", "message": result}, profile.id)
+            return
 
         data = {
             "action": "issue",
             "issue_id": result["data"].issue_id,
-            "sender": profile.user.email,
-            "fullname": profile.user.fullname,
+            "sender": profile.email,
+            "fullname": profile.fullname,
             "time": str(result["data"].created),
-            "message": msg["message"],
+            "message": msg.message,
         }
 
         # Send confirmation to admin
-        await ws.send_json(data)
+        await manager.send_local(data, profile.id)
 
         # send to issue owner (the client or washer who reported it)
         user_message = data.copy()
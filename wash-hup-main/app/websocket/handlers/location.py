@@ -0,0 +1,15 @@
+from .base import BaseHandler
+from app.services.geo import location_stream
+from app.websocket.schema import LocationMessage
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import ProfileSnapshot
+from fastapi import WebSocket
+
+class LocationHandler(BaseHandler):
+    async def handle(self, msg: LocationMessage, profile: ProfileSnapshot, ws: WebSocket, db: AsyncSession, manager):
+        if profile.role != 'washer':
+            await manager.send_local({"action": "notification", "sender": "system", "message": "invalid permission"}, profile.id)
+            return
+
+        # no reply: washers send these every few seconds while online
+        location_stream.push(profile.id, msg.longitude, msg.latitude)
@@ -1,9 +1,15 @@
 # app/ws_manager.py
 from fastapi import WebSocket
 from typing import Dict
+from collections import Counter
 from app.services.redis import get_redis_client as get_redis
-import json
+from app.core.logger import logger
+from uuid import uuid4
+import socket
+import orjson
 import asyncio
+import time
+import os
 
 
 class Role:
@@ -21,9 +27,143 @@ class Channel:
 
 VALID_ROLES = [Role.OWNER, Role.WASHER, Role.ADMIN]
 
+ROLE_CHANNELS = {
+    Role.OWNER: [Channel.ALL, Channel.OWNERS, Channel.OWNERS_WASHERS],
+    Role.WASHER: [Channel.ALL, Channel.WASHERS, Channel.OWNERS_WASHERS],
+    Role.ADMIN: [Channel.ALL, Channel.ADMINS],
+}
+
+# seconds to wait before resubscribing after the redis connection drops
+LISTENER_RETRY_DELAY = 1
+
+# profile_id -> worker_id entries expire unless the owning worker keeps refreshing them,
+# so sockets held by a crashed worker stop attracting messages
+PRESENCE_TTL = int(os.getenv("WS_PRESENCE_TTL", "120"))
+PRESENCE_REFRESH = PRESENCE_TTL / 3
+
+# delete the presence entry only if it still points at this worker
+_RELEASE_PRESENCE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+# frames buffered per socket before it is treated as a slow consumer
+SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+# "close" disconnects a socket whose queue overflows, "drop" only discards the frame
+OVERFLOW_POLICY = os.getenv("WS_OVERFLOW_POLICY", "close")
+# close code sent to slow consumers: try again later
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+# every personal and channel event is also appended to a capped stream so a
+# reconnecting client can replay what it missed from its last event id
+STREAM_MAXLEN = int(os.getenv("WS_STREAM_MAXLEN", "200"))
+STREAM_TTL = int(os.getenv("WS_STREAM_TTL", str(24*3600)))
+REPLAY_LIMIT = int(os.getenv("WS_REPLAY_LIMIT", "200"))
+
+# the server pings every socket each interval; a socket that has answered a ping
+# before and then sends nothing for the idle timeout is treated as half-open and
+# closed. Clients that never pong are left to the protocol-level ping/pong the
+# ASGI server already runs (uvicorn's ws_ping_interval / ws_ping_timeout).
+HEARTBEAT_INTERVAL = int(os.getenv("WS_HEARTBEAT_INTERVAL", "25"))
+IDLE_TIMEOUT = int(os.getenv("WS_IDLE_TIMEOUT", "75"))
+IDLE_CLOSE_CODE = 4408
+
+
+def presence_key(profile_id: str) -> str:
+    return f"ws:presence:{profile_id}"
+
+def inbox_channel(worker_id: str) -> str:
+    return f"ws:inbox:{worker_id}"
+
+def profile_stream(profile_id: str) -> str:
+    return f"ws:events:{profile_id}"
+
+def channel_stream(channel: str) -> str:
+    return f"ws:events:channel:{channel}"
+
+def _stream_id(event_id: str) -> tuple[int, int]:
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+def encode(data: dict) -> str:
+    """Serialize a frame once; the same text is pushed to every recipient."""
+    return orjson.dumps(data).decode()
+
+def stamp(payload: str, event_id: str) -> str:
+    """Add `event_id` to an already encoded object frame without re-serializing it."""
+    # stream ids are "<ms>-<seq>", so they need no JSON escaping
+    separator = "" if payload == "{}" else ","
+    return f'{payload[:-1]}{separator}"event_id":"{event_id}"}}'
+
+
+class Connection:
+    """
+    A local socket with a bounded outbound queue drained by its own writer task,
+    so a slow peer only ever delays itself.
+    """
+    def __init__(self, profile_id: str, role: str, websocket: WebSocket, hold: bool = False):
+        self.profile_id = profile_id
+        self.role = role
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        # while a reconnecting socket replays, live frames wait here so they can't overtake it
+        self.held: list[str] | None = [] if hold else None
+        self.dropped = 0
+        self.closed = False
+        self.last_seen = time.monotonic()
+        # set once the client answers a ping; only those clients can be reaped for idling
+        self.pongs = False
+        self.writer = asyncio.create_task(self._write())
+
+    def touch(self, pong: bool = False):
+        self.last_seen = time.monotonic()
+        self.pongs = self.pongs or pong
+
+    def enqueue(self, frame: str, live: bool = True) -> bool:
+        if self.closed:
+            return False
+        if live and self.held is not None:
+            if len(self.held) >= SEND_QUEUE_SIZE:
+                self.dropped += 1
+                return False
+            self.held.append(frame)
+            return True
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    async def _write(self):
+        try:
+            while True:
+                frame = await self.queue.get()
+                await self.websocket.send_text(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # the peer is gone; the receive loop in the router does the cleanup
+            self.closed = True
+
+    def stop(self):
+        self.closed = True
+        self.writer.cancel()
+
+    async def close(self, code: int):
+        self.stop()
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
+
 class WSManager:
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
+        self.active_connections: Dict[str, Connection] = {}
 
         self.owner_connections: set[str] = set()
         self.washer_connections: set[str] = set()
@@ -31,14 +171,32 @@ class WSManager:
 
         self.channels = [Channel.ALL, Channel.OWNERS, Channel.WASHERS, Channel.ADMINS, Channel.OWNERS_WASHERS]
 
+        # personal messages for sockets held by this process are published to its inbox
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.inbox = inbox_channel(self.worker_id)
+
+        # one redis subscriber per worker process, shared by every local socket
+        self._listener: asyncio.Task | None = None
+        self._presence_refresher: asyncio.Task | None = None
+        self._heartbeat: asyncio.Task | None = None
+
+        # frames_sent / frames_dropped / slow_consumers_closed / connections_opened /
+        # connections_closed / idle_reaped / heartbeats_sent / replays_truncated
+        self.counters: Counter = Counter()
+
 
     # ---- WebSocket lifecycle ----
-    async def connect(self, profile_id: str, role: str, websocket: WebSocket):
+    async def connect(self, profile_id: str, role: str, websocket: WebSocket, resume: bool = False):
+        """Register the socket; with `resume`, live frames are held until replay() has run."""
         if role not in VALID_ROLES:
             raise ValueError(f"Invalid role: {role}")
-        
+
         await websocket.accept()
-        self.active_connections[profile_id] = websocket
+
+        if previous := self.active_connections.get(profile_id):
+            previous.stop()
+        self.active_connections[profile_id] = Connection(profile_id, role, websocket, hold=resume)
+        self.counters["connections_opened"] += 1
 
         if role == Role.OWNER:
             self.owner_connections.add(profile_id)
@@ -47,39 +205,135 @@ class WSManager:
         elif role == Role.ADMIN:
             self.admin_connections.add(profile_id)
 
+        self.start_background_tasks()
 
-    def disconnect(self, profile_id: str):
-        self.active_connections.pop(profile_id, None)
-        self.owner_connections.discard(profile_id)
-        self.washer_connections.discard(profile_id)
-        self.admin_connections.discard(profile_id)
+        r = await get_redis()
+        await r.set(presence_key(profile_id), self.worker_id, ex=PRESENCE_TTL)
+
+
+    async def disconnect(self, profile_id: str, websocket: WebSocket | None = None):
+        connection = self.active_connections.get(profile_id)
+        if connection is not None:
+            if websocket is not None and connection.websocket is not websocket:
+                # the profile already reconnected on a newer socket
+                return
+            connection.stop()
+            self._remove(profile_id)
+            self.counters["connections_closed"] += 1
+
+        try:
+            r = await get_redis()
+            await r.eval(_RELEASE_PRESENCE, 1, presence_key(profile_id), self.worker_id)
+        except Exception as exc:
+            # the entry expires on its own once it is no longer refreshed
+            logger.warning(f"Failed to release websocket presence for {profile_id}: {exc}")
 
     async def send_personal(self, data: dict, profile_id: str):
-        if websocket := self.active_connections.get(profile_id):
-            await websocket.send_json(data)
+        """
+        Append the event to the profile's stream, then deliver it to the socket
+        directly when it lives in this process, otherwise publish it to the
+        inbox of the worker holding it. Offline users pick it up on replay.
+        """
+        await self.send_personal_many(data, [profile_id])
+
+    async def send_personal_many(self, data: dict, profile_ids: list[str]):
+        """send_personal to several profiles with one pipeline for the streams and one for the inboxes."""
+        if not profile_ids:
+            return
+        payload = encode(data)
+        r = await get_redis()
+        async with r.pipeline(transaction=False) as pipe:
+            for profile_id in profile_ids:
+                pipe.xadd(profile_stream(profile_id), {"data": payload}, maxlen=STREAM_MAXLEN, approximate=True)
+                pipe.expire(profile_stream(profile_id), STREAM_TTL)
+                pipe.get(presence_key(profile_id))
+            results = await pipe.execute()
+
+        remote = []
+        for i, profile_id in enumerate(profile_ids):
+            event_id, worker_id = results[3 * i], results[3 * i + 2]
+            frame = stamp(payload, event_id)
+            if profile_id in self.active_connections:
+                self._enqueue(frame, [profile_id])
+            elif worker_id is not None and worker_id != self.worker_id:
+                # "<profile_id>\n<frame>" lets the receiving worker route without decoding the frame
+                remote.append((inbox_channel(worker_id), f"{profile_id}\n{frame}"))
+            # otherwise the user is offline (or the entry is stale for this worker)
+
+        if remote:
+            async with r.pipeline(transaction=False) as pipe:
+                for channel, message in remote:
+                    pipe.publish(channel, message)
+                await pipe.execute()
+
+    async def send_local(self, data: dict, profile_id: str):
+        self._enqueue(encode(data), [profile_id])
 
     # send group message (local only)
     async def broadcast_to_owners(self, data: dict):
-        for user_id in self.owner_connections:
-            await self.send_personal(data, user_id)
+        self._enqueue(encode(data), list(self.owner_connections))
 
     async def broadcast_to_washers(self, data: dict):
-        for user_id in self.washer_connections:
-            await self.send_personal(data, user_id)
+        self._enqueue(encode(data), list(self.washer_connections))
 
     async def broadcast_to_owners_and_washers(self, data: dict):
-        for user_id in self.owner_connections.union(self.washer_connections):
-            await self.send_personal(data, user_id)
+        self._enqueue(encode(data), list(self.owner_connections.union(self.washer_connections)))
 
     async def broadcast_to_admins(self, data: dict):
-        for user_id in self.admin_connections:
-            await self.send_personal(data, user_id)
+        self._enqueue(encode(data), list(self.admin_connections))
 
     async def broadcast_to_users(self, data: dict):
-        for user_id in self.active_connections:
-                await self.send_personal(data, user_id)
+        self._enqueue(encode(data), list(self.active_connections))
+
+    def _enqueue(self, frame: str, profile_ids: list[str], live: bool = True):
+        """
+        Queue an encoded frame for every recipient without awaiting the network;
+        `profile_ids` must be a snapshot so disconnects can't mutate it mid-loop.
+        """
+        for profile_id in profile_ids:
+            connection = self.active_connections.get(profile_id)
+            if connection is None:
+                continue
+            if connection.enqueue(frame, live):
+                self.counters["frames_sent"] += 1
+                continue
+
+            self.counters["frames_dropped"] += 1
+            if OVERFLOW_POLICY == "close" and not connection.closed:
+                self._close_slow_consumer(connection)
+
+    def _close_slow_consumer(self, connection: Connection):
+        logger.warning(f"Closing slow websocket consumer {connection.profile_id} ({connection.dropped} frames dropped)")
+        self.counters["slow_consumers_closed"] += 1
+        self.counters["connections_closed"] += 1
+        self._remove(connection.profile_id)
+        asyncio.create_task(connection.close(SLOW_CONSUMER_CLOSE_CODE))
+
+    def touch(self, profile_id: str, pong: bool = False):
+        """Record inbound activity; any frame from the client counts as liveness."""
+        if connection := self.active_connections.get(profile_id):
+            connection.touch(pong)
+
+    def stats(self) -> dict:
+        """Live connection gauges and lifetime counters for this worker."""
+        connections = list(self.active_connections.values())
+        return {
+            "worker_id": self.worker_id,
+            "connections": len(connections),
+            "owners": len(self.owner_connections),
+            "washers": len(self.washer_connections),
+            "admins": len(self.admin_connections),
+            "queued_frames": sum(c.queue.qsize() for c in connections),
+            **self.counters,
+        }
+
+    def _remove(self, profile_id: str):
+        self.active_connections.pop(profile_id, None)
+        self.owner_connections.discard(profile_id)
+        self.washer_connections.discard(profile_id)
+        self.admin_connections.discard(profile_id)
+
 
-    
     # publish to redis (Global)
     async def publish_to_owners(self, data: dict):
         await self.publish(Channel.OWNERS, data)
@@ -92,11 +346,193 @@ class WSManager:
 
     async def publish_to_all(self, data: dict):
         await self.publish(Channel.ALL, data)
-    
+
     async def publish_to_owners_and_washers(self, data: dict):
         await self.publish(Channel.OWNERS_WASHERS, data)
 
-    async def publish(self, channel: str, data: dict):
-        """Push a message to Redis → every FastAPI worker receives it."""
+    async def publish(self, channel: str, data: dict, replayable: bool = True):
+        """
+        Push a message to Redis → every FastAPI worker receives it.
+
+        Ephemeral frames (presence and the like) pass `replayable=False` so
+        they skip the capped stream and can't push real events out of replay.
+        """
         r = await get_redis()
-        await r.publish(channel, json.dumps(data))
\ No newline at end of file
+        if not replayable:
+            await r.publish(channel, encode(data))
+            return
+
+        payload = encode(data)
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.xadd(channel_stream(channel), {"data": payload}, maxlen=STREAM_MAXLEN, approximate=True)
+            pipe.expire(channel_stream(channel), STREAM_TTL)
+            event_id, _ = await pipe.execute()
+
+        await r.publish(channel, stamp(payload, event_id))
+
+    async def replay(self, profile_id: str, role: str, last_event_id: str):
+        """
+        Queue every personal and channel event newer than `last_event_id`
+        for a reconnecting socket, reading all its streams in one round trip,
+        then release the live frames held back since connect(resume=True).
+
+        When some missed events can't be replayed (more than REPLAY_LIMIT, or
+        already trimmed from a capped stream) a `replay-truncated` frame goes
+        first, telling the client to refetch its state instead.
+        """
+        streams = [profile_stream(profile_id)] + [channel_stream(c) for c in ROLE_CHANNELS[role]]
+        replayed_up_to = last_event_id
+        try:
+            r = await get_redis()
+            async with r.pipeline(transaction=False) as pipe:
+                for stream in streams:
+                    # newest first, and one past the limit to tell a full replay from a cut one
+                    pipe.xrevrange(stream, min=f"({last_event_id}", count=REPLAY_LIMIT + 1)
+                    pipe.xrange(stream, count=1)
+                    pipe.xlen(stream)
+                results = await pipe.execute()
+
+            missed = results[0::3]
+            # a full stream whose oldest entry is already past last_event_id may have dropped some
+            trimmed = any(
+                head and length >= STREAM_MAXLEN and _stream_id(head[0][0]) > _stream_id(last_event_id)
+                for head, length in zip(results[1::3], results[2::3])
+            )
+            events = sorted(
+                (entry for entries in missed for entry in entries),
+                key=lambda entry: _stream_id(entry[0]),
+            )
+            if trimmed or len(events) > REPLAY_LIMIT:
+                # the newest events are kept; everything before them has to be refetched
+                events = events[-REPLAY_LIMIT:]
+                self._enqueue(encode({"action": "replay-truncated"}), [profile_id], live=False)
+                self.counters["replays_truncated"] += 1
+            for event_id, fields in events:
+                self._enqueue(stamp(fields["data"], event_id), [profile_id], live=False)
+            if events:
+                replayed_up_to = events[-1][0]
+        finally:
+            self._release_held(profile_id, replayed_up_to)
+
+        return len(events)
+
+    def _release_held(self, profile_id: str, replayed_up_to: str):
+        """Deliver frames held during replay, skipping events the replay already covered."""
+        connection = self.active_connections.get(profile_id)
+        if connection is None or connection.held is None:
+            return
+        held, connection.held = connection.held, None
+
+        cutoff = _stream_id(replayed_up_to)
+        for frame in held:
+            event_id = orjson.loads(frame).get("event_id")
+            if event_id and _stream_id(event_id) <= cutoff:
+                continue
+            self._enqueue(frame, [profile_id])
+
+
+    # ---- Background tasks (one set per worker) ----
+    def start_background_tasks(self):
+        """Start the shared pub/sub listener and presence refresher if they are not running."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._redis_listener())
+        if self._presence_refresher is None or self._presence_refresher.done():
+            self._presence_refresher = asyncio.create_task(self._refresh_presence())
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.create_task(self._run_heartbeat())
+
+    async def stop_background_tasks(self):
+        for task in (self._listener, self._presence_refresher, self._heartbeat):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._listener = None
+        self._presence_refresher = None
+        self._heartbeat = None
+
+    async def _run_heartbeat(self):
+        """Ping every local socket and reap the ones that went quiet."""
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            self.heartbeat()
+
+    def heartbeat(self):
+        now = time.monotonic()
+        alive = []
+        for connection in list(self.active_connections.values()):
+            if not connection.pongs or now - connection.last_seen <= IDLE_TIMEOUT:
+                alive.append(connection.profile_id)
+                continue
+
+            logger.info(f"Reaping idle websocket {connection.profile_id}")
+            self.counters["idle_reaped"] += 1
+            self.counters["connections_closed"] += 1
+            self._remove(connection.profile_id)
+            asyncio.create_task(connection.close(IDLE_CLOSE_CODE))
+
+        self._enqueue(encode({"action": "ping"}), alive)
+        self.counters["heartbeats_sent"] += len(alive)
+
+    async def _refresh_presence(self):
+        """Keep the presence entries of every local socket alive in one pipeline."""
+        while True:
+            await asyncio.sleep(PRESENCE_REFRESH)
+            if not self.active_connections:
+                continue
+            try:
+                r = await get_redis()
+                async with r.pipeline(transaction=False) as pipe:
+                    for profile_id in list(self.active_connections):
+                        pipe.set(presence_key(profile_id), self.worker_id, ex=PRESENCE_TTL)
+                    await pipe.execute()
+            except Exception as exc:
+                logger.warning(f"Failed to refresh websocket presence: {exc}")
+
+    async def _redis_listener(self):
+        """
+        Subscribe once to every channel and fan each message out to the
+        local sockets of the matching role, instead of one subscription per socket.
+        """
+        while True:
+            pubsub = None
+            try:
+                r = await get_redis()
+                pubsub = r.pubsub()
+                await pubsub.subscribe(*self.channels, self.inbox)
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    # payloads are already encoded frames, forward them untouched
+                    self.dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"Redis listener disconnected, retrying: {exc}")
+                await asyncio.sleep(LISTENER_RETRY_DELAY)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    def dispatch(self, channel: str, frame: str):
+        """Deliver a pub/sub frame to the local sockets subscribed to `channel`."""
+        if channel == self.inbox:
+            profile_id, _, frame = frame.partition("\n")
+            self._enqueue(frame, [profile_id])
+        elif channel == Channel.ALL:
+            self._enqueue(frame, list(self.active_connections))
+        elif channel == Channel.OWNERS:
+            self._enqueue(frame, list(self.owner_connections))
+        elif channel == Channel.WASHERS:
+            self._enqueue(frame, list(self.washer_connections))
+        elif channel == Channel.ADMINS:
+            self._enqueue(frame, list(self.admin_connections))
+        elif channel == Channel.OWNERS_WASHERS:
+            self._enqueue(frame, list(self.owner_connections.union(self.washer_connections)))
@@ -1,14 +1,14 @@
 # app/websocket/router.py
-import asyncio
-import json
-from fastapi import APIRouter, Request, WebSocket, Depends, WebSocketDisconnect
+from fastapi import APIRouter, Request, WebSocket, Depends, WebSocketDisconnect, Query
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
-from app.websocket.manager import WSManager, Channel, Role
+from app.websocket.manager import WSManager, Channel
 from app.websocket.schema import validate
 from app.websocket.handlers import get_handler
-from app.api.dependencies import db_dependency, get_profile_model, redis_dependency
+from app.api.dependencies import profile_cache, redis_dependency, admin_dependency
+from app.database import AsyncSessionLocal
 from app.core.security import get_user_from_token
+from app.core.logger import logger
 
 router = APIRouter(prefix="/ws", tags=["websocket"])
 template = Jinja2Templates(directory="app/template")
@@ -23,8 +23,18 @@ async def websocket_test(request: Request):
 
 manager = WSManager()
 
+@router.get("/stats")
+async def websocket_stats(admin: admin_dependency):
+    """Connection gauges for the worker that served this request."""
+    return {"status": "success", "data": manager.stats()}
+
 @router.websocket("/connect/")
-async def ws_endpoint(websocket: WebSocket, token: str, db: db_dependency, r: redis_dependency):
+async def ws_endpoint(
+    websocket: WebSocket,
+    token: str,
+    r: redis_dependency,
+    last_event_id: str | None = Query(default=None, pattern=r"^[0-9]+-[0-9]+$")
+):
     # ---- Auth ----
     try:
         user = get_user_from_token(token)
@@ -32,7 +42,9 @@ async def ws_endpoint(websocket: WebSocket, token: str, db: db_dependency, r: re
         await websocket.close(code=1003, reason="invalid token")
         return
 
-    profile = get_profile_model(db, user["id"])
+    # resolved once; the socket keeps no database session between messages
+    async with AsyncSessionLocal() as db:
+        profile = await profile_cache.get(db, user["id"])
     if not profile:
         await websocket.close(code=1003, reason="invalid user")
         return
@@ -45,60 +57,49 @@ async def ws_endpoint(websocket: WebSocket, token: str, db: db_dependency, r: re
         await websocket.close(code=1013)  # Temporary unavailability
         return
     
-    await manager.connect(profile_id, profile.user_role, websocket)
-
-    channels = [Channel.ALL]
-    role = profile.user_role
-
-    if role == Role.OWNER:
-        channels.extend([Channel.OWNERS, Channel.OWNERS_WASHERS])
-    elif role == Role.WASHER:
-        channels.extend([Channel.WASHERS, Channel.OWNERS_WASHERS])
-    elif role == Role.ADMIN:
-        channels.append(Channel.ADMINS)
+    try:
+        # with a last_event_id, live frames are held until the replay below has been queued
+        await manager.connect(profile_id, profile.role, websocket, resume=bool(last_event_id))
 
-    async def redis_listener():
-        pubsub = r.pubsub()
-        await pubsub.subscribe(*channels)
-        try:
-            async for message in pubsub.listen():
-                if message.get("type") != "message":
-                    continue
-                try:
-                    data = json.loads(message["data"])
-                    await websocket.send_json(data)
-                except:
-                    break
-        except asyncio.CancelledError:
-            pass
-        finally:
-            await pubsub.unsubscribe(*channels)
-            await pubsub.close()
-    
-    # Start listening to Redis in background
-    asyncio.create_task(redis_listener())
+        # resume: replay events the client missed while it was disconnected
+        if last_event_id:
+            await manager.replay(profile_id, profile.role, last_event_id)
 
-    try:
         while True:
             raw = await websocket.receive_text()
+            manager.touch(profile_id)
             data = validate(raw)
 
             if data is None:
-                await websocket.send_json({"type": "error", "message": "No action."})
+                await manager.send_local({"type": "error", "message": "invalid message"}, profile_id)
                 continue
 
-            handler = get_handler(data["action"])
+            if data.action == "pong":
+                manager.touch(profile_id, pong=True)
+                continue
+
+            handler = get_handler(data.action)
             if not handler:
-                await websocket.send_json({"type": "error", "message": "unknown action"})
+                await manager.send_local({"type": "error", "message": "unknown action"}, profile_id)
                 continue
 
             # ---- Dispatch ----
-            await handler.handle(data, profile, websocket, db, manager)
+            async with AsyncSessionLocal() as db:
+                await handler.handle(data, profile, websocket, db, manager)
 
 
     except WebSocketDisconnect:
-        manager.disconnect(profile_id)
-        await manager.publish(Channel.ALL, {
-            "sender": "system",
-            "text": f"{profile.user.fullname} left"
-        })
\ No newline at end of file
+        pass
+    except Exception as exc:
+        logger.exception(f"websocket {profile_id} closed on error", exc_info=exc)
+    finally:
+        # always release the socket, its writer task and its presence entry
+        await manager.disconnect(profile_id, websocket)
+        try:
+            # presence is ephemeral: kept out of the replay stream
+            await manager.publish(Channel.ALL, {
+                "sender": "system",
+                "text": f"{profile.fullname} left"
+            }, replayable=False)
+        except Exception as exc:
+            logger.warning(f"failed to announce websocket disconnect: {exc}")
\ No newline at end of file
@@ -1,19 +1,17 @@
-from pydantic import BaseModel, Field
-from typing import Literal, Any
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from typing import Literal, Annotated, Union
 
-from pydantic import BaseModel, Field
-from enum import Enum
 
-class BodyMessage(BaseModel):
-    message: str = Field(
-        min_length=1, 
-        max_length=250,
-        pattern=r"^[a-zA-Z0-9\s?!.\-,]+$",
-        description="The user's name, containing only letters, numbers, and spaces.",
-        )
+# issue bodies are validated here once, handlers and crud trust the parsed model
+MessageBody = Annotated[str, Field(
+    min_length=1,
+    max_length=250,
+    pattern=r"^[a-zA-Z0-9\s?!.\-,]+$",
+    description="Message text containing only letters, numbers, spaces and basic punctuation.",
+)]
 
 class WSBase(BaseModel):
-    action: str = Field(..., description="chat | issue | wash | notify")
+    action: str = Field(..., description="chat | issue | admin_issue | wash | location | pong")
     message: str
 
 class ChatMessage(WSBase):
@@ -21,46 +19,38 @@ class ChatMessage(WSBase):
 
 class IssueMessage(WSBase):
     action: Literal["issue"]
+    message: MessageBody
 
 class AdminIssueMessage(WSBase):
     action: Literal["admin_issue"]
+    message: MessageBody
     issue_id: str
 
 class WashCommand(WSBase):
     action: Literal["wash"]
     machine_id: str
 
+class LocationMessage(BaseModel):
+    action: Literal["location"]
+    longitude: float = Field(..., ge=-180, le=180)
+    latitude: float = Field(..., ge=-85.05112878, le=85.05112878)  # redis GEO limits
 
+class PongMessage(BaseModel):
+    action: Literal["pong"]
 
-def validate(data: dict): 
-    import json
 
-    data = json.loads(data)
-    if not data.get('action'):
+InboundMessage = Annotated[
+    Union[ChatMessage, IssueMessage, AdminIssueMessage, WashCommand, LocationMessage, PongMessage],
+    Field(discriminator="action"),
+]
+
+# built once: parses the raw frame and picks the model from `action` in a single pass
+_inbound = TypeAdapter(InboundMessage)
+
+
+def validate(raw: str | bytes) -> InboundMessage | None:
+    """Parse a raw websocket frame into its typed message, or None if it is invalid."""
+    try:
+        return _inbound.validate_json(raw)
+    except ValidationError:
         return None
-    if data["action"] == 'chat':
-        valid_data = ChatMessage.model_validate(data)
-        if valid_data:
-            return valid_data.model_dump()
-        else: 
-            None
-    elif data["action"] == 'issue':
-        valid_data = IssueMessage.model_validate(data)
-        if valid_data:
-            return valid_data.model_dump()
-        else: 
-            None
-    elif data["action"] == 'admin_issue':
-        valid_data = AdminIssueMessage.model_validate(data)
-        if valid_data:
-            return valid_data.model_dump()
-        else: 
-            None
-    elif data["action"] == 'wash':
-        valid_data = WashCommand.model_validate(data)
-        if valid_data:
-            return valid_data.model_dump()
-        else: 
-            None
-    else:
-        return None
\ No newline at end of file
@@ -1,17 +1,43 @@
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.endpoints._v1 import routers
-from app.database import Base, engine
-from app.websocket.manager import WSManager
+from app.database import Base, engine, AsyncSessionLocal
+from app.api.dependencies import profile_cache
+from app.websocket.router import manager
+from app.services.geo import location_stream, seed_available_washers
+from app.services.cache import cache
+from app.services.redis import get_redis_client
+from app.core.logger import logger
+from contextlib import asynccontextmanager
 import time
 import os
 
-manager = WSManager()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        async with AsyncSessionLocal() as db:
+            seeded = await seed_available_washers(await get_redis_client(), db)
+        if seeded:
+            logger.info(f"seeded {seeded} available washers into redis")
+    except Exception as exc:
+        logger.warning(f"could not seed available washers into redis: {exc}")
+    profile_cache.start_listener()
+    cache.start_listener()
+    # the sweep has to run even on workers no washer sends positions to
+    location_stream.start_background_tasks()
+    yield
+    # the websocket manager owns this worker's redis subscriber
+    await manager.stop_background_tasks()
+    await profile_cache.stop_listener()
+    await cache.stop_listener()
+    await location_stream.stop_background_tasks()
 
 app = FastAPI(
     title='Washhup API',
     description='Car washing application',
     version='0.8.5',
+    lifespan=lifespan,
 )
 
 # Only create tables if not in a testing environment or if explicitly requested
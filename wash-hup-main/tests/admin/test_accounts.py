@@ -36,3 +36,19 @@ def test_activate_account_not_found(client, admin_token):
     )
     assert response.status_code == 404
     assert response.json()["detail"] == "Profile not found"
+
+def test_delete_user_drops_cached_profile(client, admin_token, db):
+    from app.models.auth.user import User
+    from app.api.dependencies import profile_cache, ProfileSnapshot
+
+    db.add(User(id="doomed-user", fullname="Doomed", email="doomed@example.com",
+                hashed_password="x", role="owner", phone_number="555"))
+    db.commit()
+    profile_cache.put("doomed-user", ProfileSnapshot("doomed-profile", "owner", "Doomed", "doomed@example.com"))
+
+    response = client.delete(
+        "/v1/admin/accounts/users/doomed-user",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    assert "doomed-user" not in profile_cache.entries
@@ -0,0 +1,24 @@
+import asyncio
+import fakeredis
+
+
+def test_moving_a_faq_drops_both_cached_lists(db, admin_token):
+    from app.api.endpoints.admin.site import update_faq
+    from app.models.admin.profile import AdminProfile, Category, Faqs
+    from app.schemas.request.admin import FAQUpdateSchema
+    from app.services.cache import cache
+
+    admin = db.query(AdminProfile).first()
+    db.add(Faqs(id="faq-move", admin_id=admin.id, category=Category.OWNER,
+                question="How do I pay?", answer="With the wallet."))
+    db.commit()
+    for key in ("faqsowner", "faqswasher"):
+        cache.memory[key] = (float("inf"), {"value": [], "fresh_until": float("inf")})
+
+    result = asyncio.run(update_faq(
+        "faq-move", db, fakeredis.aioredis.FakeRedis(decode_responses=True), {"id": admin.user_id},
+        FAQUpdateSchema(category=Category.WASHER),
+    ))
+    assert result["data"].category == Category.WASHER
+    assert "faqsowner" not in cache.memory
+    assert "faqswasher" not in cache.memory
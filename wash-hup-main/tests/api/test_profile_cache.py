@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+import fakeredis
+from app.api import dependencies
+from app.api.dependencies import ProfileCache, ProfileSnapshot
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+
+    async def get_profile_snapshot(db, user_id):
+        calls.append((db, user_id))
+        return ProfileSnapshot(f"p-{user_id}", "owner", "Owner", "owner@example.com")
+
+    monkeypatch.setattr(dependencies, "get_profile_snapshot", get_profile_snapshot)
+    return calls
+
+
+def test_hit_reuses_snapshot_loaded_with_the_given_session(loads):
+    cache, db = ProfileCache(), object()
+
+    async def run():
+        return await cache.get(db, "u-1"), await cache.get(db, "u-1")
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert loads == [(db, "u-1")]
+
+
+def test_expired_entry_is_reloaded(loads):
+    cache = ProfileCache(ttl=0)
+
+    async def run():
+        await cache.get(None, "u-1")
+        await cache.get(None, "u-1")
+
+    asyncio.run(run())
+    assert len(loads) == 2
+
+
+def test_invalidate_reaches_other_workers(loads, monkeypatch):
+    server = fakeredis.FakeServer()
+
+    async def get_redis_client():
+        return fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+
+    monkeypatch.setattr(dependencies, "get_redis_client", get_redis_client)
+    worker_a, worker_b = ProfileCache(), ProfileCache()
+
+    async def run():
+        await worker_a.get(None, "u-1")
+        await worker_b.get(None, "u-1")
+        worker_b.start_listener()
+        await asyncio.sleep(0.05)
+
+        await worker_a.invalidate(await get_redis_client(), "u-1")
+        await asyncio.sleep(0.05)
+        await worker_b.stop_listener()
+
+    asyncio.run(run())
+    assert "u-1" not in worker_a.entries
+    assert "u-1" not in worker_b.entries
@@ -0,0 +1,43 @@
+import os
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import SessionLocal, AsyncSessionLocal, async_database_url
+
+# Benchmarks are slow and print numbers instead of asserting on them.
+# Run them explicitly with: RUN_BENCHMARKS=1 pytest -s tests/benchmarks
+RUN_BENCHMARKS = os.getenv("RUN_BENCHMARKS") == "1"
+
+
+def pytest_collection_modifyitems(config, items):
+    if RUN_BENCHMARKS:
+        return
+    skip = pytest.mark.skip(reason="set RUN_BENCHMARKS=1 to run benchmarks")
+    for item in items:
+        if "benchmarks" in str(item.fspath):
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def report():
+    def _report(title: str, rows: dict):
+        print(f"\n== {title}")
+        for key, value in rows.items():
+            print(f"  {key:<28} {value}")
+    return _report
+
+
+@pytest.fixture
+def app_db(db_engine, monkeypatch):
+    """
+    Bind the app's own sessions to the SQLite test database.
+
+    app.database connects to POSTGRESQL_DB_URL (a local postgres when unset),
+    so benchmarks that go through real endpoints or websocket handlers point
+    SessionLocal and AsyncSessionLocal at the file the tests create instead.
+    Yields (engine, async_engine); dispose the async one on the loop that used it.
+    """
+    async_engine = create_async_engine(async_database_url(str(db_engine.url)))
+    monkeypatch.setitem(SessionLocal.kw, "bind", db_engine)
+    monkeypatch.setitem(AsyncSessionLocal.kw, "bind", async_engine)
+    return db_engine, async_engine
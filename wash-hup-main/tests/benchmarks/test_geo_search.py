@@ -0,0 +1,64 @@
+"""
+Nearby-washer query latency: redis GEOSEARCH vs the in-memory WasherGrid.
+
+Uses fakeredis unless BENCH_REDIS_URL points at a real server; fakeredis
+runs in-process, so its numbers understate a network round trip.
+"""
+import asyncio
+import os
+import random
+import statistics
+import time
+
+import fakeredis
+import redis.asyncio as redis
+
+from app.services.geo import WasherGrid, WASHER_LOCATIONS
+
+WASHERS = int(os.getenv("BENCH_GEO_WASHERS", 20000))
+QUERIES = int(os.getenv("BENCH_GEO_QUERIES", 1000))
+RADIUS_KM, LIMIT = 5, 20
+# Lagos-sized box
+LON, LAT, SPREAD = 3.38, 6.52, 0.25
+
+
+def test_geo_search_latency(report):
+    rng = random.Random(7)
+    points = [(f"w-{i}", LON + rng.uniform(-SPREAD, SPREAD), LAT + rng.uniform(-SPREAD, SPREAD)) for i in range(WASHERS)]
+    queries = [(LON + rng.uniform(-SPREAD, SPREAD), LAT + rng.uniform(-SPREAD, SPREAD)) for _ in range(QUERIES)]
+
+    grid = WasherGrid()
+    for washer, lon, lat in points:
+        grid.add(washer, lon, lat)
+
+    grid_times = []
+    for lon, lat in queries:
+        start = time.perf_counter()
+        grid.search(lon, lat, RADIUS_KM, LIMIT)
+        grid_times.append(time.perf_counter() - start)
+
+    async def run_redis():
+        url = os.getenv("BENCH_REDIS_URL")
+        r = redis.from_url(url, decode_responses=True) if url else fakeredis.aioredis.FakeRedis(decode_responses=True)
+        await r.delete(WASHER_LOCATIONS)
+        for i in range(0, len(points), 1000):
+            await r.geoadd(WASHER_LOCATIONS, [v for lon_lat in points[i:i + 1000] for v in (lon_lat[1], lon_lat[2], lon_lat[0])])
+        times = []
+        for lon, lat in queries:
+            start = time.perf_counter()
+            await r.geosearch(WASHER_LOCATIONS, longitude=lon, latitude=lat, radius=RADIUS_KM, unit="km",
+                              sort="ASC", count=LIMIT, withdist=True)
+            times.append(time.perf_counter() - start)
+        await r.delete(WASHER_LOCATIONS)
+        return times
+
+    redis_times = asyncio.run(run_redis())
+
+    def summary(times):
+        q = statistics.quantiles(times, n=100)
+        return f"p50 {q[49] * 1000:.3f} ms  p99 {q[98] * 1000:.3f} ms"
+
+    report(f"{WASHERS:,} washers, {QUERIES:,} queries, {RADIUS_KM} km / top {LIMIT}", {
+        "WasherGrid": summary(grid_times),
+        "GEOSEARCH (" + ("redis" if os.getenv("BENCH_REDIS_URL") else "fakeredis") + ")": summary(redis_times),
+    })
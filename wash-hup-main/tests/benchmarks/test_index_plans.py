@@ -0,0 +1,146 @@
+"""
+Query plans and latency of the per-user list queries before and after the
+hot foreign key indexes (alembic revision 3f9c2a7d41b6).
+
+Seeds a throwaway SQLite file with ROWS rows per table spread over OWNERS
+owners and WASHERS washers, drops the indexes, then runs each query shape
+the endpoints use before and after recreating them. SQLite's planner is far
+simpler than postgres', but a SCAN turning into a SEARCH USING INDEX is
+the same change `EXPLAIN` shows there.
+
+    RUN_BENCHMARKS=1 BENCH_PLAN_ROWS=200000 pytest -s tests/benchmarks/test_index_plans.py
+"""
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select, insert, Boolean, DateTime, Float, Integer
+
+from app.database import Base
+from app.models.auth.user import Notifications, Issue, IssueMessage
+from app.models.client.wash import Wash, Review, WashMessage
+from app.models.client.payment import Payment
+from app.models.washer.transaction import Transaction
+
+ROWS = int(os.getenv("BENCH_PLAN_ROWS", 50000))
+OWNERS = int(os.getenv("BENCH_PLAN_OWNERS", 2000))
+WASHERS = int(os.getenv("BENCH_PLAN_WASHERS", 500))
+REPEATS = int(os.getenv("BENCH_PLAN_REPEATS", 200))
+
+MODELS = [Notifications, Wash, Review, Transaction, Payment, WashMessage, Issue, IssueMessage]
+TABLES = [model.__table__ for model in MODELS]
+
+
+def filler(column):
+    # any value of the right type for the NOT NULL columns a query doesn't care about
+    kind = column.type
+    if isinstance(kind, Boolean):
+        return False
+    if isinstance(kind, (Float, Integer)):
+        return 0
+    if isinstance(kind, DateTime):
+        return datetime(2025, 1, 1)
+    if getattr(kind, "enum_class", None):
+        return list(kind.enum_class)[0].value
+    return "x"
+
+
+def rows(model, count: int, make):
+    table = model.__table__
+    defaults = {c.name: filler(c) for c in table.columns}
+    return [{**defaults, "id": f"{table.name}-{i}", **make(i)} for i in range(count)]
+
+
+def seed(conn, rng: random.Random):
+    start = datetime(2025, 1, 1)
+    owner = lambda: f"owner-{rng.randrange(OWNERS)}"
+    washer = lambda: f"washer-{rng.randrange(WASHERS)}"
+    created = lambda: start + timedelta(minutes=rng.randrange(500000))
+    washes = ROWS // 10  # messages and reviews hang off these
+
+    data = {
+        Notifications: rows(Notifications, ROWS, lambda i: {"profile_id": owner(), "is_read": rng.random() < 0.8, "created": created()}),
+        Wash: rows(Wash, ROWS, lambda i: {"client_id": owner(), "washer_id": washer(), "completed": rng.random() < 0.9,
+                                          "started": rng.random() < 0.95, "accepted": True, "created": created()}),
+        Review: rows(Review, ROWS, lambda i: {"washer_id": washer(), "client_id": owner(), "wash_id": f"washes-{rng.randrange(washes)}", "created": created()}),
+        Transaction: rows(Transaction, ROWS, lambda i: {"washer_id": washer(), "wash_id": f"washes-{i}", "created": created()}),
+        Payment: rows(Payment, ROWS, lambda i: {"id": i, "sender_id": owner(), "receiver_id": washer(), "reference": f"ref-{i}", "created": created()}),
+        WashMessage: rows(WashMessage, ROWS, lambda i: {"wash_id": f"washes-{rng.randrange(washes)}", "created": created()}),
+        Issue: rows(Issue, OWNERS, lambda i: {"profile_id": f"owner-{i}"}),
+        IssueMessage: rows(IssueMessage, ROWS, lambda i: {"issue_id": f"issues-{rng.randrange(OWNERS)}", "created": created()}),
+    }
+    for model, values in data.items():
+        for i in range(0, len(values), 5000):
+            conn.execute(insert(model.__table__), values[i:i + 5000])
+
+
+def queries(rng: random.Random):
+    """The shapes the list endpoints run, with a fresh id each call."""
+    owner = lambda: f"owner-{rng.randrange(OWNERS)}"
+    washer = lambda: f"washer-{rng.randrange(WASHERS)}"
+    wash = lambda: f"washes-{rng.randrange(ROWS // 10)}"
+    return {
+        "unread notifications": lambda: select(Notifications).where(
+            Notifications.profile_id == owner(), Notifications.is_read == False).order_by(Notifications.created.desc()).limit(10),
+        "washer completed washes": lambda: select(Wash).where(
+            Wash.washer_id == washer(), Wash.completed == True).order_by(Wash.created.desc()).limit(10),
+        "client ongoing washes": lambda: select(Wash).where(
+            Wash.client_id == owner(), Wash.started == True, Wash.completed == False),
+        "washer reviews": lambda: select(Review).where(Review.washer_id == washer()).order_by(Review.created.desc()).limit(10),
+        "wash reviews": lambda: select(Review).where(Review.wash_id == wash()).limit(1),
+        "washer transactions": lambda: select(Transaction).where(
+            Transaction.washer_id == washer()).order_by(Transaction.created.desc()).limit(10),
+        "owner payments": lambda: select(Payment).where(Payment.sender_id == owner()).order_by(Payment.created.desc()).limit(10),
+        "wash chat": lambda: select(WashMessage).where(WashMessage.wash_id == wash()).order_by(WashMessage.created).limit(20),
+        "issue by owner": lambda: select(Issue).where(Issue.profile_id == owner()).limit(1),
+        "issue messages": lambda: select(IssueMessage).where(
+            IssueMessage.issue_id == f"issues-{rng.randrange(OWNERS)}").order_by(IssueMessage.created).limit(20),
+    }
+
+
+def measure(conn, make) -> tuple[str, float]:
+    statement = str(make().compile(conn, compile_kwargs={"literal_binds": True}))
+    plan = "; ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}"))
+    times = []
+    for _ in range(REPEATS):
+        sql = str(make().compile(conn, compile_kwargs={"literal_binds": True}))
+        start = time.perf_counter()
+        conn.exec_driver_sql(sql).fetchall()
+        times.append(time.perf_counter() - start)
+    return plan, statistics.median(times)
+
+
+def test_index_plans(tmp_path, report):
+    rng = random.Random(11)
+    engine = create_engine(f"sqlite:///{tmp_path}/plans.db")
+    # the primary key indexes stay; everything else is what the migration adds
+    added = [index for table in TABLES for index in table.indexes if index.name != f"ix_{table.name}_id"]
+
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn, tables=TABLES)
+        for index in added:
+            index.drop(conn)
+        seed(conn, rng)
+        conn.exec_driver_sql("ANALYZE")
+
+    with engine.connect() as conn:
+        before = {name: measure(conn, make) for name, make in queries(rng).items()}
+
+    with engine.begin() as conn:
+        for index in added:
+            index.create(conn)
+        conn.exec_driver_sql("ANALYZE")
+
+    with engine.connect() as conn:
+        after = {name: measure(conn, make) for name, make in queries(rng).items()}
+    engine.dispose()
+
+    for name in before:
+        (plan_before, time_before), (plan_after, time_after) = before[name], after[name]
+        report(name, {
+            "before": plan_before,
+            "after": plan_after,
+            "median (ms)": f"{time_before * 1000:.3f} -> {time_after * 1000:.3f} ({time_before / time_after:.1f}x)",
+        })
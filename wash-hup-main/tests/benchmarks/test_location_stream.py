@@ -0,0 +1,59 @@
+"""
+Live washer location updates per worker: frame validation, LocationHandler,
+and the batched flush to redis (fakeredis) that follows.
+"""
+import asyncio
+import json
+import os
+import random
+import time
+
+import fakeredis
+
+from app.api.dependencies import ProfileSnapshot
+from app.services import geo
+from app.services.geo import LocationStream, WasherGrid, WASHER_AVAILABLE
+from app.websocket.handlers.location import LocationHandler
+from app.websocket.schema import validate
+
+WASHERS = int(os.getenv("BENCH_LOCATION_WASHERS", 5000))
+UPDATES = int(os.getenv("BENCH_LOCATION_UPDATES", 10))  # per washer, between two flushes
+
+
+def test_location_update_throughput(monkeypatch, report):
+    r = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    async def get_redis():
+        return r
+
+    stream = LocationStream()
+    monkeypatch.setattr(geo, "get_redis", get_redis)
+    monkeypatch.setattr(geo, "washer_grid", WasherGrid())
+    monkeypatch.setattr("app.websocket.handlers.location.location_stream", stream)
+    monkeypatch.setattr(stream, "start_background_tasks", lambda: None)
+
+    rng = random.Random(3)
+    washers = [ProfileSnapshot(f"w-{i}", "washer", f"Washer {i}", f"w{i}@example.com") for i in range(WASHERS)]
+    frames = [
+        json.dumps({"action": "location", "longitude": 3.38 + rng.uniform(-0.2, 0.2), "latitude": 6.52 + rng.uniform(-0.2, 0.2)})
+        for _ in range(1000)
+    ]
+    handler = LocationHandler()
+
+    async def run():
+        await r.sadd(WASHER_AVAILABLE, *(w.id for w in washers))
+        start = time.perf_counter()
+        for n in range(UPDATES):
+            for i, washer in enumerate(washers):
+                await handler.handle(validate(frames[(i + n) % len(frames)]), washer, None, None, None)
+        handled = time.perf_counter() - start
+
+        start = time.perf_counter()
+        flushed = await stream.flush()
+        return handled, time.perf_counter() - start, flushed
+
+    handled, flush, flushed = asyncio.run(run())
+    report(f"{WASHERS:,} washers x {UPDATES} updates", {
+        "updates/sec (validate+handle)": f"{WASHERS * UPDATES / handled:,.0f}",
+        "flush": f"{flushed:,} positions in {flush * 1000:.1f} ms",
+    })
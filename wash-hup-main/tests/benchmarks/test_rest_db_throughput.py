@@ -0,0 +1,127 @@
+"""
+REST throughput per worker: the blocking Session path vs AsyncSession.
+
+Both routes list a user's unread notifications. /blocking/notification is
+the previous implementation (get_profile_model + db.query on the event
+loop). /v1/user/notification is the current one (cached profile +
+AsyncSession). CLIENTS concurrent clients send REQUESTS requests each over
+ASGI while a ticker measures how long the event loop was stalled.
+
+CLIENTS defaults to the sync pool's capacity (5 + 10 overflow). Past that the
+blocking route waits for a pooled connection on the event loop itself, so the
+sessions that would hand one back never get to close and every request sits
+out the 30s pool timeout.
+
+Both routes read the SQLite test database through the app_db fixture, so
+no postgres is needed.
+
+    RUN_BENCHMARKS=1 BENCH_REST_CLIENTS=15 pytest -s tests/benchmarks/test_rest_db_throughput.py
+"""
+import asyncio
+import os
+import statistics
+import time
+from datetime import timedelta
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import insert, delete
+
+from app.api.dependencies import db_dependency, user_dependency, get_profile_model, profile_cache
+from app.api.endpoints.user import user
+from app.core.security import create_access_token
+from app.models.auth.user import User, Profile, Notifications
+
+CLIENTS = int(os.getenv("BENCH_REST_CLIENTS", 15))
+REQUESTS = int(os.getenv("BENCH_REST_REQUESTS", 20))
+NOTIFICATIONS = 10
+
+bench = FastAPI()
+bench.include_router(user.router, prefix="/v1")
+
+
+@bench.get("/blocking/notification")
+async def blocking_notifications(db: db_dependency, user: user_dependency, skip: int = 0, limit: int = 10):
+    profile_model = get_profile_model(db, user.get('id'))
+    notifications = db.query(Notifications).filter(Notifications.profile_id == profile_model.id, Notifications.is_read == False).order_by(Notifications.created.desc()).offset(skip).limit(limit).all()
+    return {"message": "Notification retrieved successfully", "status": "ok", "data": notifications}
+
+
+def seed(engine):
+    users, profiles, notifications, tokens = [], [], [], []
+    for i in range(CLIENTS):
+        user_id, profile_id = f"rest-user-{i}", f"rest-profile-{i}"
+        users.append({"id": user_id, "email": f"rest{i}@example.com", "fullname": f"Rest {i}",
+                      "hashed_password": "x", "role": "owner", "phone_number": f"rest-{i}"})
+        profiles.append({"id": profile_id, "user_id": user_id, "user_role": "owner"})
+        notifications += [{"id": f"rest-n-{i}-{n}", "profile_id": profile_id, "title": "t", "message": "m"}
+                          for n in range(NOTIFICATIONS)]
+        tokens.append(create_access_token(f"rest{i}@example.com", user_id, "owner", timedelta(hours=1)))
+
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), users)
+        conn.execute(insert(Profile.__table__), profiles)
+        conn.execute(insert(Notifications.__table__), notifications)
+    return tokens
+
+
+def cleanup(engine):
+    with engine.begin() as conn:
+        conn.execute(delete(Notifications.__table__).where(Notifications.id.like("rest-n-%")))
+        conn.execute(delete(Profile.__table__).where(Profile.id.like("rest-profile-%")))
+        conn.execute(delete(User.__table__).where(User.id.like("rest-user-%")))
+    profile_cache.entries.clear()
+
+
+async def ticker(lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def drive(path: str, tokens: list[str]):
+    lags, latencies, stop = [], [], asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+
+    async def client(http, token):
+        headers = {"Authorization": f"Bearer {token}"}
+        for _ in range(REQUESTS):
+            sent = time.perf_counter()
+            response = await http.get(path, headers=headers)
+            latencies.append(time.perf_counter() - sent)
+            assert response.status_code == 200, response.text
+
+    transport = httpx.ASGITransport(app=bench)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(http, token) for token in tokens))
+        elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests/sec": f"{len(latencies) / elapsed:,.0f}",
+        "latency p50/p99 (ms)": f"{quantiles[49] * 1000:.1f} / {quantiles[98] * 1000:.1f}",
+        "max loop stall (ms)": f"{max(lags, default=0) * 1000:.1f}",
+    }
+
+
+def test_rest_notification_throughput(app_db, report):
+    engine, async_engine = app_db
+    tokens = seed(engine)
+
+    async def run():
+        before = await drive("/blocking/notification", tokens)
+        after = await drive("/v1/user/notification", tokens)
+        await async_engine.dispose()
+        return before, after
+
+    try:
+        before, after = asyncio.run(run())
+    finally:
+        cleanup(engine)
+
+    report(f"blocking Session ({CLIENTS} clients x {REQUESTS} requests)", before)
+    report(f"AsyncSession ({CLIENTS} clients x {REQUESTS} requests)", after)
@@ -0,0 +1,93 @@
+"""
+WS issue-message throughput per worker: blocking Session vs AsyncSession.
+
+Each simulated socket pushes MESSAGES issue messages through the handler's
+crud path while a ticker measures how long the event loop was stalled.
+"""
+import asyncio
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.database import Base
+from app.crud.issues import create_issue_message
+from app.models.auth.user import Issue, IssueMessage
+
+SOCKETS = int(os.getenv("BENCH_SOCKETS", 50))
+MESSAGES = int(os.getenv("BENCH_MESSAGES", 20))
+
+
+async def create_issue_message_blocking(db, profile, message):
+    # the previous implementation: sync Session calls straight on the event loop
+    issue_model = db.query(Issue).filter(Issue.profile_id == profile.id).first()
+    message_model = IssueMessage(id="i-"+str(uuid4()), issue_id=issue_model.id, profile_id=profile.id, body=message)
+    db.add(message_model)
+    db.commit()
+    db.refresh(message_model)
+
+
+async def ticker(lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def drive(open_session, send):
+    lags, stop = [], asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+
+    async def socket(profile):
+        for _ in range(MESSAGES):
+            async with open_session() as db:
+                await send(db, profile, "car still dirty")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(socket(p) for p in PROFILES))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    return {
+        "messages/sec": f"{SOCKETS * MESSAGES / elapsed:,.0f}",
+        "max loop stall (ms)": f"{max(lags, default=0) * 1000:.1f}",
+    }
+
+
+PROFILES = [SimpleNamespace(id=f"bench-{i}") for i in range(SOCKETS)]
+
+
+def test_ws_issue_throughput(report):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[Issue.__table__, IssueMessage.__table__])
+    SyncSession = sessionmaker(bind=engine)
+    with SyncSession() as db:
+        db.add_all(Issue(id=f"is-{p.id}", profile_id=p.id) for p in PROFILES)
+        db.commit()
+
+    class blocking_session:
+        async def __aenter__(self):
+            self.db = SyncSession()
+            return self.db
+
+        async def __aexit__(self, *exc):
+            self.db.close()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def run():
+        before = await drive(blocking_session, create_issue_message_blocking)
+        after = await drive(AsyncSession, create_issue_message)
+        await async_engine.dispose()
+        return before, after
+
+    before, after = asyncio.run(run())
+    report(f"blocking Session ({SOCKETS} sockets x {MESSAGES} msgs)", before)
+    report(f"AsyncSession ({SOCKETS} sockets x {MESSAGES} msgs)", after)
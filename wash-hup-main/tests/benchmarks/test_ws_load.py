@@ -0,0 +1,230 @@
+"""
+WebSocket load test for a single worker.
+
+Boots main.app under uvicorn in a background thread. Redis is replaced by
+fakeredis and the app's sessions are bound to the SQLite test file (see
+the app_db fixture), so no postgres or redis is needed. Thousands of
+owner/washer/admin clients then connect to /v1/ws/connect/ and drive
+traffic:
+
+  * owners send `issue` messages, which are published to every admin
+  * admins answer each owner with `admin_issue`, delivered personally
+  * the server broadcasts on the `all` channel
+
+Every payload carries its send time (perf_counter_ns, shared by the client
+and the server in this process), so receivers can record delivery latency.
+
+    RUN_BENCHMARKS=1 BENCH_WS_CONNECTIONS=2000 pytest -s tests/benchmarks/test_ws_load.py
+"""
+import asyncio
+import json
+import os
+import socket
+import statistics
+import threading
+import time
+import tracemalloc
+from datetime import timedelta
+
+import fakeredis
+import uvicorn
+from sqlalchemy import insert
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+from main import app
+from app.api import dependencies
+from app.api.dependencies import get_redis_client
+from app.core.security import create_access_token
+from app.models.auth.user import User, Profile, Issue
+from app.websocket import manager as ws_manager
+from app.websocket.manager import Channel
+from app.websocket.router import manager
+
+CONNECTIONS = int(os.getenv("BENCH_WS_CONNECTIONS", 1000))
+ROUNDS = int(os.getenv("BENCH_WS_ROUNDS", 3))
+BROADCASTS = int(os.getenv("BENCH_WS_BROADCASTS", 5))
+CONNECT_BATCH = 200
+SETTLE_TIMEOUT = 60
+
+
+class Server:
+    """uvicorn on a free localhost port, running its own loop in a thread."""
+
+    def __init__(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.server = uvicorn.Server(uvicorn.Config(
+            app, host="127.0.0.1", port=self.port, log_level="warning",
+            ws="websockets", loop="asyncio", backlog=4096,
+        ))
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_until_complete, args=(self.server.serve(),), daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+def seed_users(engine):
+    admins = max(1, CONNECTIONS // 50)
+    washers = (CONNECTIONS - admins) * 2 // 5
+    roles = ["admin"] * admins + ["washer"] * washers + ["owner"] * (CONNECTIONS - admins - washers)
+
+    users, profiles, issues, clients = [], [], [], []
+    for i, role in enumerate(roles):
+        user_id, profile_id = f"bench-user-{i}", f"bench-profile-{i}"
+        users.append({"id": user_id, "email": f"bench{i}@example.com", "fullname": f"Bench {i}",
+                      "hashed_password": "x", "role": role, "phone_number": f"bench-{i}"})
+        profiles.append({"id": profile_id, "user_id": user_id, "user_role": role})
+        if role == "owner":
+            issues.append({"id": f"is-{profile_id}", "profile_id": profile_id})
+        token = create_access_token(f"bench{i}@example.com", user_id, role, timedelta(hours=1))
+        clients.append(Client(role, profile_id, token))
+
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), users)
+        conn.execute(insert(Profile.__table__), profiles)
+        conn.execute(insert(Issue.__table__), issues)
+    return clients
+
+
+class Client:
+    def __init__(self, role, profile_id, token):
+        self.role = role
+        self.profile_id = profile_id
+        self.token = token
+        self.ws = None
+        self.reader = None
+        self.frames = 0
+        self.dropped = False
+        self.errors = 0
+
+    async def open(self, port):
+        # the server answers slowly under load; only its own heartbeat should decide liveness
+        self.ws = await connect(
+            f"ws://127.0.0.1:{port}/v1/ws/connect/?token={self.token}", max_queue=None, ping_interval=None
+        )
+        self.reader = asyncio.create_task(self.read())
+
+    async def read(self):
+        try:
+            async for raw in self.ws:
+                self.receive(raw)
+        except ConnectionClosed:
+            self.dropped = True
+
+    def receive(self, raw):
+        received = time.perf_counter_ns()
+        frame = json.loads(raw)
+        if frame.get("action") == "ping":
+            asyncio.create_task(self.send({"action": "pong"}))
+            return
+        if frame.get("sender") == "system":
+            # "<name> left" announcements are not part of the load; anything else is a handler error
+            self.errors += "text" not in frame
+            return
+        self.frames += 1
+        if "sent" in frame:
+            LATENCIES["broadcast"].append(received - frame["sent"])
+            return
+        kind, _, sent = frame.get("message", "").partition(" ")
+        if kind == "o" and self.role == "admin":
+            LATENCIES["issue -> admins"].append(received - int(sent))
+        elif kind == "a" and self.role == "owner":
+            LATENCIES["admin_issue -> owner"].append(received - int(sent))
+
+    async def send(self, payload):
+        await self.ws.send(json.dumps(payload))
+
+
+LATENCIES = {"issue -> admins": [], "admin_issue -> owner": [], "broadcast": []}
+
+
+def percentile(samples, q):
+    return statistics.quantiles(samples, n=100)[q - 1] / 1e6 if len(samples) > 1 else float("nan")
+
+
+def test_ws_load(app_db, monkeypatch, report):
+    engine, _ = app_db
+    server_redis = fakeredis.FakeServer()
+
+    async def get_redis():
+        return fakeredis.aioredis.FakeRedis(server=server_redis, decode_responses=True)
+
+    monkeypatch.setattr(ws_manager, "get_redis", get_redis)
+    monkeypatch.setattr(dependencies, "get_redis_client", get_redis)  # the profile cache listener
+    app.dependency_overrides[get_redis_client] = get_redis
+    clients = seed_users(engine)
+    owners = [c for c in clients if c.role == "owner"]
+    admins = [c for c in clients if c.role == "admin"]
+
+    # one owner frame fans out to every admin plus its echo; a reply is an echo plus the personal
+    # frame; a broadcast reaches everyone
+    expected = ROUNDS * len(owners) * (len(admins) + 1 + 2) + BROADCASTS * len(clients)
+
+    async def run(srv):
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+        for i in range(0, len(clients), CONNECT_BATCH):
+            await asyncio.gather(*(c.open(srv.port) for c in clients[i:i + CONNECT_BATCH]))
+        while len(manager.active_connections) < len(clients):
+            await asyncio.sleep(0.05)
+        per_connection = (tracemalloc.get_traced_memory()[0] - baseline) / len(clients)
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            await asyncio.gather(*(
+                o.send({"action": "issue", "message": f"o {time.perf_counter_ns()}"}) for o in owners
+            ))
+            await asyncio.gather(*(
+                admins[i % len(admins)].send({
+                    "action": "admin_issue", "issue_id": f"is-{o.profile_id}",
+                    "message": f"a {time.perf_counter_ns()}",
+                }) for i, o in enumerate(owners)
+            ))
+        for _ in range(BROADCASTS):
+            asyncio.run_coroutine_threadsafe(
+                manager.publish(Channel.ALL, {"action": "broadcast", "sent": time.perf_counter_ns()}), srv.loop
+            )
+
+        deadline = time.perf_counter() + SETTLE_TIMEOUT
+        while sum(c.frames for c in clients) < expected and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        elapsed = time.perf_counter() - start
+        received = sum(c.frames for c in clients)
+
+        stats = manager.stats()
+        dropped = sum(c.dropped for c in clients)
+        errors = sum(c.errors for c in clients)
+        for c in clients:
+            await c.ws.close()
+        return per_connection, elapsed, received, dropped, errors, stats
+
+    try:
+        with Server() as srv:
+            per_connection, elapsed, received, dropped, errors, stats = asyncio.run(run(srv))
+    finally:
+        del app.dependency_overrides[get_redis_client]
+
+    report(f"{len(clients)} sockets ({len(owners)} owners, {len(admins)} admins), {ROUNDS} rounds, {BROADCASTS} broadcasts", {
+        "frames received": f"{received:,} / {expected:,}",
+        "frames/sec": f"{received / elapsed:,.0f}",
+        "memory/connection (KiB)": f"{per_connection / 1024:.1f}  (client + server side)",
+        "server frames dropped": stats.get("frames_dropped", 0),
+        "sockets closed by server": dropped,
+        "handler errors": errors,
+    })
+    report("delivery latency (ms)", {
+        f"{kind} p50/p99": f"{percentile(samples, 50):.1f} / {percentile(samples, 99):.1f}  (n={len(samples)})"
+        for kind, samples in LATENCIES.items()
+    })
@@ -24,7 +24,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.database import Base
 from main import app
-from app.api.dependencies import get_db
+from app.api.dependencies import get_db, get_redis_client
+import fakeredis
 
 # Use an in-memory SQLite database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -64,9 +65,16 @@ def client(db):
         finally:
             pass
 
+    redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    async def override_get_redis():
+        return redis_client
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_redis_client] = override_get_redis
     yield TestClient(app)
     del app.dependency_overrides[get_db]
+    del app.dependency_overrides[get_redis_client]
 
 @pytest.fixture
 def admin_token(client, db):
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+
+from app.core.pool import PoolMetrics, TimedQueuePool
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=TimedQueuePool,
+                           pool_size=1, max_overflow=1, pool_timeout=0.05)
+    yield engine
+    engine.dispose()
+
+
+def test_checkouts_waits_and_timeouts_are_counted(engine):
+    metrics = PoolMetrics("test").attach(engine)
+
+    first, second = engine.connect(), engine.connect()
+    first.execute(text("select 1"))
+    stats = metrics.stats()
+    assert stats["checked_out"] == 2
+    assert stats["overflow"] == 1
+    assert stats["checkout_wait_ms"]["samples"] == 2
+
+    with pytest.raises(PoolTimeout):
+        engine.connect()
+
+    first.close()
+    second.close()
+    stats = metrics.stats()
+    assert stats["timeouts"] == 1
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == stats["checkins"] == 2
+
+
+def test_metrics_follow_the_pool_across_dispose(engine):
+    metrics = PoolMetrics("test").attach(engine)
+    engine.connect().close()
+    engine.dispose()
+
+    engine.connect().close()
+    assert metrics.pool is engine.pool
+    assert metrics.stats()["checkouts"] == 2
+    assert metrics.stats()["checkout_wait_ms"]["samples"] == 2
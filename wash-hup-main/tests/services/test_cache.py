@@ -0,0 +1,82 @@
+import asyncio
+import json
+import fakeredis
+from app.services import cache as cache_module
+from app.services.cache import SWRCache, cache_key
+
+
+def run(test):
+    return asyncio.run(test(fakeredis.aioredis.FakeRedis(decode_responses=True), SWRCache()))
+
+
+def test_cold_miss_loads_once_for_concurrent_requests():
+    async def test(r, cache):
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return ["bank"]
+
+        # a second worker with its own memory tier shares the same redis
+        results = await asyncio.gather(*(
+            (cache if i % 2 else SWRCache()).get(r, "banks", loader, fresh_for=60, stale_for=60) for i in range(20)
+        ))
+        assert results == [["bank"]] * 20
+        assert calls == 1
+
+    run(test)
+
+
+def test_stale_value_is_served_while_one_refresh_runs():
+    async def test(r, cache):
+        await r.set(cache_key("banks"), json.dumps({"value": ["old"], "fresh_until": 0}), ex=60)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return ["new"]
+
+        results = await asyncio.gather(*(cache.get(r, "banks", loader, fresh_for=60, stale_for=60) for _ in range(10)))
+        assert results == [["old"]] * 10
+
+        await asyncio.sleep(0.1)
+        assert calls == 1
+        assert await cache.get(r, "banks", loader, fresh_for=60, stale_for=60) == ["new"]
+
+        await cache.invalidate(r, "banks")
+        assert await r.get(cache_key("banks")) is None
+
+    run(test)
+
+
+def test_invalidate_reaches_other_workers(monkeypatch):
+    server = fakeredis.FakeServer()
+
+    async def get_redis_client():
+        return fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+
+    monkeypatch.setattr(cache_module, "get_redis_client", get_redis_client)
+    worker_a, worker_b = SWRCache(), SWRCache()
+
+    async def run():
+        r = await get_redis_client()
+
+        async def loader():
+            return ["bank"]
+
+        await worker_a.get(r, "banks", loader, fresh_for=60, stale_for=60)
+        await worker_b.get(r, "banks", loader, fresh_for=60, stale_for=60)
+        worker_b.start_listener()
+        await asyncio.sleep(0.05)
+
+        await worker_a.invalidate(r, "banks")
+        await asyncio.sleep(0.05)
+        await worker_b.stop_listener()
+
+    asyncio.run(run())
+    assert "banks" not in worker_a.memory
+    assert "banks" not in worker_b.memory
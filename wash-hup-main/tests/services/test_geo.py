@@ -0,0 +1,163 @@
+import time
+import asyncio
+import fakeredis
+import redis.asyncio as redis
+from app.services.geo import nearby_washers, WasherGrid, WASHER_LOCATIONS
+from app.services import geo
+
+# roughly 1, 3 and 12 km east of the origin
+WASHERS = {"near": 0.009, "mid": 0.027, "far": 0.108}
+
+
+def search(**kwargs):
+    async def run():
+        r = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        for washer, lon in WASHERS.items():
+            await r.geoadd(WASHER_LOCATIONS, (lon, 0.0, washer))
+        return await nearby_washers(r, None, 0.0, 0.0, **kwargs)
+    return asyncio.run(run())
+
+
+def test_nearby_washers_closest_first_with_distance():
+    found = search(radius=5, limit=10)
+    assert [w for w, _ in found] == ["near", "mid"]
+    assert 0.9 < found[0][1] < 1.1
+
+
+def test_nearby_washers_limit_and_adaptive_radius():
+    assert [w for w, _ in search(radius=5, limit=1)] == ["near"]
+    assert [w for w, _ in search(radius=5, limit=3, adaptive=True)] == ["near", "mid", "far"]
+
+
+def test_grid_matches_redis_and_tracks_availability():
+    grid = WasherGrid()
+    for washer, lon in WASHERS.items():
+        grid.add(washer, lon, 0.0)
+
+    found = grid.search(0.0, 0.0, 5, 10)
+    expected = search(radius=5, limit=10)
+    assert [w for w, _ in found] == [w for w, _ in expected]
+    assert all(abs(a - b) < 0.01 for (_, a), (_, b) in zip(found, expected))
+
+    grid.remove("near")
+    grid.add("mid", 0.2, 0.0)
+    assert grid.search(0.0, 0.0, 5, 10) == []
+
+
+def test_nearby_washers_falls_back_to_grid_when_redis_is_down(monkeypatch):
+    class DownRedis:
+        calls = 0
+
+        async def geosearch(self, *args, **kwargs):
+            self.calls += 1
+            raise redis.ConnectionError("connection refused")
+
+    class Session:
+        async def run_sync(self, fn, *args):
+            return fn(None, *args)
+
+    grid = WasherGrid()
+    grid.add("near", 0.009, 0.0)
+    monkeypatch.setattr(geo, "washer_grid", grid)
+    monkeypatch.setattr(grid, "ensure_loaded", lambda db: None)
+
+    down = DownRedis()
+    found = asyncio.run(nearby_washers(down, Session(), 0.0, 0.0, radius=5, limit=5, adaptive=True))
+    assert [w for w, _ in found] == ["near"]
+    # the radius doubled three times, but redis was only tried once
+    assert down.calls == 1
+
+
+def test_grid_load_skips_available_washers_gone_silent_but_keeps_new_ones():
+    class Result:
+        def all(self):
+            return [("fresh", 0.009, 0.0), ("silent", 0.018, 0.0), ("unknown", 0.027, 0.0)]
+
+    class Session:
+        def execute(self, statement):
+            return Result()
+
+    grid = WasherGrid()
+    grid.add("fresh", 0.01, 0.0)
+    grid.add("silent", 0.018, 0.0, seen=time.time() - geo.LOCATION_TTL - 1)
+    grid.load(Session())
+
+    found = grid.search(0.0, 0.0, 5, 10)
+    # a fresh worker has heard of nobody, and still finds every available washer
+    assert [w for w, _ in found] == ["fresh", "unknown"]
+    # the live position is kept over the address
+    assert grid.cells[grid.washers["fresh"]]["fresh"] == (0.01, 0.0)
+
+
+def test_location_stream_flushes_available_washers_and_sweeps_stale(monkeypatch):
+    from app.services.geo import LocationStream, WASHER_AVAILABLE, WASHER_LAST_SEEN
+
+    r = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    async def get_redis():
+        return r
+
+    monkeypatch.setattr(geo, "get_redis", get_redis)
+    monkeypatch.setattr(geo, "washer_grid", WasherGrid())
+
+    async def run():
+        await r.sadd(WASHER_AVAILABLE, "on")
+        stream = LocationStream()
+        stream.pending = {"on": (0.01, 0.0, 1000.0), "off": (0.02, 0.0, 1000.0)}
+        flushed = await stream.flush()
+        members = await r.zrange(WASHER_LOCATIONS, 0, -1)
+        stale = await stream.sweep()
+        return flushed, members, stale, await r.zcard(WASHER_LOCATIONS), await r.zcard(WASHER_LAST_SEEN)
+
+    flushed, members, stale, left, seen = asyncio.run(run())
+    assert (flushed, members) == (1, ["on"])
+    assert stale == ["on"] and left == seen == 0
+    assert geo.washer_grid.search(0.0, 0.0, 5, 10) == []
+    # the db still marks the swept washer available; reloading the grid must not revive it
+    geo.washer_grid.fill([("on", 0.01, 0.0)])
+    assert geo.washer_grid.search(0.0, 0.0, 5, 10) == []
+
+
+def test_location_stream_shutdown_waits_for_its_tasks():
+    from app.services.geo import LocationStream
+
+    async def run():
+        stream = LocationStream()
+        stream.start_background_tasks()
+        tasks = [stream._flusher, stream._sweeper]
+        await stream.stop_background_tasks()
+        return tasks
+
+    assert all(task.done() for task in asyncio.run(run()))
+
+
+def test_seed_available_washers_backfills_once_without_clobbering_live_entries(monkeypatch):
+    from app.services.geo import seed_available_washers, WASHER_AVAILABLE, WASHER_LAST_SEEN
+
+    class Result:
+        def all(self):
+            return [("pre-deploy", 0.009, 0.0), ("live", 0.5, 0.5)]
+
+    class Session:
+        async def execute(self, statement):
+            return Result()
+
+    monkeypatch.setattr(geo, "washer_grid", WasherGrid())
+
+    async def run():
+        r = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        await r.geoadd(WASHER_LOCATIONS, (0.027, 0.0, "live"))
+        await r.zadd(WASHER_LAST_SEEN, {"live": 1000.0})
+
+        seeded = await seed_available_washers(r, Session())
+        again = await seed_available_washers(r, Session())
+        live = await r.geopos(WASHER_LOCATIONS, "live")
+        return seeded, again, await r.smembers(WASHER_AVAILABLE), await r.zscore(WASHER_LAST_SEEN, "live"), live
+
+    seeded, again, available, live_seen, (live,) = asyncio.run(run())
+    assert (seeded, again) == (2, 0)
+    assert available == {"pre-deploy", "live"}
+    assert live_seen == 1000.0
+    assert abs(live[0] - 0.027) < 1e-4
+    # the fallback index is ready before the first search
+    assert [w for w, _ in geo.washer_grid.search(0.0, 0.0, 5, 10)] == ["pre-deploy"]
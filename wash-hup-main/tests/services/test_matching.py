@@ -0,0 +1,20 @@
+import numpy as np
+from app.services.matching import score_candidates, top_k, MATCH_MAX_LOAD
+
+
+def test_scoring_prefers_close_well_rated_idle_washers():
+    scores = score_candidates(
+        distance=np.array([1.0, 1.0, 8.0, 1.0, 1.0]),
+        rating=np.array([4.8, 3.0, 4.8, 5.0, 4.8]),
+        washes=np.array([50, 50, 50, 500, 50]),
+        flagged=np.array([False, False, False, True, False]),
+        load=np.array([0, 0, 0, 0, MATCH_MAX_LOAD]),
+    )
+
+    # flagged and fully loaded washers are never picked
+    assert list(top_k(scores, 5)) == [0, 1, 2]
+    assert list(top_k(scores, 2)) == [0, 1]
+
+
+def test_top_k_with_no_eligible_washers():
+    assert len(top_k(np.array([-np.inf, -np.inf]), 3)) == 0
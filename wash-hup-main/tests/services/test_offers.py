@@ -0,0 +1,101 @@
+import asyncio
+import fakeredis
+from app.services.offers import OfferStore, expiry_key, offers_key, recipients_key, taken_key
+
+
+def run(test):
+    return asyncio.run(test(fakeredis.aioredis.FakeRedis(decode_responses=True), OfferStore()))
+
+
+def test_offers_expire_individually_and_page_newest_first():
+    async def test(r, store):
+        await store.put(r, ["w1"], "old", {"payload": {"wash_id": "old"}}, ttl=-1)
+        for wash_id in ("a", "b", "c"):
+            await store.put(r, ["w1"], wash_id, {"payload": {"wash_id": wash_id}})
+
+        first, total = await store.page(r, "w1", 0, 2)
+        second, _ = await store.page(r, "w1", 2, 2)
+        return first, second, total, await store.get(r, "w1", "old"), await r.hexists(offers_key("w1"), "old")
+
+    first, second, total, old, still_stored = run(test)
+    assert [o["payload"]["wash_id"] for o in first + second] == ["c", "b", "a"]
+    assert total == 3
+    # the expired offer is invisible and was purged by the listing
+    assert old is None and not still_stored
+
+
+def test_retract_removes_the_wash_from_other_recipients():
+    async def test(r, store):
+        await store.put(r, ["w1", "w2", "w3"], "wash", {"payload": {}})
+        await store.put(r, ["w2"], "other", {"payload": {}})
+        retracted = await store.retract(r, "wash", keep="w1")
+        return sorted(retracted), await store.get(r, "w1", "wash"), await store.get(r, "w2", "wash"), \
+            await r.zrange(expiry_key("w2"), 0, -1)
+
+    retracted, kept, gone, left = run(test)
+    assert retracted == ["w2", "w3"]
+    assert kept is not None and gone is None
+    assert left == ["other"]
+
+
+def test_concurrent_retracts_report_each_washer_once():
+    async def test(r, store):
+        await store.put(r, ["w1", "w2", "w3"], "wash", {"payload": {}})
+        first, second = await asyncio.gather(store.retract(r, "wash"), store.retract(r, "wash"))
+        return sorted(first + second), await r.exists(recipients_key("wash"))
+
+    retracted, recipients_left = run(test)
+    assert retracted == ["w1", "w2", "w3"]
+    assert recipients_left == 0
+
+
+def test_offer_lifecycle_and_single_winner():
+    async def test(r, store):
+        await store.put(r, ["w1", "w2"], "wash", {"payload": {"wash_id": "wash"}})
+        early = await store.accept(r, "w1", "wash")
+        await store.set_price(r, "w1", "wash", 50)
+        await store.set_price(r, "w2", "wash", 40)
+        await store.accept(r, "w1", "wash")
+        await store.accept(r, "w2", "wash")
+        reprice = await store.set_price(r, "w1", "wash", 99)
+        takes = await asyncio.gather(store.take(r, "w1", "wash"), store.take(r, "w2", "wash"))
+        return early, reprice, takes
+
+    early, reprice, takes = run(test)
+    assert early == ("conflict", "sent")
+    assert reprice == ("conflict", "accepted")
+    outcomes = sorted(outcome for outcome, _ in takes)
+    assert outcomes == ["ok", "taken"]
+    price, winner = next((price, offer) for price, (outcome, offer) in zip((50, 40), takes) if outcome == "ok")
+    assert winner["payload"]["state"] == "taken" and winner["payload"]["price"] == price
+
+
+def test_put_never_resets_a_live_offer_or_reoffers_a_taken_wash():
+    async def test(r, store):
+        sent = await store.put(r, ["w1"], "wash", {"payload": {}})
+        await store.set_price(r, "w1", "wash", 50)
+        resent = await store.put(r, ["w1", "w2"], "wash", {"payload": {}})
+        await store.accept(r, "w1", "wash")
+        await store.take(r, "w1", "wash")
+        after_take = await store.put(r, ["w3"], "wash", {"payload": {}})
+        return sent, resent, (await store.get(r, "w1", "wash"))["payload"], after_take, await store.get(r, "w3", "wash")
+
+    sent, resent, kept, after_take, w3 = run(test)
+    assert sent == ["w1"] and resent == ["w2"]
+    assert kept["state"] == "taken" and kept["price"] == 50
+    assert after_take == [] and w3 is None
+
+
+def test_release_only_drops_the_callers_take():
+    async def test(r, store):
+        await store.put(r, ["w1"], "wash", {"payload": {}})
+        await store.set_price(r, "w1", "wash", 50)
+        await store.accept(r, "w1", "wash")
+        await store.take(r, "w1", "wash")
+        await store.release(r, "w2", "wash")
+        held = await r.get(taken_key("wash"))
+        await store.release(r, "w1", "wash")
+        return held, await r.exists(taken_key("wash"))
+
+    held, left = run(test)
+    assert held == "w1" and left == 0
@@ -0,0 +1,57 @@
+import pytest
+from datetime import datetime
+from fastapi import HTTPException
+
+from app.models.auth.user import Notifications
+from app.utils.pagination import paginate, page
+
+
+def add_notifications(db, count):
+    # half of them share a timestamp, so id has to break the ties
+    for n in range(count):
+        created = datetime(2025, 1, 1) if n % 2 else datetime(2025, 1, 1, 0, n)
+        db.add(Notifications(id=f"n-{n:02}", profile_id="p-1", title="t", message="m", created=created))
+    db.flush()
+
+
+def walk(db, limit, newest_first=True):
+    seen, cursor = [], None
+    while True:
+        query = db.query(Notifications).filter(Notifications.profile_id == "p-1")
+        rows, cursor = page(paginate(query, Notifications, cursor, limit, newest_first), limit)
+        seen.append([row.id for row in rows])
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("newest_first", [True, False])
+def test_pages_cover_every_row_once_in_order(db, newest_first):
+    add_notifications(db, 11)
+
+    pages = walk(db, 3, newest_first)
+    ids = [id for rows in pages for id in rows]
+    expected = sorted(db.query(Notifications).all(), key=lambda n: (n.created, n.id), reverse=newest_first)
+
+    assert [len(rows) for rows in pages] == [3, 3, 3, 2]
+    assert ids == [n.id for n in expected]
+
+
+def test_exactly_full_last_page_has_no_cursor(db):
+    add_notifications(db, 4)
+    # no trailing empty page
+    assert [len(rows) for rows in walk(db, 4)] == [4]
+
+
+def test_invalid_cursor_is_a_bad_request(db):
+    with pytest.raises(HTTPException) as error:
+        paginate(db.query(Notifications), Notifications, "not-a-cursor", 10)
+    assert error.value.status_code == 400
+
+
+def test_rows_inserted_later_page_as_newer(db):
+    # created is stamped per insert, not once at import, so insertion order survives random ids
+    for n in range(5):
+        db.add(Notifications(id=f"z-{4 - n}", profile_id="p-1", title="t", message="m"))
+        db.flush()
+
+    assert [id for rows in walk(db, 2) for id in rows] == [f"z-{4 - n}" for n in reversed(range(5))]
@@ -0,0 +1,20 @@
+from app.models.auth.user import User
+from app.models.washer.profile import WasherProfile
+from app.utils.wash import getWasherFromList
+
+
+def add_washer(db, n, verified=True):
+    db.add(User(id=f"wu-{n}", fullname=f"Washer {n}", email=f"w{n}@example.com",
+                hashed_password="x", role="washer", phone_number=f"w-{n}"))
+    db.add(WasherProfile(id=f"wp-{n}", user_id=f"wu-{n}", user_role="washer", profile_verified=verified))
+
+
+def test_washers_keep_redis_order_and_skip_unverified(db):
+    for n in range(4):
+        add_washer(db, n, verified=n != 2)
+    db.flush()
+
+    data = getWasherFromList(["wp-3", "wp-2", "missing", "wp-0", "wp-1"], db)
+
+    assert [w["id"] for w in data] == ["wp-3", "wp-0", "wp-1"]
+    assert data[0]["fullname"] == "Washer 3"
@@ -0,0 +1,344 @@
+import asyncio
+import json
+import pytest
+import fakeredis
+from app.websocket import manager as ws_manager
+
+
+class FakeSocket:
+    def __init__(self):
+        self.received = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame):
+        data = json.loads(frame)
+        data.pop("event_id", None)
+        self.received.append(data)
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    server = fakeredis.FakeServer()
+
+    async def get_redis():
+        return fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+
+    monkeypatch.setattr(ws_manager, "get_redis", get_redis)
+    return server
+
+
+def test_personal_message_routed_to_owning_worker(redis_server):
+    async def scenario():
+        worker_a, worker_b = ws_manager.WSManager(), ws_manager.WSManager()
+        owner, washer = FakeSocket(), FakeSocket()
+
+        await worker_a.connect("owner-1", "owner", owner)
+        await worker_b.connect("washer-1", "washer", washer)
+        await asyncio.sleep(0.05)
+
+        await worker_a.send_personal({"action": "wash"}, "washer-1")
+        await asyncio.sleep(0.05)
+
+        await worker_a.stop_background_tasks()
+        await worker_b.stop_background_tasks()
+        return owner.received, washer.received
+
+    owner_frames, washer_frames = asyncio.run(scenario())
+    assert owner_frames == []
+    assert washer_frames == [{"action": "wash"}]
+
+
+def test_stamp_splices_the_event_id_into_the_encoded_frame():
+    assert json.loads(ws_manager.stamp(ws_manager.encode({"action": "wash", "n": [1]}), "5-0")) == {
+        "action": "wash", "n": [1], "event_id": "5-0",
+    }
+    assert json.loads(ws_manager.stamp(ws_manager.encode({}), "5-1")) == {"event_id": "5-1"}
+
+
+def test_send_personal_many_encodes_the_frame_once(redis_server, monkeypatch):
+    calls = []
+    real_encode = ws_manager.encode
+
+    def counting_encode(data):
+        calls.append(data)
+        return real_encode(data)
+
+    monkeypatch.setattr(ws_manager, "encode", counting_encode)
+
+    async def scenario():
+        worker = ws_manager.WSManager()
+        sockets = {f"washer-{i}": FakeSocket() for i in range(3)}
+        for profile_id, socket in sockets.items():
+            await worker.connect(profile_id, "washer", socket)
+        await asyncio.sleep(0.05)
+
+        calls.clear()
+        await worker.send_personal_many({"action": "offer"}, list(sockets))
+        await asyncio.sleep(0.05)
+
+        await worker.stop_background_tasks()
+        return [socket.received for socket in sockets.values()]
+
+    received = asyncio.run(scenario())
+    assert received == [[{"action": "offer"}]] * 3
+    assert calls == [{"action": "offer"}]
+
+
+def test_publish_reaches_role_channels_once_per_worker(redis_server):
+    async def scenario():
+        worker = ws_manager.WSManager()
+        owner, washer = FakeSocket(), FakeSocket()
+
+        await worker.connect("owner-1", "owner", owner)
+        await worker.connect("washer-1", "washer", washer)
+        await asyncio.sleep(0.05)
+
+        await worker.publish_to_washers({"action": "notification"})
+        await asyncio.sleep(0.05)
+
+        await worker.stop_background_tasks()
+        return owner.received, washer.received
+
+    owner_frames, washer_frames = asyncio.run(scenario())
+    assert owner_frames == []
+    assert washer_frames == [{"action": "notification"}]
+
+
+def test_disconnect_releases_presence(redis_server):
+    async def scenario():
+        worker = ws_manager.WSManager()
+        await worker.connect("owner-1", "owner", FakeSocket())
+        await worker.disconnect("owner-1")
+        await worker.stop_background_tasks()
+
+        r = await ws_manager.get_redis()
+        return await r.exists(ws_manager.presence_key("owner-1"))
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_slow_consumer_is_closed_without_stalling_broadcast(redis_server, monkeypatch):
+    monkeypatch.setattr(ws_manager, "SEND_QUEUE_SIZE", 2)
+
+    class StalledSocket(FakeSocket):
+        closed_with = None
+
+        async def send_text(self, frame):
+            await asyncio.Event().wait()
+
+        async def close(self, code):
+            self.closed_with = code
+
+    async def scenario():
+        worker = ws_manager.WSManager()
+        stalled, healthy = StalledSocket(), FakeSocket()
+        await worker.connect("washer-1", "washer", stalled)
+        await worker.connect("washer-2", "washer", healthy)
+
+        for i in range(5):
+            await worker.broadcast_to_washers({"seq": i})
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+
+        await worker.stop_background_tasks()
+        return worker, stalled, healthy
+
+    worker, stalled, healthy = asyncio.run(scenario())
+    assert healthy.received == [{"seq": i} for i in range(5)]
+    assert stalled.closed_with == ws_manager.SLOW_CONSUMER_CLOSE_CODE
+    assert "washer-1" not in worker.active_connections
+    assert worker.counters["slow_consumers_closed"] == 1
+    assert worker.counters["frames_dropped"] >= 1
+
+
+class RecordingSocket(FakeSocket):
+    async def send_text(self, frame):
+        self.received.append(json.loads(frame))
+
+
+def test_reconnect_replays_only_missed_events(redis_server):
+    async def scenario():
+        worker = ws_manager.WSManager()
+        first = RecordingSocket()
+        await worker.connect("washer-1", "washer", first)
+        await asyncio.sleep(0.05)
+
+        await worker.send_personal({"type": "send-offer", "seq": 1}, "washer-1")
+        await asyncio.sleep(0.05)
+        last_event_id = first.received[-1]["event_id"]
+        await worker.disconnect("washer-1", first)
+
+        # sent while the washer's phone was offline
+        await worker.send_personal({"type": "send-offer", "seq": 2}, "washer-1")
+        await worker.publish_to_washers({"type": "announcement", "seq": 3})
+        await worker.publish_to_admins({"type": "admin-only"})
+        await asyncio.sleep(0.05)
+
+        second = RecordingSocket()
+        await worker.connect("washer-1", "washer", second)
+        await worker.replay("washer-1", "washer", last_event_id)
+        await asyncio.sleep(0.05)
+
+        await worker.stop_background_tasks()
+        return second.received
+
+    replayed = asyncio.run(scenario())
+    assert [frame["seq"] for frame in replayed] == [2, 3]
+
+
+def test_heartbeat_pings_live_sockets_and_reaps_idle_ones(redis_server, monkeypatch):
+    class ClosableSocket(FakeSocket):
+        closed_with = None
+
+        async def close(self, code):
+            self.closed_with = code
+
+    async def scenario():
+        worker = ws_manager.WSManager()
+        idle, live = ClosableSocket(), ClosableSocket()
+        passive = ClosableSocket()
+        await worker.connect("owner-1", "owner", idle)
+        await worker.connect("owner-2", "owner", live)
+        await worker.connect("owner-3", "owner", passive)
+
+        # owner-1 answered pings before, owner-3 never has
+        worker.touch("owner-1", pong=True)
+        worker.active_connections["owner-1"].last_seen -= ws_manager.IDLE_TIMEOUT + 1
+        worker.active_connections["owner-3"].last_seen -= ws_manager.IDLE_TIMEOUT + 1
+        worker.heartbeat()
+        await asyncio.sleep(0.05)
+
+        stats = worker.stats()
+        await worker.stop_background_tasks()
+        return idle, live, passive, stats
+
+    idle, live, passive, stats = asyncio.run(scenario())
+    assert idle.closed_with == ws_manager.IDLE_CLOSE_CODE
+    assert live.received == [{"action": "ping"}]
+    # a client that never pongs is left to protocol-level ping/pong
+    assert passive.closed_with is None
+    assert passive.received == [{"action": "ping"}]
+    assert stats["owners"] == 2
+    assert stats["idle_reaped"] == 1
+
+
+def test_live_frames_wait_for_replay_and_skip_replayed_events(redis_server):
+    async def scenario():
+        worker = ws_manager.WSManager()
+        await worker.send_personal({"seq": 1}, "washer-1")
+        r = await ws_manager.get_redis()
+        (first_id, _), = await r.xrange(ws_manager.profile_stream("washer-1"))
+        await worker.send_personal({"seq": 2}, "washer-1")
+        await worker.send_personal({"seq": 3}, "washer-1")
+        *_, (third_id, _) = await r.xrange(ws_manager.profile_stream("washer-1"))
+
+        socket = RecordingSocket()
+        await worker.connect("washer-1", "washer", socket, resume=True)
+        # a live copy of an event the replay also returns, and a genuinely new one, both racing the replay
+        worker._enqueue(ws_manager.encode({"seq": 3, "event_id": third_id}), ["washer-1"])
+        worker._enqueue(ws_manager.encode({"seq": 4, "event_id": "9999999999999-0"}), ["washer-1"])
+        await asyncio.sleep(0.05)
+        before_replay = list(socket.received)
+
+        await worker.replay("washer-1", "washer", first_id)
+        await asyncio.sleep(0.05)
+
+        await worker.stop_background_tasks()
+        return before_replay, socket.received
+
+    before_replay, received = asyncio.run(scenario())
+    assert before_replay == []
+    assert [frame["seq"] for frame in received] == [2, 3, 4]
+
+
+def test_handler_replies_go_through_the_connection_queue(redis_server):
+    from app.api.dependencies import ProfileSnapshot
+    from app.websocket.handlers.location import LocationHandler
+    from app.websocket.schema import validate
+
+    class NoDirectSendSocket(FakeSocket):
+        async def send_json(self, data):
+            raise AssertionError("handlers must not write to the socket directly")
+
+    async def scenario():
+        worker = ws_manager.WSManager()
+        socket = NoDirectSendSocket()
+        owner = ProfileSnapshot("owner-1", "owner", "Owner", "owner@example.com")
+        await worker.connect(owner.id, owner.role, socket)
+
+        message = validate(json.dumps({"action": "location", "longitude": 3.4, "latitude": 6.5}))
+        await LocationHandler().handle(message, owner, socket, None, worker)
+        await asyncio.sleep(0.05)
+
+        await worker.stop_background_tasks()
+        return socket.received, worker.counters["frames_sent"]
+
+    received, frames_sent = asyncio.run(scenario())
+    assert received == [{"action": "notification", "sender": "system", "message": "invalid permission"}]
+    assert frames_sent == 1
+
+
+def test_presence_frames_skip_the_replay_stream(redis_server):
+    async def scenario():
+        worker = ws_manager.WSManager()
+        socket = RecordingSocket()
+        await worker.connect("owner-1", "owner", socket)
+        await asyncio.sleep(0.05)
+
+        await worker.publish(ws_manager.Channel.ALL, {"sender": "system", "text": "someone left"}, replayable=False)
+        await asyncio.sleep(0.05)
+        await worker.stop_background_tasks()
+
+        r = await ws_manager.get_redis()
+        return socket.received, await r.xlen(ws_manager.channel_stream(ws_manager.Channel.ALL))
+
+    received, stored = asyncio.run(scenario())
+    assert received == [{"sender": "system", "text": "someone left"}]
+    assert stored == 0
+
+
+def test_cut_replay_is_marked_and_keeps_the_newest_events(redis_server, monkeypatch):
+    monkeypatch.setattr(ws_manager, "REPLAY_LIMIT", 2)
+
+    async def scenario():
+        worker = ws_manager.WSManager()
+        await worker.send_personal({"seq": 0}, "washer-1")
+        r = await ws_manager.get_redis()
+        (last_event_id, _), = await r.xrange(ws_manager.profile_stream("washer-1"))
+        for seq in range(1, 5):
+            await worker.send_personal({"seq": seq}, "washer-1")
+
+        socket = FakeSocket()
+        await worker.connect("washer-1", "washer", socket, resume=True)
+        await worker.replay("washer-1", "washer", last_event_id)
+        await asyncio.sleep(0.05)
+        await worker.stop_background_tasks()
+        return socket.received, worker.counters["replays_truncated"]
+
+    received, truncated = asyncio.run(scenario())
+    assert received == [{"action": "replay-truncated"}, {"seq": 3}, {"seq": 4}]
+    assert truncated == 1
+
+
+def test_replay_past_a_trimmed_stream_is_marked(redis_server, monkeypatch):
+    monkeypatch.setattr(ws_manager, "STREAM_MAXLEN", 3)
+
+    async def scenario():
+        worker = ws_manager.WSManager()
+        r = await ws_manager.get_redis()
+        # the client's last event is older than anything the capped stream still holds
+        await r.xadd(ws_manager.profile_stream("washer-1"), {"data": '{"seq": 0}'}, id="1-0")
+        await r.xdel(ws_manager.profile_stream("washer-1"), "1-0")
+        for seq in range(1, 4):
+            await worker.send_personal({"seq": seq}, "washer-1")
+
+        socket = FakeSocket()
+        await worker.connect("washer-1", "washer", socket, resume=True)
+        await worker.replay("washer-1", "washer", "1-0")
+        await asyncio.sleep(0.05)
+        await worker.stop_background_tasks()
+        return socket.received
+
+    assert asyncio.run(scenario()) == [{"action": "replay-truncated"}, {"seq": 1}, {"seq": 2}, {"seq": 3}]
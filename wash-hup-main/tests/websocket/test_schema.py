@@ -0,0 +1,17 @@
+from app.websocket.schema import validate, IssueMessage, AdminIssueMessage, PongMessage
+
+
+def test_validate_picks_model_from_action():
+    assert isinstance(validate(b'{"action": "issue", "message": "car not washed"}'), IssueMessage)
+    assert isinstance(validate('{"action": "pong"}'), PongMessage)
+
+    msg = validate('{"action": "admin_issue", "message": "on it", "issue_id": "is-1"}')
+    assert isinstance(msg, AdminIssueMessage)
+    assert msg.issue_id == "is-1"
+
+
+def test_validate_rejects_bad_frames():
+    assert validate("not json") is None
+    assert validate('{"action": "unknown", "message": "hi"}') is None
+    assert validate('{"action": "issue", "message": "<script>"}') is None
+    assert validate('{"action": "admin_issue", "message": "missing id"}') is None